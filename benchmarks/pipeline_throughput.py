@@ -0,0 +1,254 @@
+"""Measures end-to-end pipeline throughput against the local fake Azure server.
+
+Each pipeline processes N copies of a source document with M worker processes; every remote
+call goes to `src.testing.FakeAzureServer`, so the numbers isolate local overhead plus the
+injected latency and errors.
+
+Usage:
+    python benchmarks/pipeline_throughput.py --documents 16 --workers 1 4 \
+        --latency document_intelligence=1500 --latency openai=600:200 --error-rate openai=0.01
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.serialization import dumps, loads  # noqa: E402
+from src.testing import FAKE_BACKENDS, FakeAzureServer, FakeAzureSettings, FaultProfile  # noqa: E402
+
+PIPELINES = ("direct", "layout-no-skill", "layout-no-skill-v2")
+DEFAULT_SOURCE = REPO_ROOT / "documents" / "demo_files" / "world_economic_outlook_page_20.pdf"
+BENCHMARK_CONTAINER = "benchmark-chunks"
+BENCHMARK_PREFIX = "benchmark"
+
+
+def _init_worker(environment: dict[str, str], workdir: str) -> None:
+    os.environ.update(environment)
+    # Run from the scratch directory so a local `.env` cannot repoint the services.
+    os.chdir(workdir)
+
+
+def _run_document(pipeline: str, src: str, content_format: str) -> dict[str, Any]:
+    from src.pipelines import (
+        DirectPipeline,
+        DirectPipelineOptions,
+        LayoutNoSkillPipeline,
+        LayoutNoSkillPipelineOptions,
+        LayoutNoSkillV2Pipeline,
+        LayoutNoSkillV2PipelineOptions,
+    )
+
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            if pipeline == "direct":
+                payload = DirectPipeline().run(
+                    DirectPipelineOptions(
+                        src=src, model_id="prebuilt-layout", content_format=content_format
+                    )
+                )
+            elif pipeline == "layout-no-skill":
+                payload = LayoutNoSkillPipeline().run(
+                    LayoutNoSkillPipelineOptions(
+                        src=src,
+                        demo=False,
+                        chunk_container=BENCHMARK_CONTAINER,
+                        name_prefix=BENCHMARK_PREFIX,
+                        chunk_size=500,
+                        chunk_overlap=50,
+                        hard_refresh=False,
+                    )
+                )
+            else:
+                payload = LayoutNoSkillV2Pipeline().run(
+                    LayoutNoSkillV2PipelineOptions(
+                        src=src,
+                        demo=False,
+                        chunk_container=BENCHMARK_CONTAINER,
+                        name_prefix=BENCHMARK_PREFIX,
+                        chunk_size=500,
+                        chunk_overlap=50,
+                        content_format="markdown" if content_format == "markdown" else "text",
+                        hard_refresh=False,
+                    )
+                )
+    except Exception as exc:
+        return {"seconds": time.perf_counter() - started, "records": 0, "error": repr(exc)}
+    return {
+        "seconds": time.perf_counter() - started,
+        "records": int(payload.get("record_count") or 0),
+        "error": None,
+    }
+
+
+def _parse_faults(
+    latencies: list[str], error_rates: list[str], error_status: int
+) -> dict[str, FaultProfile]:
+    values: dict[str, dict[str, float]] = {}
+    for spec in latencies:
+        backend, _, value = spec.partition("=")
+        latency, _, jitter = value.partition(":")
+        values.setdefault(backend, {})["latency_ms"] = float(latency)
+        values[backend]["jitter_ms"] = float(jitter or 0)
+    for spec in error_rates:
+        backend, _, value = spec.partition("=")
+        values.setdefault(backend, {})["error_rate"] = float(value)
+    unknown = sorted(set(values) - set(FAKE_BACKENDS))
+    if unknown:
+        raise SystemExit(f"Unknown backend(s) {unknown}; expected one of {list(FAKE_BACKENDS)}.")
+    return {
+        backend: FaultProfile(error_status=error_status, **profile)
+        for backend, profile in values.items()
+    }
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def _benchmark(
+    *,
+    pipeline: str,
+    workers: int,
+    documents: list[Path],
+    settings: FakeAzureSettings,
+    content_format: str,
+    workdir: Path,
+) -> dict[str, Any]:
+    with FakeAzureServer(settings) as server:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(server.environment(), str(workdir)),
+        ) as pool:
+            # Warm every worker's imports before the clock starts.
+            list(pool.map(time.sleep, [0.0] * workers))
+            started = time.perf_counter()
+            results = list(
+                pool.map(
+                    _run_document,
+                    [pipeline] * len(documents),
+                    [str(path) for path in documents],
+                    [content_format] * len(documents),
+                )
+            )
+            wall = time.perf_counter() - started
+        stats = server.stats()
+
+    latencies = [result["seconds"] for result in results if result["error"] is None]
+    errors = [result["error"] for result in results if result["error"] is not None]
+    return {
+        "pipeline": pipeline,
+        "workers": workers,
+        "documents": len(documents),
+        "failed": len(errors),
+        "wall_s": round(wall, 3),
+        "documents_per_s": round(len(latencies) / wall, 3) if wall else 0.0,
+        "records": sum(result["records"] for result in results),
+        "p50_s": round(statistics.median(latencies), 3) if latencies else None,
+        "p95_s": round(_percentile(latencies, 0.95), 3) if latencies else None,
+        "requests": stats["requests"],
+        "injected_errors": stats["injected_errors"],
+        "first_error": errors[0] if errors else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pipelines", nargs="+", choices=PIPELINES, default=list(PIPELINES))
+    parser.add_argument("--documents", type=int, default=8, help="Documents per run (N).")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4], help="Worker processes (M).")
+    parser.add_argument("--source", default=str(DEFAULT_SOURCE), help="Document copied N times.")
+    parser.add_argument("--content-format", choices=("text", "markdown"), default="markdown")
+    parser.add_argument(
+        "--di-result",
+        action="append",
+        default=[],
+        help="Recorded AnalyzeResult.as_dict() JSON to replay (repeatable, used round-robin).",
+    )
+    parser.add_argument("--pages", type=int, default=2, help="Pages in the synthetic layout.")
+    parser.add_argument("--figures-per-page", type=int, default=1)
+    parser.add_argument(
+        "--latency",
+        action="append",
+        default=[],
+        metavar="BACKEND=MS[:JITTER_MS]",
+        help=f"Injected latency per request; backends: {', '.join(FAKE_BACKENDS)}.",
+    )
+    parser.add_argument(
+        "--error-rate",
+        action="append",
+        default=[],
+        metavar="BACKEND=RATE",
+        help="Fraction of requests answered with --error-status.",
+    )
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Optional JSON file for the result rows.")
+    args = parser.parse_args()
+
+    settings = FakeAzureSettings(
+        faults=_parse_faults(args.latency, args.error_rate, args.error_status),
+        di_results=tuple(loads(Path(path).read_bytes()) for path in args.di_result),
+        pages=args.pages,
+        figures_per_page=args.figures_per_page,
+        seed=args.seed,
+    )
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="document-reader-bench-") as scratch:
+        workdir = Path(scratch)
+        source = Path(args.source)
+        documents = []
+        for index in range(args.documents):
+            target = workdir / "documents" / f"{source.stem}-{index:04d}{source.suffix}"
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source, target)
+            documents.append(target)
+
+        print(
+            f"{'pipeline':<20} {'workers':>7} {'docs':>5} {'failed':>6} "
+            f"{'wall_s':>8} {'docs/s':>7} {'p50_s':>7} {'p95_s':>7}"
+        )
+        for pipeline in args.pipelines:
+            for workers in args.workers:
+                row = _benchmark(
+                    pipeline=pipeline,
+                    workers=workers,
+                    documents=documents,
+                    settings=settings,
+                    content_format=args.content_format,
+                    workdir=workdir,
+                )
+                rows.append(row)
+                print(
+                    f"{pipeline:<20} {workers:>7} {row['documents']:>5} {row['failed']:>6} "
+                    f"{row['wall_s']:>8.2f} {row['documents_per_s']:>7.2f} "
+                    f"{row['p50_s'] if row['p50_s'] is not None else '-':>7} "
+                    f"{row['p95_s'] if row['p95_s'] is not None else '-':>7}"
+                )
+                if row["first_error"]:
+                    print(f"  first error: {row['first_error']}")
+
+    if args.output:
+        Path(args.output).write_text(dumps(rows, indent=True), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
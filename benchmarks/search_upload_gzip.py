@@ -0,0 +1,124 @@
+"""Compares plain and gzip Search `/docs/index` uploads against a bandwidth-limited local server.
+
+Usage:
+    python benchmarks/search_upload_gzip.py --records 500 --dimensions 1536 --bandwidth-mbps 20
+"""
+
+import argparse
+import gzip
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.request import Request, urlopen
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.services.shared.search_rest import encode_search_body  # noqa: E402
+
+READ_BLOCK_BYTES = 16 * 1024
+
+
+def _handler(bytes_per_second: float) -> type[BaseHTTPRequestHandler]:
+    class ThrottledSearchHandler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            remaining = int(self.headers.get("Content-Length") or 0)
+            blocks = []
+            started = time.perf_counter()
+            received = 0
+            while remaining:
+                block = self.rfile.read(min(READ_BLOCK_BYTES, remaining))
+                if not block:
+                    break
+                blocks.append(block)
+                remaining -= len(block)
+                received += len(block)
+                delay = received / bytes_per_second - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+
+            raw = b"".join(blocks)
+            if self.headers.get("Content-Encoding") == "gzip":
+                raw = gzip.decompress(raw)
+            documents = json.loads(raw)["value"]
+            response = json.dumps(
+                {"value": [{"key": doc["id"], "status": True, "statusCode": 200} for doc in documents]}
+            ).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(response)))
+            self.end_headers()
+            self.wfile.write(response)
+
+        def log_message(self, format: str, *args: object) -> None:
+            return
+
+    return ThrottledSearchHandler
+
+
+def _batch(record_count: int, dimensions: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    return {
+        "value": [
+            {
+                "@search.action": "mergeOrUpload",
+                "id": f"benchmark-text-{index:04d}",
+                "content": f"Synthetic chunk {index} " * 40,
+                "contentVector": [rng.uniform(-1.0, 1.0) for _ in range(dimensions)],
+            }
+            for index in range(record_count)
+        ]
+    }
+
+
+def _upload(url: str, body: dict, gzip_min_bytes: int | None) -> tuple[float, int]:
+    started = time.perf_counter()
+    data, headers = encode_search_body(body, gzip_min_bytes=gzip_min_bytes)
+    req = Request(url, data=data, method="POST", headers=headers)
+    with urlopen(req, timeout=600) as resp:
+        resp.read()
+    return time.perf_counter() - started, len(data or b"")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=500)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--bandwidth-mbps", type=float, default=20.0)
+    parser.add_argument("--gzip-min-bytes", type=int, default=64 * 1024)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(args.bandwidth_mbps * 1_000_000 / 8))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/indexes/benchmark/docs/index"
+    body = _batch(args.records, args.dimensions, seed=7)
+
+    try:
+        results = {}
+        for label, threshold in (("plain", None), ("gzip", args.gzip_min_bytes)):
+            timings = []
+            size = 0
+            for _ in range(args.repeat):
+                elapsed, size = _upload(url, body, threshold)
+                timings.append(elapsed)
+            results[label] = (statistics.median(timings), size)
+            print(f"{label:>5}: {size / 1_000_000:8.2f} MB on the wire, median {results[label][0]:.2f}s")
+
+        speedup = results["plain"][0] / results["gzip"][0] if results["gzip"][0] else 0.0
+        ratio = results["plain"][1] / results["gzip"][1] if results["gzip"][1] else 0.0
+        print(f"compression ratio {ratio:.2f}x, wall-time speedup {speedup:.2f}x")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import argparse
+from contextlib import nullcontext
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -16,8 +17,28 @@ from src.pipelines import (
     LayoutSkillPipelineOptions,
     PipelineName,
 )
+from src.services.document_intelligence import parse_content_formats
+from src.services.shared import IMAGE_FORMATS, ImagePreprocessOptions
 from src.services.storage_account import AzureStorageAccountService
-from src.storage import LocalOutputStore
+from src.telemetry import (
+    PROFILE_MODES,
+    metrics_run,
+    profile_path_for_output,
+    profile_run,
+    trace_run,
+)
+from src.storage import (
+    CASSETTE_MODES,
+    DEFAULT_CASSETTE_DIR,
+    OUTPUT_FORMATS,
+    OUTPUT_VECTOR_MODES,
+    LocalOutputStore,
+    cassette_run,
+    compact_payload,
+    encode_output,
+    output_content_type,
+    output_path_for_format,
+)
 
 
 def _get_stem(src: str | None) -> str:
@@ -38,6 +59,11 @@ def _default_output_path(src: str, content_format: str) -> str:
     return f"{folder}/{prefix}{stem}{suffix}"
 
 
+def _format_output_path(out: str, content_format: str) -> str:
+    path = Path(out)
+    return str(path.with_name(f"{path.stem}_{content_format}{path.suffix or '.json'}"))
+
+
 def _default_layout_output_path(src: str) -> str:
     parsed = urlparse(src)
     if parsed.scheme in ("http", "https"):
@@ -109,6 +135,61 @@ def main() -> int:
         default=None,
         help="Output path. If omitted, defaults to data/<content_format>/<content_format>_<input_name>.json.",
     )
+    parser.add_argument(
+        "--output-vectors",
+        choices=list(OUTPUT_VECTOR_MODES),
+        default="full",
+        help="Record vectors in the saved output: full keeps them, none drops them, ref replaces them with a pointer to the target index document. Default: full.",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=list(OUTPUT_FORMATS),
+        default="json",
+        help="Saved output encoding. ndjson and ndjson.gz write a summary line and then one record per line, streamed incrementally. Default: json.",
+    )
+    parser.add_argument(
+        "--perf-report",
+        default=None,
+        help="Optional local path for a JSON per-stage timing report (count, total, p50, p95, max). The same summary is always included in the output payload under 'perf'.",
+    )
+    parser.add_argument(
+        "--trace",
+        default=None,
+        help="Optional local path for a Chrome trace-event JSON of the run's nested spans (pipeline, source, figure, remote calls) per thread. Open it in Perfetto or chrome://tracing.",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=list(PROFILE_MODES),
+        default=None,
+        help="Profile the run with cProfile (.prof) or tracemalloc (.tracemalloc snapshot), written next to the local output path. A top-functions / top-allocation-sites summary is added to the payload under 'profile'.",
+    )
+    parser.add_argument(
+        "--profile-stages",
+        default="",
+        help="Comma-separated span stages to scope --profile to, e.g. chunking,di.render,figure.context. A stage also covers its dotted children. Default: the whole run.",
+    )
+    parser.add_argument(
+        "--cassette",
+        choices=list(CASSETTE_MODES),
+        default=None,
+        help="record saves every DI, OpenAI, Vision, Blob and Search response to --cassette-dir keyed by request hash; replay serves them back without network and saves outputs locally; reuse replays what was recorded and records the rest.",
+    )
+    parser.add_argument(
+        "--cassette-dir",
+        default=str(DEFAULT_CASSETTE_DIR),
+        help=f"Cassette store for --cassette. Default: {DEFAULT_CASSETTE_DIR}.",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        default=None,
+        help="Optional Prometheus textfile-collector path (e.g. /var/lib/node_exporter/document_reader.prom), rewritten every 15s while the run is in progress.",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Optional local port that serves Prometheus metrics at http://127.0.0.1:<port>/metrics while the run is in progress.",
+    )
 
     if pipeline_name == "layout-skill":
         parser.add_argument(
@@ -192,6 +273,36 @@ def main() -> int:
             action="store_true",
             help="Run the selected no-skill demo over the files in the demo folder.",
         )
+        parser.add_argument(
+            "--dedup",
+            choices=["off", "source", "corpus"],
+            default="off",
+            help="Skip exact and near-duplicate text chunks before embedding, per source or across the whole run. Default: off.",
+        )
+        parser.add_argument(
+            "--artifact-vectors",
+            choices=["inline", "sidecar"],
+            default="inline",
+            help="Store derived artifact vectors inline in the JSON or in a float32 .npy sidecar next to a slim JSON record file. Default: inline.",
+        )
+        if pipeline_name == "layout-no-skill":
+            parser.add_argument(
+                "--cache-dir",
+                default=None,
+                help="Cache Azure AI Vision text embeddings, image embeddings and image analyses under this directory, keyed by input hash and model version, so re-runs skip unchanged calls.",
+            )
+            parser.add_argument(
+                "--cache-max-entries",
+                type=int,
+                default=50000,
+                help="Evict the least recently used --cache-dir Vision entries beyond this count at the end of each run. Default: 50000.",
+            )
+            parser.add_argument(
+                "--figure-workers",
+                type=int,
+                default=4,
+                help="Figures processed concurrently in layout-no-skill. Each figure issues its DI read, image analysis and image embedding side by side, capped per backend. 0 runs figures one at a time. Default: 4.",
+            )
         if pipeline_name == "layout-no-skill-v2":
             parser.add_argument(
                 "--content-format",
@@ -200,6 +311,58 @@ def main() -> int:
                 default="markdown",
                 help="Document Intelligence content format for layout-no-skill-v2 text extraction and chunking. Default: markdown.",
             )
+            parser.add_argument(
+                "--cpu-workers",
+                "-cw",
+                type=int,
+                default=0,
+                help="Worker processes for CPU-bound chunking in layout-no-skill-v2. 0 runs inline. Default: 0.",
+            )
+            parser.add_argument(
+                "--cache-dir",
+                default=None,
+                help="Cache grounded figure interpretations and verbalizations under this directory so unchanged figures skip the model calls on re-ingest.",
+            )
+            parser.add_argument(
+                "--figure-calls",
+                choices=["separate", "fused"],
+                default="separate",
+                help="Interpret and verbalize each figure in two model calls, or in one fused structured call that returns both. Default: separate.",
+            )
+            parser.add_argument(
+                "--figure-verbalization",
+                choices=["llm", "template"],
+                default="llm",
+                help="Write figure markdown with the verbalization deployment, or render it locally from the grounded interpretation without a model call. Default: llm.",
+            )
+            parser.add_argument(
+                "--openai-batch-dir",
+                default=None,
+                help="Two-phase Azure OpenAI Batch mode. Unanswered summary, interpretation, verbalization and embedding requests are written as Batch input JSONL under <dir>/input; place Batch outputs under <dir>/results and re-run until nothing is pending. Records are uploaded only once every request is answered.",
+            )
+            parser.add_argument(
+                "--image-max-edge",
+                type=int,
+                default=0,
+                help="Downscale figure images so their longest edge is at most this many pixels before the interpretation call. 0 keeps the original size. Default: 0.",
+            )
+            parser.add_argument(
+                "--image-format",
+                choices=list(IMAGE_FORMATS),
+                default="png",
+                help="Encoding for figure images sent to the interpretation call. The original PNG is still persisted. Default: png.",
+            )
+            parser.add_argument(
+                "--image-quality",
+                type=int,
+                default=85,
+                help="JPEG/WebP quality for --image-format jpeg|webp. Default: 85.",
+            )
+            parser.add_argument(
+                "--image-grayscale",
+                action="store_true",
+                help="Convert figure images to grayscale before the interpretation call.",
+            )
     else:
         parser.add_argument(
             "--model",
@@ -210,9 +373,20 @@ def main() -> int:
         parser.add_argument(
             "--content-format",
             "-f",
-            choices=["text", "markdown", "html"],
             default="text",
-            help="Content format for `content` field. text|markdown from DI, html rendered from raw layout.",
+            help="Content format for `content` field: text, markdown or html, or a comma-separated list such as text,markdown,html to render every format from one DI analysis.",
+        )
+        parser.add_argument(
+            "--cache-dir",
+            default=None,
+            help="Cache raw DI results under this directory so later runs can re-render other formats without re-analyzing.",
+        )
+        parser.add_argument(
+            "--cpu-workers",
+            "-cw",
+            type=int,
+            default=0,
+            help="Worker processes that render each requested content format (HTML layout rendering, metadata) in parallel. 0 renders inline. Default: 0.",
         )
     args = parser.parse_args()
 
@@ -224,52 +398,120 @@ def main() -> int:
     if pipeline_name in ("layout-no-skill", "layout-no-skill-v2") and not args.demo and not args.src:
         parser.error("--src is required for no-skill pipelines when not running --demo.")
 
+    if (
+        pipeline_name == "layout-no-skill-v2"
+        and args.figure_calls == "fused"
+        and args.figure_verbalization == "template"
+    ):
+        parser.error("--figure-verbalization template cannot be combined with --figure-calls fused.")
+
+    if pipeline_name == "layout-no-skill-v2" and args.openai_batch_dir and args.cassette:
+        parser.error("--openai-batch-dir cannot be combined with --cassette.")
+
+    if pipeline_name == "layout-no-skill" and args.figure_workers < 0:
+        parser.error("--figure-workers must be zero or positive.")
+
+    if pipeline_name in ("direct", "layout-no-skill-v2") and args.cpu_workers < 0:
+        parser.error("--cpu-workers must be zero or positive.")
+
+    image_preprocess = None
+    if pipeline_name == "layout-no-skill-v2":
+        if args.image_max_edge < 0:
+            parser.error("--image-max-edge must be zero or positive.")
+        if not 1 <= args.image_quality <= 100:
+            parser.error("--image-quality must be between 1 and 100.")
+        image_preprocess = ImagePreprocessOptions(
+            max_edge=args.image_max_edge,
+            image_format=args.image_format,
+            quality=args.image_quality,
+            grayscale=args.image_grayscale,
+        )
+
+    content_formats: tuple[str, ...] = ()
+    if pipeline_name == "direct":
+        try:
+            content_formats = parse_content_formats(args.content_format)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    tracing = trace_run() if args.trace else nullcontext()
+    metrics = (
+        metrics_run(textfile=args.metrics_textfile, port=args.metrics_port)
+        if args.metrics_textfile or args.metrics_port is not None
+        else nullcontext()
+    )
+    profiling = (
+        profile_run(
+            args.profile,
+            tuple(stage.strip() for stage in args.profile_stages.split(",") if stage.strip()),
+        )
+        if args.profile
+        else nullcontext()
+    )
+    recording = cassette_run(args.cassette, args.cassette_dir) if args.cassette else nullcontext()
     try:
-        if pipeline_name == "layout-skill":
-            payload = LayoutSkillPipeline().run(
-                LayoutSkillPipelineOptions(
-                    src=args.src,
-                    demo=args.demo,
-                    input_container=args.input_container,
-                    name_prefix=args.name_prefix,
-                    chunk_size=args.chunk_size,
-                    chunk_overlap=args.chunk_overlap,
-                    hard_refresh=args.hard_refresh,
+        with tracing as tracer, metrics, profiling as profile, recording as cassette:
+            if pipeline_name == "layout-skill":
+                payload = LayoutSkillPipeline().run(
+                    LayoutSkillPipelineOptions(
+                        src=args.src,
+                        demo=args.demo,
+                        input_container=args.input_container,
+                        name_prefix=args.name_prefix,
+                        chunk_size=args.chunk_size,
+                        chunk_overlap=args.chunk_overlap,
+                        hard_refresh=args.hard_refresh,
+                    )
                 )
-            )
-        elif pipeline_name == "layout-no-skill":
-            payload = LayoutNoSkillPipeline().run(
-                LayoutNoSkillPipelineOptions(
-                    src=args.src,
-                    demo=args.demo,
-                    chunk_container=args.chunk_container,
-                    name_prefix=args.name_prefix,
-                    chunk_size=args.chunk_size,
-                    chunk_overlap=args.chunk_overlap,
-                    hard_refresh=args.hard_refresh,
+            elif pipeline_name == "layout-no-skill":
+                payload = LayoutNoSkillPipeline().run(
+                    LayoutNoSkillPipelineOptions(
+                        src=args.src,
+                        demo=args.demo,
+                        chunk_container=args.chunk_container,
+                        name_prefix=args.name_prefix,
+                        chunk_size=args.chunk_size,
+                        chunk_overlap=args.chunk_overlap,
+                        hard_refresh=args.hard_refresh,
+                        dedup=args.dedup,
+                        artifact_vectors=args.artifact_vectors,
+                        cache_dir=args.cache_dir,
+                        cache_max_entries=args.cache_max_entries,
+                        figure_workers=args.figure_workers,
+                    )
                 )
-            )
-        elif pipeline_name == "layout-no-skill-v2":
-            payload = LayoutNoSkillV2Pipeline().run(
-                LayoutNoSkillV2PipelineOptions(
-                    src=args.src,
-                    demo=args.demo,
-                    chunk_container=args.chunk_container,
-                    name_prefix=args.name_prefix,
-                    chunk_size=args.chunk_size,
-                    chunk_overlap=args.chunk_overlap,
-                    content_format=args.content_format,
-                    hard_refresh=args.hard_refresh,
+            elif pipeline_name == "layout-no-skill-v2":
+                payload = LayoutNoSkillV2Pipeline().run(
+                    LayoutNoSkillV2PipelineOptions(
+                        src=args.src,
+                        demo=args.demo,
+                        chunk_container=args.chunk_container,
+                        name_prefix=args.name_prefix,
+                        chunk_size=args.chunk_size,
+                        chunk_overlap=args.chunk_overlap,
+                        content_format=args.content_format,
+                        hard_refresh=args.hard_refresh,
+                        cpu_workers=args.cpu_workers,
+                        dedup=args.dedup,
+                        artifact_vectors=args.artifact_vectors,
+                        cache_dir=args.cache_dir,
+                        image_preprocess=image_preprocess,
+                        figure_calls=args.figure_calls,
+                        figure_verbalization=args.figure_verbalization,
+                        openai_batch_dir=args.openai_batch_dir,
+                    )
                 )
-            )
-        else:
-            payload = DirectPipeline().run(
-                DirectPipelineOptions(
-                    src=args.src,
-                    model_id=args.model,
-                    content_format=args.content_format,
+            else:
+                payloads = DirectPipeline().run_formats(
+                    DirectPipelineOptions(
+                        src=args.src,
+                        model_id=args.model,
+                        content_format=content_formats[0],
+                        extra_content_formats=content_formats[1:],
+                        cache_dir=args.cache_dir,
+                        cpu_workers=args.cpu_workers,
+                    )
                 )
-            )
     except FileNotFoundError as exc:
         print(f"Error: {exc}")
 
@@ -285,49 +527,118 @@ def main() -> int:
 
         return 3
 
+    if cassette is not None:
+        calls = ", ".join(
+            f"{service}={count}" for service, count in sorted(cassette.summary()["calls"].items())
+        )
+        print(f"Cassette {cassette.mode}: {calls or 'no calls'} ({args.cassette_dir})")
+
+    if pipeline_name == "layout-no-skill-v2" and payload.get("openai_batch"):
+        batch = payload["openai_batch"]
+        print(
+            f"OpenAI batch: served={batch['served']} pending={batch['pending']} ({batch['root']})"
+        )
+        for input_file in batch["input_files"]:
+            print(f"Wrote batch input {input_file}")
+
+    if tracer is not None:
+        LocalOutputStore().save(tracer.chrome_trace(), args.trace)
+        print(f"Saved trace {args.trace}")
+
+    if args.perf_report:
+        perf_payload = next(iter(payloads.values())) if pipeline_name == "direct" else payload
+        LocalOutputStore().save(perf_payload.get("perf", {}), args.perf_report)
+        print(f"Saved perf report {args.perf_report}")
+
     container = "data"
 
-    if args.out:
-        filename = args.out
+    outputs: list[tuple[str, object]] = []
+    if pipeline_name == "direct":
+        for content_format, format_payload in payloads.items():
+            if args.out and len(payloads) > 1:
+                filename = _format_output_path(args.out, content_format)
+            elif args.out:
+                filename = args.out
+            else:
+                filename = _default_output_path(args.src, content_format)
+            outputs.append((filename, format_payload))
+    elif args.out:
+        outputs.append((args.out, payload))
     elif pipeline_name == "layout-skill":
-        filename = _default_layout_output_path(args.src)
+        outputs.append((_default_layout_output_path(args.src), payload))
     elif pipeline_name == "layout-no-skill":
-        filename = _default_layout_no_skill_output_path(args.src, args.demo)
-    elif pipeline_name == "layout-no-skill-v2":
-        filename = _default_layout_no_skill_v2_output_path(args.src, args.demo)
+        outputs.append((_default_layout_no_skill_output_path(args.src, args.demo), payload))
     else:
-        filename = _default_output_path(args.src, args.content_format)
+        outputs.append((_default_layout_no_skill_v2_output_path(args.src, args.demo), payload))
+
+    if profile is not None:
+        profile_path = profile.dump(profile_path_for_output(f"{container}/{outputs[0][0]}", args.profile))
+        profile_summary = {"path": profile_path, **profile.summary()}
+        for _, output_payload in outputs:
+            if isinstance(output_payload, dict):
+                output_payload["profile"] = profile_summary
+        print(f"Saved profile {profile_path}")
 
     config = get_config()
     storage_blob_endpoint = config.get("storage_blob_endpoint")
     storage_blob_api_key = config.get("storage_blob_api_key")
 
-    if storage_blob_endpoint:
+    storage_service = None
+    if storage_blob_endpoint and args.cassette != "replay":
         storage_service = AzureStorageAccountService(
             endpoint=storage_blob_endpoint,
             api_key=storage_blob_api_key,
         )
 
-        blob_name = filename.lstrip("/").replace("\\", "/")
-        if isinstance(payload, str):
-            saved_to = storage_service.upload_text(
-                container_name=container,
-                blob_name=blob_name,
-                text=payload,
-            )
+    for filename, output_payload in outputs:
+        streamed = args.output_format != "json" and not isinstance(output_payload, str)
+        if streamed and not args.out:
+            filename = output_path_for_format(filename, args.output_format)
+        elif not streamed:
+            output_payload = compact_payload(output_payload, args.output_vectors)
+
+        if storage_service is not None:
+            blob_name = filename.lstrip("/").replace("\\", "/")
+            if streamed:
+                saved_to = storage_service.upload_stream(
+                    container_name=container,
+                    blob_name=blob_name,
+                    chunks=encode_output(
+                        output_payload,
+                        output_format=args.output_format,
+                        output_vectors=args.output_vectors,
+                    ),
+                    content_type=output_content_type(args.output_format),
+                )
+            elif isinstance(output_payload, str):
+                saved_to = storage_service.upload_text(
+                    container_name=container,
+                    blob_name=blob_name,
+                    text=output_payload,
+                )
+            else:
+                saved_to = storage_service.upload_json(
+                    container_name=container,
+                    blob_name=blob_name,
+                    payload=output_payload,
+                )
         else:
-            saved_to = storage_service.upload_json(
-                container_name=container,
-                blob_name=blob_name,
-                payload=payload,
-            )
-    else:
-        out_path = f"{container}/{filename}"
-        store = LocalOutputStore()
-        store.save(payload, out_path)
-        saved_to = out_path
+            out_path = f"{container}/{filename}"
+            store = LocalOutputStore()
+            if streamed:
+                store.save_stream(
+                    encode_output(
+                        output_payload,
+                        output_format=args.output_format,
+                        output_vectors=args.output_vectors,
+                    ),
+                    out_path,
+                )
+            else:
+                store.save(output_payload, out_path)
+            saved_to = out_path
 
-    print(f"Saved {saved_to}")
+        print(f"Saved {saved_to}")
 
     return 0
 
@@ -10,6 +10,7 @@ class AppConfig(TypedDict):
     storage_blob_api_key: str | None
     ai_search_endpoint: str | None
     ai_search_api_key: str | None
+    ai_search_gzip_min_bytes: int | None
     embedding_provider: str | None
     foundry_endpoint: str | None
     foundry_api_key: str | None
@@ -42,6 +43,18 @@ def get_config() -> AppConfig:
     blob_api_key = (os.getenv("AZURE_STORAGE_BLOB_API_KEY") or "").strip() or None
     ai_search_endpoint = (os.getenv("AZURE_AI_SEARCH_ENDPOINT") or "").strip() or None
     ai_search_api_key = (os.getenv("AZURE_AI_SEARCH_API_KEY") or "").strip() or None
+    ai_search_gzip_min_bytes_raw = (os.getenv("AZURE_AI_SEARCH_GZIP_MIN_BYTES") or "").strip()
+    ai_search_gzip_min_bytes = None
+    if ai_search_gzip_min_bytes_raw:
+        try:
+            ai_search_gzip_min_bytes = int(ai_search_gzip_min_bytes_raw)
+        except ValueError:
+            raise ValueError(
+                "AZURE_AI_SEARCH_GZIP_MIN_BYTES must be a whole number of bytes, "
+                f"got '{ai_search_gzip_min_bytes_raw}'."
+            ) from None
+        if ai_search_gzip_min_bytes < 0:
+            raise ValueError("AZURE_AI_SEARCH_GZIP_MIN_BYTES must be zero or positive.")
     embedding_provider = (os.getenv("AZURE_EMBEDDING_PROVIDER") or "").strip() or None
     foundry_endpoint = (os.getenv("AZURE_FOUNDRY_ENDPOINT") or "").strip() or None
     foundry_api_key = (os.getenv("AZURE_FOUNDRY_API_KEY") or "").strip() or None
@@ -87,6 +100,7 @@ def get_config() -> AppConfig:
         "storage_blob_api_key": blob_api_key,
         "ai_search_endpoint": ai_search_endpoint.rstrip("/") if ai_search_endpoint else None,
         "ai_search_api_key": ai_search_api_key,
+        "ai_search_gzip_min_bytes": ai_search_gzip_min_bytes,
         "embedding_provider": embedding_provider,
         "foundry_endpoint": foundry_endpoint.rstrip("/") if foundry_endpoint else None,
         "foundry_api_key": foundry_api_key,
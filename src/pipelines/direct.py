@@ -1,15 +1,44 @@
 from typing import Any, Dict
 
-from ..services.document_intelligence import analyze_any
+from ..services.document_intelligence import analyze_any_formats
+from ..services.shared import CpuStagePool
+from ..storage import LocalJsonCache
+from ..telemetry import perf_run, span, usage_run
 from .types import DirectPipelineOptions
 
+RAW_RESULT_CACHE_NAMESPACE = "document-intelligence-raw"
+
 
 class DirectPipeline:
     """Current extraction flow backed by direct Document Intelligence SDK calls."""
 
+    @staticmethod
+    def _cache(options: DirectPipelineOptions) -> LocalJsonCache | None:
+        if not options.cache_dir:
+            return None
+        return LocalJsonCache(RAW_RESULT_CACHE_NAMESPACE, root=options.cache_dir)
+
     def run(self, options: DirectPipelineOptions) -> Dict[str, Any]:
-        return analyze_any(
-            src=options.src,
-            model_id=options.model_id,
-            content_format=options.content_format,
-        )
+        return self.run_formats(options)[options.content_format]
+
+    def run_formats(self, options: DirectPipelineOptions) -> Dict[str, Dict[str, Any]]:
+        """Render the primary and any extra content formats from a single DI analysis."""
+        with (
+            perf_run() as perf,
+            usage_run() as usage,
+            span("pipeline", pipeline="direct"),
+            CpuStagePool(max_workers=options.cpu_workers) as cpu_pool,
+        ):
+            payloads = analyze_any_formats(
+                src=options.src,
+                model_id=options.model_id,
+                content_formats=(options.content_format, *options.extra_content_formats),
+                cache=self._cache(options),
+                cpu_pool=cpu_pool,
+            )
+        summary = perf.summary()
+        usage_summary = usage.summary()
+        for payload in payloads.values():
+            payload["perf"] = summary
+            payload["usage"] = usage_summary
+        return payloads
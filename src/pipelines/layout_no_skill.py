@@ -1,14 +1,45 @@
 from typing import Any, Dict
 
 from ..services.document_layout_no_skill import DocumentLayoutNoSkillService
+from ..storage import LocalJsonCache
+from ..telemetry import perf_run, span, usage_run
 from .types import LayoutNoSkillPipelineOptions
 
+VISION_CACHE_NAMESPACE = "layout-no-skill-vision"
+
 
 class LayoutNoSkillPipeline:
     """Proof-of-concept layout flow targeting one final index."""
 
+    @staticmethod
+    def _vision_cache(options: LayoutNoSkillPipelineOptions) -> LocalJsonCache | None:
+        if not options.cache_dir:
+            return None
+        return LocalJsonCache(VISION_CACHE_NAMESPACE, root=options.cache_dir)
+
     def run(self, options: LayoutNoSkillPipelineOptions) -> Dict[str, Any]:
-        service = DocumentLayoutNoSkillService()
+        vision_cache = self._vision_cache(options)
+        with (
+            perf_run() as perf,
+            usage_run() as usage,
+            span("pipeline", pipeline="layout-no-skill"),
+        ):
+            payload = self._run(options, vision_cache)
+        payload["perf"] = perf.summary()
+        payload["usage"] = usage.summary()
+        if vision_cache is not None:
+            payload["vision_cache"] = {
+                "root": options.cache_dir,
+                "evicted": vision_cache.prune(options.cache_max_entries),
+            }
+        return payload
+
+    def _run(
+        self, options: LayoutNoSkillPipelineOptions, vision_cache: LocalJsonCache | None = None
+    ) -> Dict[str, Any]:
+        service = DocumentLayoutNoSkillService(
+            vision_cache=vision_cache, figure_workers=options.figure_workers
+        )
         if options.demo:
             return service.run_demo(
                 chunk_container=options.chunk_container,
@@ -16,6 +47,8 @@ class LayoutNoSkillPipeline:
                 chunk_size=options.chunk_size,
                 chunk_overlap=options.chunk_overlap,
                 hard_refresh=options.hard_refresh,
+                dedup=options.dedup,
+                artifact_vectors=options.artifact_vectors,
             )
 
         if options.src:
@@ -26,6 +59,8 @@ class LayoutNoSkillPipeline:
                 chunk_size=options.chunk_size,
                 chunk_overlap=options.chunk_overlap,
                 hard_refresh=options.hard_refresh,
+                dedup=options.dedup,
+                artifact_vectors=options.artifact_vectors,
             )
 
         raise ValueError("Missing --src for layout-no-skill when not running --demo.")
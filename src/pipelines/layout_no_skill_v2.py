@@ -1,14 +1,57 @@
+from contextlib import nullcontext
+from pathlib import Path
 from typing import Any, Dict
 
 from ..services.document_layout_no_skill_v2 import DocumentLayoutNoSkillV2Service
+from ..services.openai import openai_batch_run
+from ..storage import LocalJsonCache, cassette_run
+from ..telemetry import perf_run, span, usage_run
 from .types import LayoutNoSkillV2PipelineOptions
 
+FIGURE_CACHE_NAMESPACE = "layout-no-skill-v2-figures"
+# Batch passes re-run extraction; DI results are reused from here instead of re-analyzed.
+OPENAI_BATCH_EXTRACTION_DIR = "extraction"
+
 
 class LayoutNoSkillV2Pipeline:
     """Sibling no-skill layout flow with grounded semantic figure retrieval."""
 
+    @staticmethod
+    def _figure_cache(options: LayoutNoSkillV2PipelineOptions) -> LocalJsonCache | None:
+        if not options.cache_dir:
+            return None
+        return LocalJsonCache(FIGURE_CACHE_NAMESPACE, root=options.cache_dir)
+
     def run(self, options: LayoutNoSkillV2PipelineOptions) -> Dict[str, Any]:
-        service = DocumentLayoutNoSkillV2Service()
+        batching = (
+            openai_batch_run(options.openai_batch_dir) if options.openai_batch_dir else nullcontext()
+        )
+        extraction = (
+            cassette_run(
+                "reuse",
+                Path(options.openai_batch_dir) / OPENAI_BATCH_EXTRACTION_DIR,
+                services=("document_intelligence",),
+            )
+            if options.openai_batch_dir
+            else nullcontext()
+        )
+        with (
+            batching as batch,
+            extraction,
+            perf_run() as perf,
+            usage_run() as usage,
+            span("pipeline", pipeline="layout-no-skill-v2"),
+        ):
+            payload = self._run(options)
+        payload["perf"] = perf.summary()
+        payload["usage"] = usage.summary()
+        if batch is not None:
+            batch.write_input()
+            payload["openai_batch"] = batch.summary()
+        return payload
+
+    def _run(self, options: LayoutNoSkillV2PipelineOptions) -> Dict[str, Any]:
+        service = DocumentLayoutNoSkillV2Service(figure_verbalization=options.figure_verbalization)
         if options.demo:
             return service.run_demo(
                 chunk_container=options.chunk_container,
@@ -17,6 +60,13 @@ class LayoutNoSkillV2Pipeline:
                 chunk_overlap=options.chunk_overlap,
                 content_format=options.content_format,
                 hard_refresh=options.hard_refresh,
+                dedup=options.dedup,
+                artifact_vectors=options.artifact_vectors,
+                cpu_workers=options.cpu_workers,
+                figure_cache=self._figure_cache(options),
+                image_preprocess=options.image_preprocess,
+                figure_calls=options.figure_calls,
+                figure_verbalization=options.figure_verbalization,
             )
 
         if options.src:
@@ -28,6 +78,13 @@ class LayoutNoSkillV2Pipeline:
                 chunk_overlap=options.chunk_overlap,
                 content_format=options.content_format,
                 hard_refresh=options.hard_refresh,
+                dedup=options.dedup,
+                artifact_vectors=options.artifact_vectors,
+                cpu_workers=options.cpu_workers,
+                figure_cache=self._figure_cache(options),
+                image_preprocess=options.image_preprocess,
+                figure_calls=options.figure_calls,
+                figure_verbalization=options.figure_verbalization,
             )
 
         raise ValueError("Missing --src for layout-no-skill-v2 when not running --demo.")
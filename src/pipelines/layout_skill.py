@@ -1,6 +1,7 @@
 from typing import Any, Dict
 
 from ..services.document_layout_skill import DocumentLayoutSkillService
+from ..telemetry import perf_run, span, usage_run
 from .types import LayoutSkillPipelineOptions
 
 
@@ -8,6 +9,17 @@ class LayoutSkillPipeline:
     """Extraction flow backed by Azure AI Search Document Layout skill."""
 
     def run(self, options: LayoutSkillPipelineOptions) -> Dict[str, Any]:
+        with (
+            perf_run() as perf,
+            usage_run() as usage,
+            span("pipeline", pipeline="layout-skill"),
+        ):
+            payload = self._run(options)
+        payload["perf"] = perf.summary()
+        payload["usage"] = usage.summary()
+        return payload
+
+    def _run(self, options: LayoutSkillPipelineOptions) -> Dict[str, Any]:
         service = DocumentLayoutSkillService()
 
         if options.demo:
@@ -2,7 +2,12 @@ from dataclasses import dataclass
 from typing import Literal
 
 from ..services.document_intelligence.extractor import ContentFormat
+from ..services.shared.dedup import DedupScope
+from ..services.shared.image_preprocess import ImagePreprocessOptions
+from ..storage.vector_sidecar import ArtifactVectors
 
+FigureCallMode = Literal["separate", "fused"]
+FigureVerbalization = Literal["llm", "template"]
 PipelineName = Literal["direct", "layout-skill", "layout-no-skill", "layout-no-skill-v2"]
 
 
@@ -11,6 +16,9 @@ class DirectPipelineOptions:
     src: str
     model_id: str
     content_format: ContentFormat
+    extra_content_formats: tuple[ContentFormat, ...] = ()
+    cache_dir: str | None = None
+    cpu_workers: int = 0
 
 
 @dataclass(frozen=True)
@@ -33,6 +41,11 @@ class LayoutNoSkillPipelineOptions:
     chunk_size: int
     chunk_overlap: int
     hard_refresh: bool
+    dedup: DedupScope = "off"
+    artifact_vectors: ArtifactVectors = "inline"
+    cache_dir: str | None = None
+    cache_max_entries: int = 50000
+    figure_workers: int = 4
 
 
 @dataclass(frozen=True)
@@ -45,3 +58,11 @@ class LayoutNoSkillV2PipelineOptions:
     chunk_overlap: int
     content_format: Literal["text", "markdown"]
     hard_refresh: bool
+    cpu_workers: int = 0
+    dedup: DedupScope = "off"
+    artifact_vectors: ArtifactVectors = "inline"
+    cache_dir: str | None = None
+    image_preprocess: ImagePreprocessOptions = ImagePreprocessOptions()
+    figure_calls: FigureCallMode = "separate"
+    figure_verbalization: FigureVerbalization = "llm"
+    openai_batch_dir: str | None = None
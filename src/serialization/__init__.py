@@ -0,0 +1,23 @@
+from .json_codec import (
+    JSON_CODEC_ENV,
+    JsonCodec,
+    OrjsonCodec,
+    StdlibJsonCodec,
+    dumps,
+    dumps_bytes,
+    get_codec,
+    loads,
+    set_codec,
+)
+
+__all__ = [
+    "JSON_CODEC_ENV",
+    "JsonCodec",
+    "OrjsonCodec",
+    "StdlibJsonCodec",
+    "dumps",
+    "dumps_bytes",
+    "get_codec",
+    "loads",
+    "set_codec",
+]
@@ -0,0 +1,103 @@
+import json
+import os
+from typing import Any, Protocol
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+JSON_CODEC_ENV = "DOCUMENT_READER_JSON_CODEC"
+
+
+class JsonCodec(Protocol):
+    name: str
+
+    def dumps_bytes(self, value: Any, *, indent: bool = False, sort_keys: bool = False) -> bytes:
+        ...
+
+    def loads(self, data: bytes | bytearray | memoryview | str) -> Any:
+        ...
+
+
+def _stdlib_default(value: Any) -> Any:
+    # numpy arrays and scalars expose tolist(); covers vectors loaded from .npy sidecars.
+    to_list = getattr(value, "tolist", None)
+    if callable(to_list):
+        return to_list()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class StdlibJsonCodec:
+    """`json` module codec; compact separators unless indented."""
+
+    name = "json"
+
+    def dumps_bytes(self, value: Any, *, indent: bool = False, sort_keys: bool = False) -> bytes:
+        return json.dumps(
+            value,
+            ensure_ascii=False,
+            indent=2 if indent else None,
+            separators=None if indent else (",", ":"),
+            sort_keys=sort_keys,
+            default=_stdlib_default,
+        ).encode("utf-8")
+
+    def loads(self, data: bytes | bytearray | memoryview | str) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """orjson codec with native numpy serialization."""
+
+    name = "orjson"
+
+    def dumps_bytes(self, value: Any, *, indent: bool = False, sort_keys: bool = False) -> bytes:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(value, default=_stdlib_default, option=option)
+
+    def loads(self, data: bytes | bytearray | memoryview | str) -> Any:
+        return orjson.loads(data)
+
+
+def _select_codec(name: str | None = None) -> JsonCodec:
+    requested = (name or os.getenv(JSON_CODEC_ENV) or "auto").strip().lower()
+    if requested == "json":
+        return StdlibJsonCodec()
+    if requested == "orjson" and orjson is None:
+        raise ValueError(f"{JSON_CODEC_ENV}=orjson but orjson is not installed.")
+    if requested not in ("auto", "orjson"):
+        raise ValueError(f"Unsupported JSON codec '{requested}'. Expected auto, orjson or json.")
+    return OrjsonCodec() if orjson is not None else StdlibJsonCodec()
+
+
+_codec: JsonCodec = _select_codec()
+
+
+def get_codec() -> JsonCodec:
+    return _codec
+
+
+def set_codec(codec: JsonCodec | str) -> JsonCodec:
+    """Swaps the process-wide codec, by instance or by name (`auto`, `orjson`, `json`)."""
+    global _codec
+    _codec = _select_codec(codec) if isinstance(codec, str) else codec
+    return _codec
+
+
+def dumps_bytes(value: Any, *, indent: bool = False, sort_keys: bool = False) -> bytes:
+    return _codec.dumps_bytes(value, indent=indent, sort_keys=sort_keys)
+
+
+def dumps(value: Any, *, indent: bool = False, sort_keys: bool = False) -> str:
+    return _codec.dumps_bytes(value, indent=indent, sort_keys=sort_keys).decode("utf-8")
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    return _codec.loads(data)
@@ -3,9 +3,11 @@ from typing import Any
 from azure.core.credentials import AzureKeyCredential, TokenCredential
 from azure.search.documents import SearchClient
 from azure.search.documents.indexes import SearchIndexClient
+from azure.search.documents.indexes.models import SearchIndex
 
 from src.auth.iam import IAM
 from src.conf.conf import get_config
+from src.storage import through_cassette
 
 
 class AISearchService:
@@ -41,6 +43,12 @@ class AISearchService:
             credential=self.credential,
         )
 
+    def create_or_update_index(self, index: SearchIndex) -> None:
+        def create() -> None:
+            self.get_search_index_client().create_or_update_index(index)
+
+        through_cassette("search", ("create_or_update_index", index.name), create)
+
     def test_connection(self) -> dict[str, Any]:
         search_index_client = self.get_search_index_client()
 
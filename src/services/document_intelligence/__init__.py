@@ -1,4 +1,17 @@
-from .extractor import ContentFormat, analyze_any
+from .extractor import (
+    CONTENT_FORMATS,
+    ContentFormat,
+    analyze_any,
+    analyze_any_formats,
+    parse_content_formats,
+)
 from .service import DocumentIntelligenceService
 
-__all__ = ["ContentFormat", "analyze_any", "DocumentIntelligenceService"]
+__all__ = [
+    "CONTENT_FORMATS",
+    "ContentFormat",
+    "analyze_any",
+    "analyze_any_formats",
+    "parse_content_formats",
+    "DocumentIntelligenceService",
+]
@@ -1,5 +1,6 @@
+from bisect import bisect_right
 from pathlib import Path
-from typing import Any, Dict, Literal, Tuple
+from typing import Any, Dict, Literal, Sequence, Tuple, get_args
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlparse
 from urllib.request import Request, urlopen
@@ -8,10 +9,15 @@ from html import escape
 from azure.ai.documentintelligence.models import DocumentContentFormat
 from azure.core.exceptions import HttpResponseError
 
+from src.services.shared import CpuStagePool
+from src.storage import LocalJsonCache
+from src.telemetry import span
+
 from .service import DocumentIntelligenceService
 from .utils.normalize import get_metadata, to_html_payload, to_raw_json
 
 ContentFormat = Literal["text", "markdown", "html"]
+CONTENT_FORMATS: Tuple[str, ...] = get_args(ContentFormat)
 
 SUPPORTED_DIRECT = {
     ".pdf",
@@ -119,27 +125,155 @@ def _to_di_content_format(content_format: ContentFormat) -> DocumentContentForma
     return DocumentContentFormat.TEXT
 
 
-def _serialize_raw(result: Any, content_format: ContentFormat) -> Dict[str, Any]:
-    payload = to_raw_json(result)
+def parse_content_formats(value: str | Sequence[str]) -> Tuple[ContentFormat, ...]:
+    items = value.split(",") if isinstance(value, str) else list(value)
+    formats: list[ContentFormat] = []
+    for item in items:
+        normalized = item.strip().lower()
+        if not normalized:
+            continue
+        if normalized not in CONTENT_FORMATS:
+            raise ValueError(
+                f"Unsupported content format '{normalized}'. Expected one of: {', '.join(CONTENT_FORMATS)}."
+            )
+        if normalized not in formats:
+            formats.append(normalized)  # type: ignore[arg-type]
+    if not formats:
+        raise ValueError("At least one content format is required.")
+    return tuple(formats)
+
+
+def _analysis_format(content_formats: Sequence[ContentFormat]) -> ContentFormat:
+    # Markdown output can be rendered down to text and html locally, but not the reverse.
+    return "markdown" if "markdown" in content_formats else "text"
+
+
+def _text_from_raw(payload: Dict[str, Any]) -> str:
+    pages = payload.get("pages") or []
+    return "\n".join(
+        str(line.get("content") or "")
+        for page in pages
+        for line in (page.get("lines") or [])
+    )
+
+
+def _markdown_to_text_offsets(payload: Dict[str, Any]) -> list[tuple[int, int, int]]:
+    # (markdown start, markdown end, text start) for every line span, in `_text_from_raw` order.
+    segments: list[tuple[int, int, int]] = []
+    cursor = 0
+    for page in payload.get("pages") or []:
+        for line in page.get("lines") or []:
+            line_cursor = cursor
+            for line_span in line.get("spans") or []:
+                offset = int(line_span.get("offset") or 0)
+                length = int(line_span.get("length") or 0)
+                segments.append((offset, offset + length, line_cursor))
+                line_cursor += length
+            cursor += len(str(line.get("content") or "")) + 1
+    return sorted(segments)
+
+
+def _rebase_span(
+    span_value: Dict[str, Any], segments: list[tuple[int, int, int]]
+) -> Dict[str, Any] | None:
+    start = int(span_value.get("offset") or 0)
+    end = start + int(span_value.get("length") or 0)
+    rebased_start: int | None = None
+    rebased_end = 0
+    for md_start, md_end, text_start in segments[max(0, bisect_right(segments, (start,)) - 1) :]:
+        if md_start >= end:
+            break
+        if md_end <= start:
+            continue
+        if rebased_start is None:
+            rebased_start = max(start, md_start) - md_start + text_start
+        rebased_end = min(end, md_end) - md_start + text_start
+    if rebased_start is None:
+        return None
+    return {**span_value, "offset": rebased_start, "length": rebased_end - rebased_start}
+
+
+def _rebase_spans(value: Any, segments: list[tuple[int, int, int]]) -> Any:
+    # Markdown-only characters (headings, table pipes) have no text offset; spans covering
+    # only those are dropped.
+    if isinstance(value, list):
+        return [_rebase_spans(item, segments) for item in value]
+    if not isinstance(value, dict):
+        return value
+    rebased: Dict[str, Any] = {}
+    for key, item in value.items():
+        if key == "spans" and isinstance(item, list):
+            rebased[key] = [
+                span_value
+                for span_value in (_rebase_span(entry, segments) for entry in item)
+                if span_value is not None
+            ]
+        elif key == "span" and isinstance(item, dict):
+            span_value = _rebase_span(item, segments)
+            if span_value is not None:
+                rebased[key] = span_value
+        else:
+            rebased[key] = _rebase_spans(item, segments)
+    return rebased
+
+
+def render_raw_payload(payload: Dict[str, Any], content_format: ContentFormat) -> Dict[str, Any]:
+    # Works on the plain `as_dict()` payload so it can run in a CpuStagePool worker.
+    payload = dict(payload)
+    if content_format == "text" and payload.get("contentFormat") == "markdown":
+        # Every span points into the markdown `content`; move them onto the derived text.
+        segments = _markdown_to_text_offsets(payload)
+        payload = _rebase_spans(payload, segments)
+        payload["content"] = _text_from_raw(payload)
+        payload["derivedFrom"] = "markdown"
     payload["contentFormat"] = content_format
-    payload["metadata"] = get_metadata(result)
+    payload["metadata"] = get_metadata(payload)
 
     if content_format == "html":
-        payload["content"] = to_html_payload(result)
+        payload["content"] = to_html_payload(payload)
 
     return payload
 
 
-def analyze_any(
+def _analyze_raw(
     src: str,
-    model_id: str = "prebuilt-layout",
-    content_format: ContentFormat = "text",
+    model_id: str,
+    analysis_format: ContentFormat,
+    cache: LocalJsonCache | None = None,
 ) -> Dict[str, Any]:
-    service = DocumentIntelligenceService()
     kind, ext = _detect_kind(src)
-    di_content_format = _to_di_content_format(content_format)
+    di_content_format = _to_di_content_format(analysis_format)
+
+    data: bytes | None = None
+    if kind == "file":
+        path = Path(src)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {path}")
+        if ext == ".md":
+            data = _tiny_markdown_to_html(path.read_text(encoding="utf-8")).encode("utf-8")
+        elif ext in SUPPORTED_DIRECT:
+            data = path.read_bytes()
+        else:
+            raise ValueError(
+                f"Unsupported file extension: {ext or '<none>'}. Convert to PDF/HTML first."
+            )
+
+    cache_key = None
+    if cache is not None:
+        source_key = data if data is not None else src
+        cache_key = LocalJsonCache.make_key(source_key, model_id, analysis_format)
+        # A cached markdown analysis can also serve text and html renders.
+        for cached_format in dict.fromkeys((analysis_format, "markdown")):
+            cached = cache.get(LocalJsonCache.make_key(source_key, model_id, cached_format))
+            if cached is not None:
+                return cached
 
-    if kind == "url":
+    service = DocumentIntelligenceService()
+    if data is not None:
+        result = service.analyze_bytes(
+            data=data, model_id=model_id, content_format=di_content_format
+        )
+    else:
         try:
             result = service.analyze_url(
                 url=src, model_id=model_id, content_format=di_content_format
@@ -149,37 +283,51 @@ def analyze_any(
             # DI sometimes cannot fetch externally accessible URLs due to source-side restrictions.
             if exc.status_code == 400 and "could not download the file" in message:
                 try:
-                    data = _load_url_bytes(src)
+                    url_data = _load_url_bytes(src)
                 except (HTTPError, URLError, TimeoutError) as fetch_exc:
                     raise ValueError(f"Failed to download URL locally: {fetch_exc}") from fetch_exc
                 result = service.analyze_bytes(
-                    data=data,
+                    data=url_data,
                     model_id=model_id,
                     content_format=di_content_format,
                 )
             else:
                 raise
-        return _serialize_raw(result, content_format)
 
-    path = Path(src)
-    if not path.exists():
-        raise FileNotFoundError(f"File not found: {path}")
-
-    if ext == ".md":
-        html = _tiny_markdown_to_html(path.read_text(encoding="utf-8"))
-        result = service.analyze_bytes(
-            data=html.encode("utf-8"),
-            model_id=model_id,
-            content_format=di_content_format,
-        )
+    payload = to_raw_json(result)
+    if cache is not None and cache_key is not None:
+        cache.set(cache_key, payload)
+    return payload
 
-        return _serialize_raw(result, content_format)
 
-    if ext not in SUPPORTED_DIRECT:
-        raise ValueError(
-            f"Unsupported file extension: {ext or '<none>'}. Convert to PDF/HTML first."
-        )
+def analyze_any_formats(
+    src: str,
+    model_id: str = "prebuilt-layout",
+    content_formats: Sequence[ContentFormat] = ("text",),
+    cache: LocalJsonCache | None = None,
+    cpu_pool: CpuStagePool | None = None,
+) -> Dict[ContentFormat, Dict[str, Any]]:
+    """Analyze once and render every requested content format from the same raw result.
+
+    With an enabled `cpu_pool`, each format is rendered in a worker process.
+    """
+    formats = parse_content_formats(content_formats)
+    raw = _analyze_raw(src, model_id, _analysis_format(formats), cache)
+    pool = cpu_pool or CpuStagePool()
+    with span("di.render", formats=",".join(formats)):
+        futures = {
+            content_format: pool.submit(render_raw_payload, raw, content_format)
+            for content_format in formats
+        }
+        return {content_format: future.result() for content_format, future in futures.items()}
 
-    result = service.analyze_file(path=path, model_id=model_id, content_format=di_content_format)
 
-    return _serialize_raw(result, content_format)
+def analyze_any(
+    src: str,
+    model_id: str = "prebuilt-layout",
+    content_format: ContentFormat = "text",
+    cache: LocalJsonCache | None = None,
+) -> Dict[str, Any]:
+    return analyze_any_formats(
+        src=src, model_id=model_id, content_formats=(content_format,), cache=cache
+    )[content_format]
@@ -1,13 +1,20 @@
+import hashlib
 import io
 from pathlib import Path
 from typing import Any
 
 from azure.ai.documentintelligence import DocumentIntelligenceClient
-from azure.ai.documentintelligence.models import AnalyzeOutputOption, DocumentContentFormat
+from azure.ai.documentintelligence.models import (
+    AnalyzeOutputOption,
+    AnalyzeResult,
+    DocumentContentFormat,
+)
 from azure.core.credentials import AzureKeyCredential
 
 from src.auth.iam import IAM
 from src.conf.conf import get_config
+from src.storage import decode_bytes, encode_bytes, through_cassette
+from src.telemetry import record_document_intelligence_pages, span
 
 
 class DocumentIntelligenceService:
@@ -28,18 +35,34 @@ class DocumentIntelligenceService:
 
         return IAM().get_credential()
 
+    @staticmethod
+    def _record_pages(model_id: str, result: Any) -> Any:
+        pages = getattr(result, "pages", None) or []
+        record_document_intelligence_pages(model_id, len(pages))
+        return result
+
     def analyze_url(
         self,
         url: str,
         model_id: str = "prebuilt-layout",
         content_format: DocumentContentFormat = DocumentContentFormat.TEXT,
     ) -> Any:
-        poller = self.client.begin_analyze_document(
-            model_id=model_id,
-            body={"urlSource": url},
-            output_content_format=content_format,
+        def analyze() -> Any:
+            with span("di.analyze", model_id=model_id):
+                poller = self.client.begin_analyze_document(
+                    model_id=model_id,
+                    body={"urlSource": url},
+                    output_content_format=content_format,
+                )
+                return self._record_pages(model_id, poller.result())
+
+        return through_cassette(
+            "document_intelligence",
+            ("analyze", model_id, DocumentContentFormat(content_format).value, url),
+            analyze,
+            encode=lambda result: result.as_dict(),
+            decode=AnalyzeResult,
         )
-        return poller.result()
 
     def analyze_bytes(
         self,
@@ -47,13 +70,28 @@ class DocumentIntelligenceService:
         model_id: str = "prebuilt-layout",
         content_format: DocumentContentFormat = DocumentContentFormat.TEXT,
     ) -> Any:
-        poller = self.client.begin_analyze_document(
-            model_id=model_id,
-            body=io.BytesIO(data),
-            output_content_format=content_format,
-        )
+        def analyze() -> Any:
+            with span("di.analyze", model_id=model_id):
+                poller = self.client.begin_analyze_document(
+                    model_id=model_id,
+                    body=io.BytesIO(data),
+                    output_content_format=content_format,
+                )
 
-        return poller.result()
+                return self._record_pages(model_id, poller.result())
+
+        return through_cassette(
+            "document_intelligence",
+            lambda: (
+                "analyze",
+                model_id,
+                DocumentContentFormat(content_format).value,
+                hashlib.sha256(data).hexdigest(),
+            ),
+            analyze,
+            encode=lambda result: result.as_dict(),
+            decode=AnalyzeResult,
+        )
 
     def analyze_file(
         self,
@@ -72,18 +110,58 @@ class DocumentIntelligenceService:
         model_id: str = "prebuilt-layout",
         content_format: DocumentContentFormat = DocumentContentFormat.TEXT,
     ) -> tuple[Any, str | None]:
-        with path.open("rb") as f:
-            poller = self.client.begin_analyze_document(
-                model_id=model_id,
-                body=f,
-                output_content_format=content_format,
-                output=[AnalyzeOutputOption.FIGURES],
-            )
-
-        result = poller.result()
-        operation_id = None
-        if hasattr(poller, "details"):
-            details = getattr(poller, "details") or {}
-            if isinstance(details, dict):
-                operation_id = details.get("operation_id")
-        return result, operation_id
+        def analyze() -> tuple[Any, str | None]:
+            with span("di.analyze", model_id=model_id):
+                with path.open("rb") as f:
+                    poller = self.client.begin_analyze_document(
+                        model_id=model_id,
+                        body=f,
+                        output_content_format=content_format,
+                        output=[AnalyzeOutputOption.FIGURES],
+                    )
+
+                result = self._record_pages(model_id, poller.result())
+            operation_id = None
+            if hasattr(poller, "details"):
+                details = getattr(poller, "details") or {}
+                if isinstance(details, dict):
+                    operation_id = details.get("operation_id")
+            return result, operation_id
+
+        # Figure images are fetched by operation id, so the id is recorded alongside the result.
+        return through_cassette(
+            "document_intelligence",
+            lambda: (
+                "analyze_with_figures",
+                model_id,
+                DocumentContentFormat(content_format).value,
+                hashlib.sha256(path.read_bytes()).hexdigest(),
+            ),
+            analyze,
+            encode=lambda value: {"result": value[0].as_dict(), "operation_id": value[1]},
+            decode=lambda value: (AnalyzeResult(value["result"]), value["operation_id"]),
+        )
+
+    def get_figure_bytes(
+        self,
+        *,
+        result_id: str,
+        figure_id: str,
+        model_id: str = "prebuilt-layout",
+    ) -> bytes:
+        def fetch() -> bytes:
+            with span("figure.fetch"):
+                stream = self.client.get_analyze_result_figure(
+                    model_id=model_id,
+                    result_id=result_id,
+                    figure_id=figure_id,
+                )
+                return b"".join(stream)
+
+        return through_cassette(
+            "document_intelligence",
+            ("figure", model_id, result_id, figure_id),
+            fetch,
+            encode=encode_bytes,
+            decode=decode_bytes,
+        )
@@ -3,6 +3,32 @@ from typing import Any, Dict
 from html import escape
 
 
+class _RawView:
+    """Attribute view over an `as_dict()` payload so raw results normalize like SDK models."""
+
+    __slots__ = ("_raw",)
+
+    def __init__(self, raw: dict) -> None:
+        self._raw = raw
+
+    def __getattr__(self, name: str) -> Any:
+        head, *rest = name.split("_")
+        key = head + "".join(part.title() for part in rest)
+        return _wrap_raw(self._raw.get(key))
+
+
+def _wrap_raw(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _RawView(value)
+    if isinstance(value, list):
+        return [_wrap_raw(item) for item in value]
+    return value
+
+
+def _as_result(result: Any) -> Any:
+    return _RawView(result) if isinstance(result, dict) else result
+
+
 def _span_list(obj: Any) -> list[dict]:
     spans = getattr(obj, "spans", None) or []
     return [
@@ -25,6 +51,7 @@ def _bounding_regions(obj: Any) -> list[dict]:
 
 
 def to_normalized_json(result: Any) -> Dict[str, Any]:
+    result = _as_result(result)
     output: Dict[str, Any] = {
         "model_id": result.model_id,
         "content": result.content,
@@ -112,6 +139,8 @@ def to_normalized_json(result: Any) -> Dict[str, Any]:
 
 
 def to_raw_json(result: Any) -> Dict[str, Any]:
+    if isinstance(result, dict):
+        return dict(result)
     return result.as_dict()
 
 
@@ -1,7 +1,7 @@
-import json
+import hashlib
 import re
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, TypeVar
 from urllib.error import HTTPError, URLError
 from urllib.parse import quote
 from urllib.request import Request, urlopen
@@ -9,23 +9,46 @@ from urllib.request import Request, urlopen
 from azure.ai.documentintelligence.models import DocumentContentFormat
 
 from src.conf.conf import get_config
+from src.serialization import dumps_bytes, loads
 from src.services.ai_search.service import AISearchService
 from src.services.document_intelligence.service import DocumentIntelligenceService
 from src.services.shared import (
+    ChunkDeduplicator,
     DEFAULT_CHUNK_CONTAINER,
     DEFAULT_TARGET_INDEX_NAME,
+    RemoteCallPool,
     build_shared_index,
+    encode_search_body,
 )
 from src.services.storage_account import AzureStorageAccountService
-from src.storage import LocalOutputStore
+from src.storage import (
+    NPY_CONTENT_TYPE,
+    LocalOutputStore,
+    encode_npy,
+    sidecar_descriptor,
+    sidecar_name,
+    LocalJsonCache,
+    split_vectors,
+    through_cassette,
+)
+from src.telemetry import count_metric, record_vision_call, span, usage_source
 
 SEARCH_API_VERSION = "2024-07-01"
 VISION_API_VERSION = "2024-02-01"
+VISION_ANALYZE_API_VERSION = "v3.2"
+VISION_ANALYZE_FEATURES = "Description,Tags,Objects"
+VISION_CACHE_VERSION = "1"
+# In-flight call caps across all concurrent figures; the defaults sit under S0/S1 TPS quotas.
+REMOTE_CONCURRENCY_LIMITS = {"document_intelligence": 4, "vision": 4}
+# Remote calls a single figure issues side by side: DI read, image analysis, image embedding.
+FIGURE_PARALLEL_CALLS = 3
 DEFAULT_DEMO_DIR = Path("documents/demo_files")
 DEFAULT_NAME_PREFIX = DEFAULT_TARGET_INDEX_NAME
 DEFAULT_CHUNK_SIZE = 500
 DEFAULT_CHUNK_OVERLAP = 50
 
+T = TypeVar("T")
+
 
 class SearchApiError(ValueError):
     """Structured Azure AI Search REST error."""
@@ -42,7 +65,9 @@ class SearchApiError(ValueError):
 class DocumentLayoutNoSkillService:
     """Proof-of-concept layout and chunk ingestion flow targeting one final index."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self, *, vision_cache: LocalJsonCache | None = None, figure_workers: int = 0
+    ) -> None:
         config = get_config()
         search_endpoint = config.get("ai_search_endpoint")
         search_api_key = config.get("ai_search_api_key")
@@ -66,6 +91,7 @@ class DocumentLayoutNoSkillService:
 
         self.search_endpoint = search_endpoint.rstrip("/")
         self.search_api_key = search_api_key
+        self.search_gzip_min_bytes = config.get("ai_search_gzip_min_bytes")
         self.embedding_provider = (embedding_provider or "azure_ai_vision").strip().lower()
         self.ai_vision_endpoint = ai_vision_endpoint.rstrip("/")
         self.ai_vision_api_key = ai_vision_api_key
@@ -81,6 +107,8 @@ class DocumentLayoutNoSkillService:
                 api_key=storage_blob_api_key,
             )
         self.local_output_store = LocalOutputStore()
+        self.vision_cache = vision_cache
+        self.figure_workers = int(figure_workers)
 
     @staticmethod
     def _log(message: str) -> None:
@@ -219,17 +247,24 @@ class DocumentLayoutNoSkillService:
         return f"{safe_source}-{record_kind}-{ordinal:04d}"
 
     def _search_request(self, method: str, path: str, body: dict[str, Any] | None = None) -> dict[str, Any]:
+        return through_cassette(
+            "search", (method, path, body), lambda: self._send_search_request(method, path, body)
+        )
+
+    def _send_search_request(
+        self, method: str, path: str, body: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
         url = f"{self.search_endpoint}{path}?api-version={SEARCH_API_VERSION}"
-        data = json.dumps(body).encode("utf-8") if body is not None else None
-        req = Request(url, data=data, method=method)
+        data, headers = encode_search_body(body, gzip_min_bytes=self.search_gzip_min_bytes)
+        req = Request(url, data=data, method=method, headers=headers)
         req.add_header("api-key", self.search_api_key)
-        req.add_header("Content-Type", "application/json")
 
         try:
-            with urlopen(req, timeout=120) as resp:
+            with span("search.request", method=method, path=path), urlopen(req, timeout=120) as resp:
                 raw = resp.read()
-                return json.loads(raw.decode("utf-8")) if raw else {}
+                return loads(raw) if raw else {}
         except HTTPError as exc:
+            count_metric("remote_errors_total", backend="search", status=exc.code)
             detail = exc.read().decode("utf-8", errors="replace")
             raise SearchApiError(
                 method=method,
@@ -238,6 +273,7 @@ class DocumentLayoutNoSkillService:
                 detail=detail,
             ) from exc
         except URLError as exc:
+            count_metric("remote_errors_total", backend="search", status="network")
             raise SearchApiError(
                 method=method,
                 path=path,
@@ -246,6 +282,11 @@ class DocumentLayoutNoSkillService:
             ) from exc
 
     def _search_delete_if_exists(self, path: str) -> None:
+        through_cassette(
+            "search", ("DELETE", path), lambda: self._send_search_delete_if_exists(path)
+        )
+
+    def _send_search_delete_if_exists(self, path: str) -> None:
         url = f"{self.search_endpoint}{path}?api-version={SEARCH_API_VERSION}"
         req = Request(url, method="DELETE")
         req.add_header("api-key", self.search_api_key)
@@ -275,7 +316,37 @@ class DocumentLayoutNoSkillService:
     def _target_index_name(self, name_prefix: str) -> str:
         return self._slug(DEFAULT_NAME_PREFIX)
 
+    def _through_vision_cache(
+        self, route: str, model_version: str, request: bytes, fetch: Callable[[], T]
+    ) -> T:
+        """Serves a Vision response from `vision_cache` keyed by route, model version and input hash."""
+        if self.vision_cache is None:
+            return fetch()
+        key = LocalJsonCache.make_key(
+            VISION_CACHE_VERSION, route, model_version, hashlib.sha256(request).hexdigest()
+        )
+        cached = self.vision_cache.get(key)
+        if isinstance(cached, dict) and "response" in cached:
+            return cached["response"]
+        value = fetch()
+        # Failed image analysis degrades to {}; leave it uncached so the next run retries.
+        if value:
+            self.vision_cache.set(key, {"response": value})
+        return value
+
     def _vision_vectorize(self, *, route: str, payload: dict[str, Any]) -> list[float]:
+        return self._through_vision_cache(
+            route,
+            self.ai_vision_model_version,
+            dumps_bytes(payload, sort_keys=True),
+            lambda: through_cassette(
+                "vision",
+                (route, payload),
+                lambda: self._send_vision_vectorize(route=route, payload=payload),
+            ),
+        )
+
+    def _send_vision_vectorize(self, *, route: str, payload: dict[str, Any]) -> list[float]:
         if self.embedding_provider != "azure_ai_vision":
             raise ValueError(
                 f"Unsupported AZURE_EMBEDDING_PROVIDER '{self.embedding_provider}'. "
@@ -286,20 +357,27 @@ class DocumentLayoutNoSkillService:
             f"{self.ai_vision_endpoint}/computervision/{route}"
             f"?api-version={VISION_API_VERSION}&model-version={quote(self.ai_vision_model_version)}"
         )
-        data = json.dumps(payload).encode("utf-8")
+        data = dumps_bytes(payload)
         req = Request(url, data=data, method="POST")
         req.add_header("Ocp-Apim-Subscription-Key", self.ai_vision_api_key)
         req.add_header("Content-Type", "application/json")
 
         try:
-            with urlopen(req, timeout=self.ai_vision_timeout_seconds) as resp:
-                body = json.loads(resp.read().decode("utf-8"))
+            with (
+                span("embedding"),
+                span("vision.request", route=route),
+                urlopen(req, timeout=self.ai_vision_timeout_seconds) as resp,
+            ):
+                body = loads(resp.read())
+            record_vision_call(route)
         except HTTPError as exc:
+            count_metric("remote_errors_total", backend="vision", status=exc.code)
             detail = exc.read().decode("utf-8", errors="replace")
             raise ValueError(
                 f"Azure AI Vision {route} failed: status={exc.code} detail={detail}"
             ) from exc
         except URLError as exc:
+            count_metric("remote_errors_total", backend="vision", status="network")
             raise ValueError(f"Azure AI Vision {route} failed: {exc}") from exc
         except TimeoutError as exc:
             raise ValueError(
@@ -312,6 +390,18 @@ class DocumentLayoutNoSkillService:
         return [float(value) for value in vector]
 
     def _vision_vectorize_image_stream(self, image_bytes: bytes, content_type: str) -> list[float]:
+        return self._through_vision_cache(
+            "retrieval:vectorizeImage",
+            self.ai_vision_model_version,
+            image_bytes,
+            lambda: through_cassette(
+                "vision",
+                ("retrieval:vectorizeImage", content_type, image_bytes),
+                lambda: self._send_vision_vectorize_image_stream(image_bytes, content_type),
+            ),
+        )
+
+    def _send_vision_vectorize_image_stream(self, image_bytes: bytes, content_type: str) -> list[float]:
         if self.embedding_provider != "azure_ai_vision":
             raise ValueError(
                 f"Unsupported AZURE_EMBEDDING_PROVIDER '{self.embedding_provider}'. "
@@ -328,15 +418,22 @@ class DocumentLayoutNoSkillService:
         req.add_header("Content-Type", content_type)
 
         try:
-            with urlopen(req, timeout=self.ai_vision_timeout_seconds) as resp:
-                body = json.loads(resp.read().decode("utf-8"))
+            with (
+                span("embedding"),
+                span("vision.request", route="retrieval:vectorizeImage"),
+                urlopen(req, timeout=self.ai_vision_timeout_seconds) as resp,
+            ):
+                body = loads(resp.read())
+            record_vision_call("retrieval:vectorizeImage")
         except HTTPError as exc:
+            count_metric("remote_errors_total", backend="vision", status=exc.code)
             detail = exc.read().decode("utf-8", errors="replace")
             raise ValueError(
                 f"Azure AI Vision retrieval:vectorizeImage(stream) failed: "
                 f"status={exc.code} detail={detail}"
             ) from exc
         except URLError as exc:
+            count_metric("remote_errors_total", backend="vision", status="network")
             raise ValueError(
                 f"Azure AI Vision retrieval:vectorizeImage(stream) failed: {exc}"
             ) from exc
@@ -352,15 +449,37 @@ class DocumentLayoutNoSkillService:
         return [float(value) for value in vector]
 
     def _vision_describe_image(self, image_bytes: bytes) -> dict[str, Any]:
-        url = f"{self.ai_vision_endpoint}/vision/v3.2/analyze?visualFeatures=Description,Tags,Objects"
+        return self._through_vision_cache(
+            "analyze",
+            f"{VISION_ANALYZE_API_VERSION}:{VISION_ANALYZE_FEATURES}",
+            image_bytes,
+            lambda: through_cassette(
+                "vision",
+                ("analyze", image_bytes),
+                lambda: self._send_vision_describe_image(image_bytes),
+            ),
+        )
+
+    def _send_vision_describe_image(self, image_bytes: bytes) -> dict[str, Any]:
+        url = (
+            f"{self.ai_vision_endpoint}/vision/{VISION_ANALYZE_API_VERSION}/analyze"
+            f"?visualFeatures={VISION_ANALYZE_FEATURES}"
+        )
         req = Request(url, data=image_bytes, method="POST")
         req.add_header("Ocp-Apim-Subscription-Key", self.ai_vision_api_key)
         req.add_header("Content-Type", "application/octet-stream")
 
         try:
-            with urlopen(req, timeout=self.ai_vision_timeout_seconds) as resp:
-                return json.loads(resp.read().decode("utf-8"))
+            with (
+                span("figure.interpret"),
+                span("vision.request", route="analyze"),
+                urlopen(req, timeout=self.ai_vision_timeout_seconds) as resp,
+            ):
+                analysis = loads(resp.read())
+            record_vision_call("analyze")
+            return analysis
         except HTTPError as exc:
+            count_metric("remote_errors_total", backend="vision", status=exc.code)
             detail = exc.read().decode("utf-8", errors="replace")
             self._log(
                 "Image Analysis captioning failed; continuing without model-generated image summary. "
@@ -368,6 +487,7 @@ class DocumentLayoutNoSkillService:
             )
             return {}
         except URLError as exc:
+            count_metric("remote_errors_total", backend="vision", status="network")
             self._log(
                 "Image Analysis captioning failed; continuing without model-generated image summary. "
                 f"detail={exc}"
@@ -399,8 +519,7 @@ class DocumentLayoutNoSkillService:
             self._search_delete_if_exists(f"/indexes/{quote(index_name)}")
 
         self._log(f"Creating or updating index '{index_name}'")
-        search_index_client = self.ai_search_service.get_search_index_client()
-        search_index_client.create_or_update_index(
+        self.ai_search_service.create_or_update_index(
             build_shared_index(name=index_name, embedding_dimensions=self.embedding_dimensions)
         )
 
@@ -416,7 +535,9 @@ class DocumentLayoutNoSkillService:
                     for record in batch
                 ]
             }
-            self._search_request("POST", f"/indexes/{quote(index_name)}/docs/index", body)
+            with span("search.upload"):
+                self._search_request("POST", f"/indexes/{quote(index_name)}/docs/index", body)
+            count_metric("records_uploaded_total", len(batch), index=index_name)
 
     def _save_artifact(self, *, container_name: str, blob_name: str, payload: Any) -> str:
         if self.storage_service:
@@ -468,8 +589,10 @@ class DocumentLayoutNoSkillService:
         path: Path,
         chunk_size: int,
         chunk_overlap: int,
+        deduplicator: ChunkDeduplicator | None = None,
     ) -> list[dict[str, Any]]:
-        payload = json.loads(path.read_text(encoding="utf-8"))
+        deduplicator = deduplicator or ChunkDeduplicator()
+        payload = loads(path.read_bytes())
         source_name = path.stem
         metadata = self._metadata_from_payload(payload, source_name)
         chunks = self._chunk_text(
@@ -480,9 +603,12 @@ class DocumentLayoutNoSkillService:
 
         records: list[dict[str, Any]] = []
         for ordinal, chunk in enumerate(chunks, start=1):
+            record_id = self._make_record_id(source_name, "text", ordinal)
+            if deduplicator.canonical_for(record_id, chunk) is not None:
+                continue
             records.append(
                 {
-                    "id": self._make_record_id(source_name, "text", ordinal),
+                    "id": record_id,
                     "metadata": metadata,
                     "content": chunk,
                     "contentVector": self._embed_text(chunk),
@@ -497,8 +623,19 @@ class DocumentLayoutNoSkillService:
         blob_name: str,
         data: bytes,
         content_type: str,
+        local_fallback: bool = False,
     ) -> str:
+        """Uploads binary data to blob storage.
+
+        Sources and figures must stay navigable for Azure AI Vision, so without blob storage
+        they fail. `local_fallback=True` is for artifacts that only travel with a derived JSON
+        artifact and are written under `local_documents/` alongside it instead.
+        """
         if not self.storage_service:
+            if local_fallback:
+                local_path = f"local_documents/{container_name}/{blob_name}"
+                self.local_output_store.save_stream([data], local_path)
+                return local_path
             raise ValueError(
                 "Blob storage is required for PDF/image processing in layout-no-skill so "
                 "source URLs remain navigable and Azure AI Vision can vectorize extracted images."
@@ -520,19 +657,15 @@ class DocumentLayoutNoSkillService:
             )
 
     def _extract_figure_bytes(self, *, result_id: str, figure_id: str) -> bytes:
-        stream = self.di_service.client.get_analyze_result_figure(
-            model_id="prebuilt-layout",
-            result_id=result_id,
-            figure_id=figure_id,
-        )
-        return b"".join(stream)
+        return self.di_service.get_figure_bytes(result_id=result_id, figure_id=figure_id)
 
     def _extract_figure_text(self, figure_bytes: bytes) -> str:
-        result = self.di_service.analyze_bytes(
-            data=figure_bytes,
-            model_id="prebuilt-read",
-            content_format=DocumentContentFormat.TEXT,
-        )
+        with span("figure.ocr"):
+            result = self.di_service.analyze_bytes(
+                data=figure_bytes,
+                model_id="prebuilt-read",
+                content_format=DocumentContentFormat.TEXT,
+            )
         content = self._searchable_text(getattr(result, "content", "") or "")
         return content
 
@@ -651,6 +784,100 @@ class DocumentLayoutNoSkillService:
                 return int(page_number)
         return None
 
+    def _figure_record(
+        self,
+        *,
+        figure: Any,
+        figure_id: str,
+        operation_id: str,
+        path: Path,
+        chunk_container: str,
+        page_text: dict[int, list[str]],
+        metadata: dict[str, Any],
+        call_pool: RemoteCallPool,
+    ) -> dict[str, Any] | None:
+        """Builds one figure record without its id; the three Vision/DI calls run side by side."""
+        source_name = path.stem
+        with span("figure", source=path.name) as figure_span:
+            figure_span["figure_id"] = figure_id
+            caption = getattr(getattr(figure, "caption", None), "content", None) or ""
+            page_number = self._page_number_from_regions(figure) or 0
+            page_context = " ".join(page_text.get(page_number, [])[:2])
+            figure_bytes = call_pool.submit(
+                "document_intelligence",
+                self._extract_figure_bytes,
+                result_id=operation_id,
+                figure_id=figure_id,
+            ).result()
+            ocr_future = call_pool.submit(
+                "document_intelligence", self._extract_figure_text, figure_bytes
+            )
+            analysis_future = call_pool.submit("vision", self._vision_describe_image, figure_bytes)
+            vector_future = call_pool.submit(
+                "vision", self._embed_image_bytes, figure_bytes, content_type="image/png"
+            )
+            bounding_regions = self._bounding_regions_record(getattr(figure, "bounding_regions", None))
+            figure_ocr_text = ocr_future.result()
+            analysis = analysis_future.result()
+            description_block = analysis.get("description") or {}
+            captions = description_block.get("captions") or []
+            model_description = ""
+            if captions:
+                first_caption = captions[0] or {}
+                model_description = self._searchable_text(str(first_caption.get("text") or ""))
+            model_tags = [
+                self._searchable_text(str(tag.get("name") or ""))
+                for tag in (analysis.get("tags") or [])
+                if self._searchable_text(str(tag.get("name") or ""))
+            ]
+            figure_summary = self._summarize_figure(
+                model_description=model_description,
+                model_tags=model_tags,
+                caption=caption,
+                page_context=page_context,
+                figure_ocr_text=figure_ocr_text,
+            )
+            summary_method = "vision_description+ocr+context"
+            figure_url = self._write_binary_artifact(
+                container_name=chunk_container,
+                blob_name=f"figures/{source_name}/{figure_id}.png",
+                data=figure_bytes,
+                content_type="image/png",
+            )
+            figure_text = self._image_markdown(
+                source_name=path.name,
+                page_number=page_number,
+                figure_id=figure_id,
+                figure_summary=figure_summary,
+                summary_method=summary_method,
+                caption=caption,
+                model_description=model_description,
+                model_tags=model_tags,
+                page_context=page_context,
+                figure_ocr_text=figure_ocr_text,
+            )
+            if not figure_text:
+                return None
+            return {
+                "metadata": self._metadata_record(
+                    source_type="image",
+                    category=metadata["category"],
+                    topic=metadata["topic"],
+                    subtopic=metadata["subtopic"],
+                    source_url=figure_url,
+                    source_url_text=f"{path.name} figure {figure_id}",
+                    source_name=path.name,
+                    page_number=page_number,
+                    figure_id=figure_id,
+                    summary_method=summary_method,
+                    bounding_regions=bounding_regions,
+                    ocr_text=figure_ocr_text,
+                    caption=caption,
+                ),
+                "content": figure_text,
+                "contentVector": vector_future.result(),
+            }
+
     def _pdf_records(
         self,
         *,
@@ -658,7 +885,9 @@ class DocumentLayoutNoSkillService:
         chunk_container: str,
         chunk_size: int,
         chunk_overlap: int,
+        deduplicator: ChunkDeduplicator | None = None,
     ) -> list[dict[str, Any]]:
+        deduplicator = deduplicator or ChunkDeduplicator()
         result, operation_id = self.di_service.analyze_file_with_figures(
             path=path,
             model_id="prebuilt-layout",
@@ -694,9 +923,13 @@ class DocumentLayoutNoSkillService:
                 chunk_size=chunk_size,
                 chunk_overlap=chunk_overlap,
             ):
+                record_id = self._make_record_id(source_name, "text", ordinal)
+                ordinal += 1
+                if deduplicator.canonical_for(record_id, chunk) is not None:
+                    continue
                 records.append(
                     {
-                        "id": self._make_record_id(source_name, "text", ordinal),
+                        "id": record_id,
                         "metadata": {
                             **metadata,
                             "image": self._image_metadata_record(page_number=page_number),
@@ -705,82 +938,41 @@ class DocumentLayoutNoSkillService:
                         "contentVector": self._embed_text(chunk),
                     }
                 )
-                ordinal += 1
 
         figures = getattr(result, "figures", None) or []
-        for figure in figures:
-            if not operation_id:
-                raise ValueError("Document Intelligence analyze result did not return operation_id for figures.")
-            figure_id = getattr(figure, "id", None) or f"figure-{ordinal}"
-            caption = getattr(getattr(figure, "caption", None), "content", None) or ""
-            page_number = self._page_number_from_regions(figure) or 0
-            page_context = " ".join(page_text.get(page_number, [])[:2])
-            figure_bytes = self._extract_figure_bytes(result_id=operation_id, figure_id=figure_id)
-            figure_ocr_text = self._extract_figure_text(figure_bytes)
-            bounding_regions = self._bounding_regions_record(getattr(figure, "bounding_regions", None))
-            analysis = self._vision_describe_image(figure_bytes)
-            description_block = analysis.get("description") or {}
-            captions = description_block.get("captions") or []
-            model_description = ""
-            if captions:
-                first_caption = captions[0] or {}
-                model_description = self._searchable_text(str(first_caption.get("text") or ""))
-            model_tags = [
-                self._searchable_text(str(tag.get("name") or ""))
-                for tag in (analysis.get("tags") or [])
-                if self._searchable_text(str(tag.get("name") or ""))
+        if figures and not operation_id:
+            raise ValueError("Document Intelligence analyze result did not return operation_id for figures.")
+        # Figures run side by side; record ids are still assigned in document order below.
+        with (
+            RemoteCallPool(self.figure_workers) as figure_pool,
+            RemoteCallPool(
+                max(1, self.figure_workers) * FIGURE_PARALLEL_CALLS,
+                limits=REMOTE_CONCURRENCY_LIMITS,
+            ) as call_pool,
+        ):
+            pending = [
+                figure_pool.submit(
+                    "figure",
+                    self._figure_record,
+                    figure=figure,
+                    figure_id=getattr(figure, "id", None) or f"figure-{ordinal + position}",
+                    operation_id=operation_id,
+                    path=path,
+                    chunk_container=chunk_container,
+                    page_text=page_text,
+                    metadata=metadata,
+                    call_pool=call_pool,
+                )
+                for position, figure in enumerate(figures)
             ]
-            figure_summary = self._summarize_figure(
-                model_description=model_description,
-                model_tags=model_tags,
-                caption=caption,
-                page_context=page_context,
-                figure_ocr_text=figure_ocr_text,
-            )
-            summary_method = "vision_description+ocr+context"
-            figure_url = self._write_binary_artifact(
-                container_name=chunk_container,
-                blob_name=f"figures/{source_name}/{figure_id}.png",
-                data=figure_bytes,
-                content_type="image/png",
-            )
-            figure_text = self._image_markdown(
-                source_name=path.name,
-                page_number=page_number,
-                figure_id=figure_id,
-                figure_summary=figure_summary,
-                summary_method=summary_method,
-                caption=caption,
-                model_description=model_description,
-                model_tags=model_tags,
-                page_context=page_context,
-                figure_ocr_text=figure_ocr_text,
-            )
-            if not figure_text:
-                continue
-            records.append(
-                {
-                    "id": self._make_record_id(source_name, "image", ordinal),
-                    "metadata": self._metadata_record(
-                        source_type="image",
-                        category=metadata["category"],
-                        topic=metadata["topic"],
-                        subtopic=metadata["subtopic"],
-                        source_url=figure_url,
-                        source_url_text=f"{path.name} figure {figure_id}",
-                        source_name=path.name,
-                        page_number=page_number,
-                        figure_id=figure_id,
-                        summary_method=summary_method,
-                        bounding_regions=bounding_regions,
-                        ocr_text=figure_ocr_text,
-                        caption=caption,
-                    ),
-                    "content": figure_text,
-                    "contentVector": self._embed_image_bytes(figure_bytes, content_type="image/png"),
-                }
-            )
-            ordinal += 1
+            for future in pending:
+                figure_record = future.result()
+                if figure_record is None:
+                    continue
+                records.append(
+                    {"id": self._make_record_id(source_name, "image", ordinal), **figure_record}
+                )
+                ordinal += 1
 
         if not records:
             raise ValueError(f"No extractable content found in PDF: {path}")
@@ -793,18 +985,28 @@ class DocumentLayoutNoSkillService:
         chunk_container: str,
         chunk_size: int,
         chunk_overlap: int,
+        deduplicator: ChunkDeduplicator | None = None,
     ) -> list[dict[str, Any]]:
-        suffix = path.suffix.lower()
-        if suffix == ".json":
-            return self._json_records(path=path, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-        if suffix == ".pdf":
-            return self._pdf_records(
-                path=path,
-                chunk_container=chunk_container,
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-            )
-        raise ValueError(f"Unsupported demo file type: {path.suffix}")
+        with span("source", source=path.name), usage_source(path.name):
+            suffix = path.suffix.lower()
+            if deduplicator is not None:
+                deduplicator.start_source(path.name)
+            if suffix == ".json":
+                return self._json_records(
+                    path=path,
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap,
+                    deduplicator=deduplicator,
+                )
+            if suffix == ".pdf":
+                return self._pdf_records(
+                    path=path,
+                    chunk_container=chunk_container,
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap,
+                    deduplicator=deduplicator,
+                )
+            raise ValueError(f"Unsupported demo file type: {path.suffix}")
 
     def _write_source_artifact(
         self,
@@ -812,6 +1014,7 @@ class DocumentLayoutNoSkillService:
         container_name: str,
         source_path: Path,
         records: list[dict[str, Any]],
+        artifact_vectors: str = "inline",
     ) -> str:
         artifact = {
             "source": source_path.name,
@@ -819,6 +1022,20 @@ class DocumentLayoutNoSkillService:
             "records": records,
         }
         blob_name = f"{source_path.stem}.json"
+        if artifact_vectors == "sidecar":
+            slim_records, vectors = split_vectors(records)
+            vector_blob_name = sidecar_name(blob_name)
+            self._write_binary_artifact(
+                container_name=container_name,
+                blob_name=vector_blob_name,
+                data=encode_npy(vectors),
+                content_type=NPY_CONTENT_TYPE,
+                local_fallback=True,
+            )
+            artifact["records"] = slim_records
+            artifact["vectorSidecar"] = sidecar_descriptor(
+                name=vector_blob_name, vectors=vectors, dtype="float32"
+            )
         return self._save_artifact(container_name=container_name, blob_name=blob_name, payload=artifact)
 
     def run(
@@ -830,21 +1047,26 @@ class DocumentLayoutNoSkillService:
         chunk_size: int = DEFAULT_CHUNK_SIZE,
         chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
         hard_refresh: bool = False,
+        dedup: str = "off",
+        artifact_vectors: str = "inline",
     ) -> dict[str, Any]:
         path = Path(src)
         if not path.exists():
             raise FileNotFoundError(f"File not found: {path}")
 
+        deduplicator = ChunkDeduplicator(dedup)
         records = self._records_for_source(
             path=path,
             chunk_container=chunk_container,
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
+            deduplicator=deduplicator,
         )
         artifact_uri = self._write_source_artifact(
             container_name=chunk_container,
             source_path=path,
             records=records,
+            artifact_vectors=artifact_vectors,
         )
         index_name = self._target_index_name(name_prefix)
         self._ensure_target_index(index_name=index_name, hard_refresh=hard_refresh)
@@ -858,6 +1080,7 @@ class DocumentLayoutNoSkillService:
             "derived_artifact": artifact_uri,
             "target_index": index_name,
             "record_count": len(records),
+            "dedup": deduplicator.stats(),
             "embedding": {
                 "mode": self.embedding_provider,
                 "field": "contentVector",
@@ -875,6 +1098,8 @@ class DocumentLayoutNoSkillService:
         chunk_size: int = DEFAULT_CHUNK_SIZE,
         chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
         hard_refresh: bool = True,
+        dedup: str = "off",
+        artifact_vectors: str = "inline",
     ) -> dict[str, Any]:
         demo_path = Path(demo_dir)
         files = self._load_demo_files(demo_path)
@@ -882,6 +1107,7 @@ class DocumentLayoutNoSkillService:
         all_records: list[dict[str, Any]] = []
 
         self._log(f"Processing {len(files)} demo file(s) from '{demo_path}'")
+        deduplicator = ChunkDeduplicator(dedup)
         for path in files:
             self._log(f"Deriving records for '{path.name}'")
             records = self._records_for_source(
@@ -889,11 +1115,13 @@ class DocumentLayoutNoSkillService:
                 chunk_container=chunk_container,
                 chunk_size=chunk_size,
                 chunk_overlap=chunk_overlap,
+                deduplicator=deduplicator,
             )
             artifact_uri = self._write_source_artifact(
                 container_name=chunk_container,
                 source_path=path,
                 records=records,
+                artifact_vectors=artifact_vectors,
             )
             derived_artifacts.append(
                 {
@@ -907,7 +1135,10 @@ class DocumentLayoutNoSkillService:
         index_name = self._target_index_name(name_prefix)
         self._ensure_target_index(index_name=index_name, hard_refresh=hard_refresh)
         self._upload_records(index_name=index_name, records=all_records)
-        self._log(f"Demo finished with {len(all_records)} indexed record(s)")
+        self._log(
+            f"Demo finished with {len(all_records)} indexed record(s) "
+            f"(skipped_duplicate_chunks={deduplicator.stats()['skipped_chunks']})"
+        )
 
         return {
             "pipeline": "document-layout-no-skill",
@@ -918,6 +1149,7 @@ class DocumentLayoutNoSkillService:
             "source_count": len(files),
             "record_count": len(all_records),
             "derived_artifacts": derived_artifacts,
+            "dedup": deduplicator.stats(),
             "embedding": {
                 "mode": self.embedding_provider,
                 "field": "contentVector",
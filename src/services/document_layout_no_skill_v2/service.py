@@ -1,6 +1,10 @@
-import json
+import hashlib
 import re
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Future
+from dataclasses import asdict
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 from urllib.error import HTTPError, URLError
@@ -9,20 +13,42 @@ from urllib.request import Request, urlopen
 
 from azure.ai.documentintelligence.models import DocumentContentFormat
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - scalar geometry fallback
+    np = None
+
 from src.conf.conf import get_config
 from src.services.ai_search.service import AISearchService
 from src.services.document_intelligence.service import DocumentIntelligenceService
-from src.services.openai import OpenAIService, OpenAIServiceError
+from src.services.openai import OpenAIBatchPending, OpenAIService, OpenAIServiceError
+from src.serialization import dumps, dumps_bytes, loads
 from src.services.shared import (
+    ChunkDeduplicator,
+    CpuStagePool,
     DEFAULT_CHUNK_CONTAINER,
     DEFAULT_TARGET_INDEX_NAME,
+    ImagePreprocessOptions,
     build_shared_index,
     chunk_markdown_deterministic,
     chunk_text_deterministic,
+    encode_search_body,
+    preprocess_image,
+    preprocessing_available,
     strip_figure_blocks_from_markdown,
 )
 from src.services.storage_account import AzureStorageAccountService
-from src.storage import LocalOutputStore
+from src.storage import (
+    NPY_CONTENT_TYPE,
+    LocalJsonCache,
+    LocalOutputStore,
+    encode_npy,
+    sidecar_descriptor,
+    sidecar_name,
+    split_vectors,
+    through_cassette,
+)
+from src.telemetry import count_metric, span, usage_source
 
 SEARCH_API_VERSION = "2024-07-01"
 DEFAULT_DEMO_DIR = Path("documents/demo_files")
@@ -43,6 +69,26 @@ MAX_SURROUNDING_PARAGRAPHS = 2
 MAX_KEY_RELATIONSHIPS = 3
 MAX_UNCERTAINTIES = 2
 MAX_SUPPORTING_EVIDENCE_PER_FIELD = 3
+SPATIAL_INDEX_TOLERANCE = 1e-9
+# Bump when the cached entry layout changes; prompt and schema edits invalidate entries on their own.
+MODEL_CACHE_VERSION = "1"
+# Rough Azure OpenAI tokenizer ratio for English prose; only used to size prompt evidence.
+CHARS_PER_TOKEN_ESTIMATE = 4
+FIGURE_EVIDENCE_TOKEN_BUDGET = 1200
+# Highest authority first; lower-priority text is trimmed first when over budget.
+FIGURE_EVIDENCE_TEXT_FIELDS = (
+    "caption",
+    "ocr_text",
+    "relevant_associated_text",
+    "surrounding_text",
+    "document_summary",
+)
+DOCUMENT_SUMMARY_ARTIFACT_PREFIX = "document-summary-v2"
+FIGURE_REFERENCE_ID_PATTERNS = (
+    re.compile(r"\bfigure\s+([0-9]+(?:[.-][0-9]+)*)\b", re.IGNORECASE),
+    re.compile(r"\bfig\.?\s*([0-9]+(?:[.-][0-9]+)*)\b", re.IGNORECASE),
+    re.compile(r"\(([0-9]+(?:\.[0-9]+)+)\)", re.IGNORECASE),
+)
 FIGURE_INTERPRETATION_SCHEMA: dict[str, Any] = {
     "name": "figure_interpretation",
     "strict": True,
@@ -105,6 +151,51 @@ FIGURE_INTERPRETATION_SCHEMA: dict[str, Any] = {
         ],
     },
 }
+FIGURE_FUSED_SCHEMA: dict[str, Any] = {
+    **FIGURE_INTERPRETATION_SCHEMA,
+    "name": "figure_interpretation_markdown",
+    "schema": {
+        **FIGURE_INTERPRETATION_SCHEMA["schema"],
+        "properties": {
+            **FIGURE_INTERPRETATION_SCHEMA["schema"]["properties"],
+            "markdown": {"type": "string"},
+        },
+        "required": [*FIGURE_INTERPRETATION_SCHEMA["schema"]["required"], "markdown"],
+    },
+}
+FIGURE_EVIDENCE_LABELS: tuple[tuple[str, str], ...] = (
+    ("image_evidence", "Image"),
+    ("ocr_evidence", "OCR"),
+    ("relevant_text_evidence", "Associated text"),
+    ("surrounding_text_evidence", "Surrounding text"),
+    ("document_summary_evidence", "Document summary"),
+)
+FIGURE_INTERPRETATION_SYSTEM_PROMPT = (
+    "You are a grounded figure interpretation model. Interpret the image visually first, "
+    "then ground your interpretation using OCR, caption, relevant associated text, surrounding text, "
+    "and document summary in that order of authority. Never let weaker context override stronger evidence. "
+    "If evidence is ambiguous, say so. "
+    "Do not make causal claims unless causation is explicitly stated in the provided evidence. "
+    "For comparisons, use cautious language such as 'appears higher', 'appears lower', or 'among the lowest' "
+    "unless the ranking is visually unambiguous. "
+    "Prefer temporal descriptions such as earlier peak, later peak, or concurrent movement over causal explanations."
+)
+FIGURE_VERBALIZATION_SYSTEM_PROMPT = (
+    "You convert grounded figure interpretations into concise semantic markdown for retrieval. "
+    "Do not invent facts. Keep metadata out of the prose unless it materially helps retrieval. "
+    "Be consistent and restrained. Avoid unsupported causal or strongest/weakest claims."
+)
+FIGURE_MARKDOWN_RULES = (
+    "Write markdown with exactly these sections in this order: Figure Summary, Interpretation, Evidence, Context.\n"
+    "Formatting rules:\n"
+    "- Figure Summary: exactly 1 short paragraph, at most 2 sentences.\n"
+    "- Interpretation: 2 to 4 bullet points.\n"
+    "- Evidence: 3 to 4 bullet points.\n"
+    "- Context: exactly 1 short paragraph, at most 2 sentences.\n"
+    "- Do not add any other sections.\n"
+    "- Prefer cautious comparison wording unless the grounded interpretation is explicit.\n"
+    "- Do not use causal language unless the grounded interpretation or evidence explicitly states it.\n"
+)
 
 
 class SearchApiError(ValueError):
@@ -138,10 +229,75 @@ class OpenAIApiError(ValueError):
         return cls(path=exc.path, status_code=exc.status_code, detail=exc.detail)
 
 
+class ParagraphSpatialIndex:
+    """Per-page paragraph bbox edges sorted once, so figure-local candidates are found by bisection."""
+
+    def __init__(self, page_paragraphs: dict[int, list[dict[str, Any]]]) -> None:
+        self._page_paragraphs = page_paragraphs
+        self._pages: dict[int, dict[str, tuple[list[float], list[int]]]] = {}
+
+    def _page(self, page_number: int) -> dict[str, tuple[list[float], list[int]]]:
+        page = self._pages.get(page_number)
+        if page is None:
+            paragraphs = self._page_paragraphs.get(page_number, [])
+            page = {}
+            for edge in ("center_y", "top", "bottom"):
+                order = sorted(
+                    range(len(paragraphs)),
+                    key=lambda position: paragraphs[position]["bbox"][edge],
+                )
+                page[edge] = (
+                    [paragraphs[position]["bbox"][edge] for position in order],
+                    order,
+                )
+            self._pages[page_number] = page
+        return page
+
+    @staticmethod
+    def _positions_between(
+        edge: tuple[list[float], list[int]], low: float, high: float
+    ) -> list[int]:
+        keys, order = edge
+        start = bisect_left(keys, low - SPATIAL_INDEX_TOLERANCE)
+        end = bisect_right(keys, high + SPATIAL_INDEX_TOLERANCE)
+        return order[start:end]
+
+    def nearby(
+        self, page_number: int, figure_bbox: dict[str, float]
+    ) -> list[dict[str, Any]]:
+        """Superset of spatial candidates in page order: near the figure centre or in a caption band."""
+        paragraphs = self._page_paragraphs.get(page_number, [])
+        if not paragraphs:
+            return []
+        page = self._page(page_number)
+        positions = set(
+            self._positions_between(
+                page["center_y"],
+                figure_bbox["center_y"] - VERTICAL_PROXIMITY_THRESHOLD,
+                figure_bbox["center_y"] + VERTICAL_PROXIMITY_THRESHOLD,
+            )
+        )
+        positions.update(
+            self._positions_between(
+                page["top"],
+                figure_bbox["bottom"],
+                figure_bbox["bottom"] + CAPTION_BAND_THRESHOLD,
+            )
+        )
+        positions.update(
+            self._positions_between(
+                page["bottom"],
+                figure_bbox["top"] - CAPTION_BAND_THRESHOLD,
+                figure_bbox["top"],
+            )
+        )
+        return [paragraphs[position] for position in sorted(positions)]
+
+
 class DocumentLayoutNoSkillV2Service:
     """Sibling no-skill path that uses Azure OpenAI grounded figure verbalization."""
 
-    def __init__(self) -> None:
+    def __init__(self, *, figure_verbalization: str = "llm") -> None:
         config = get_config()
         search_endpoint = config.get("ai_search_endpoint")
         search_api_key = config.get("ai_search_api_key")
@@ -173,14 +329,18 @@ class DocumentLayoutNoSkillV2Service:
             )
         if not openai_interpret_deployment:
             raise ValueError("Missing AZURE_OPENAI_INTERPRET_DEPLOYMENT.")
-        if not openai_verbalization_deployment:
+        # Template verbalization renders markdown locally and never calls this deployment.
+        if not openai_verbalization_deployment and figure_verbalization != "template":
             raise ValueError("Missing AZURE_OPENAI_VERBALIZATION_DEPLOYMENT.")
         if not openai_embedding_deployment:
             raise ValueError("Missing AZURE_OPENAI_EMBEDDING_DEPLOYMENT.")
 
         self.search_endpoint = search_endpoint.rstrip("/")
         self.search_api_key = search_api_key
-        self.chat_deployment = openai_chat_deployment or openai_verbalization_deployment
+        self.search_gzip_min_bytes = config.get("ai_search_gzip_min_bytes")
+        self.chat_deployment = (
+            openai_chat_deployment or openai_verbalization_deployment or openai_interpret_deployment
+        )
         self.interpret_deployment = openai_interpret_deployment
         self.verbalization_deployment = openai_verbalization_deployment
         self.embedding_deployment = openai_embedding_deployment
@@ -335,18 +495,69 @@ class DocumentLayoutNoSkillV2Service:
         chunk_overlap: int,
     ) -> list[str]:
         normalized_format = cls._normalize_content_format(content_format)
-        if normalized_format == "markdown":
-            return chunk_markdown_deterministic(
+        with span("chunking", content_format=normalized_format):
+            if normalized_format == "markdown":
+                return chunk_markdown_deterministic(
+                    text,
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap,
+                )
+            return chunk_text_deterministic(
                 text,
                 chunk_size=chunk_size,
                 chunk_overlap=chunk_overlap,
             )
-        return chunk_text_deterministic(
+
+    @classmethod
+    def _submit_chunk_job(
+        cls,
+        cpu_pool: CpuStagePool,
+        text: str,
+        *,
+        content_format: str,
+        chunk_size: int,
+        chunk_overlap: int,
+    ) -> Future:
+        normalized_format = cls._normalize_content_format(content_format)
+        chunker = (
+            chunk_markdown_deterministic
+            if normalized_format == "markdown"
+            else chunk_text_deterministic
+        )
+        return cpu_pool.submit(
+            chunker,
             text,
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
         )
 
+    def _submit_json_chunk_jobs(
+        self,
+        *,
+        cpu_pool: CpuStagePool,
+        files: list[Path],
+        content_format: str,
+        chunk_size: int,
+        chunk_overlap: int,
+    ) -> dict[Path, Future]:
+        jobs: dict[Path, Future] = {}
+        for path in files:
+            if path.suffix.lower() != ".json":
+                continue
+            payload = loads(path.read_bytes())
+            jobs[path] = self._submit_chunk_job(
+                cpu_pool,
+                str(payload.get("content") or ""),
+                content_format=content_format,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+            )
+        self._log(
+            f"Submitted {len(jobs)} JSON chunking job(s) to the CPU stage pool "
+            f"(workers={cpu_pool.max_workers})"
+        )
+        return jobs
+
     @staticmethod
     def _make_record_id(source_name: str, record_kind: str, ordinal: int) -> str:
         safe_source = re.sub(r"[^a-z0-9]+", "-", source_name.lower()).strip("-")
@@ -433,6 +644,129 @@ class DocumentLayoutNoSkillV2Service:
             "center_y": (top + bottom) / 2,
         }
 
+    @classmethod
+    def _bboxes_from_bounding_regions_batch(
+        cls,
+        *,
+        bounding_regions_list: list[list[dict[str, Any]]],
+        page_dimensions: dict[int, dict[str, float]],
+    ) -> list[dict[str, float] | None]:
+        """Vectorized `_bbox_from_bounding_regions` over every item of a document at once."""
+        if np is None or not page_dimensions:
+            return [
+                cls._bbox_from_bounding_regions(
+                    bounding_regions=bounding_regions,
+                    page_dimensions=page_dimensions,
+                )
+                for bounding_regions in bounding_regions_list
+            ]
+
+        bboxes: list[dict[str, float] | None] = [None] * len(bounding_regions_list)
+        coordinates: list[Any] = []
+        point_counts: list[int] = []
+        region_pages: list[int] = []
+        region_owners: list[int] = []
+        for owner, bounding_regions in enumerate(bounding_regions_list):
+            item_regions: list[tuple[int, list[Any]]] = []
+            for region in bounding_regions:
+                page_number = region.get("page_number")
+                polygon = region.get("polygon") or []
+                if (
+                    not isinstance(page_number, int)
+                    or not isinstance(polygon, list)
+                    or len(polygon) < 4
+                    or not page_dimensions.get(page_number)
+                ):
+                    continue
+                item_regions.append((page_number, polygon[: len(polygon) // 2 * 2]))
+            # The scalar path skips non-numeric coordinates point by point; items carrying
+            # any go through it so the batch never has to reproduce that filtering.
+            if any(
+                not isinstance(value, (int, float))
+                for _, polygon in item_regions
+                for value in polygon
+            ):
+                bboxes[owner] = cls._bbox_from_bounding_regions(
+                    bounding_regions=bounding_regions,
+                    page_dimensions=page_dimensions,
+                )
+                continue
+            for page_number, polygon in item_regions:
+                coordinates.extend(polygon)
+                point_counts.append(len(polygon) // 2)
+                region_pages.append(page_number)
+                region_owners.append(owner)
+
+        if not coordinates:
+            return bboxes
+        points = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+
+        page_scales = np.ones((max(page_dimensions) + 1, 2), dtype=np.float64)
+        for page_number, dims in page_dimensions.items():
+            if dims:
+                page_scales[page_number] = (dims["width"], dims["height"])
+        counts = np.asarray(point_counts)
+        pages = np.asarray(region_pages)
+        owners = np.asarray(region_owners)
+        normalized = points / np.repeat(page_scales[pages], counts, axis=0)
+        point_owners = np.repeat(owners, counts)
+        starts = np.flatnonzero(np.r_[True, point_owners[1:] != point_owners[:-1]])
+        lows = np.minimum.reduceat(normalized, starts, axis=0)
+        highs = np.maximum.reduceat(normalized, starts, axis=0)
+        # The last valid region of each item decides its page, as in the scalar path.
+        last_regions = np.r_[np.flatnonzero(owners[1:] != owners[:-1]), len(owners) - 1]
+        for owner, page_number, (left, top), (right, bottom) in zip(
+            owners[last_regions].tolist(),
+            pages[last_regions].tolist(),
+            lows.tolist(),
+            highs.tolist(),
+        ):
+            bboxes[owner] = {
+                "page_number": float(page_number),
+                "left": left,
+                "right": right,
+                "top": top,
+                "bottom": bottom,
+                "center_x": (left + right) / 2,
+                "center_y": (top + bottom) / 2,
+            }
+        return bboxes
+
+    @classmethod
+    def _build_paragraph_records(
+        cls,
+        *,
+        paragraphs: list[Any],
+        page_dimensions: dict[int, dict[str, float]],
+    ) -> list[dict[str, Any] | None]:
+        texts = [
+            cls._searchable_text(getattr(paragraph, "content", "") or "")
+            for paragraph in paragraphs
+        ]
+        bounding_regions_list = [
+            cls._bounding_regions_record(getattr(paragraph, "bounding_regions", None))
+            if text
+            else []
+            for paragraph, text in zip(paragraphs, texts)
+        ]
+        bboxes = cls._bboxes_from_bounding_regions_batch(
+            bounding_regions_list=bounding_regions_list,
+            page_dimensions=page_dimensions,
+        )
+        return [
+            cls._paragraph_record(
+                text=text,
+                index=index,
+                bounding_regions=bounding_regions,
+                bbox=bbox,
+            )
+            if text and bbox
+            else None
+            for index, (text, bounding_regions, bbox) in enumerate(
+                zip(texts, bounding_regions_list, bboxes)
+            )
+        ]
+
     @classmethod
     def _build_paragraph_record(
         cls,
@@ -453,6 +787,21 @@ class DocumentLayoutNoSkillV2Service:
         )
         if not bbox:
             return None
+        return cls._paragraph_record(
+            text=text,
+            index=index,
+            bounding_regions=bounding_regions,
+            bbox=bbox,
+        )
+
+    @staticmethod
+    def _paragraph_record(
+        *,
+        text: str,
+        index: int,
+        bounding_regions: list[dict[str, Any]],
+        bbox: dict[str, float],
+    ) -> dict[str, Any]:
         page_number = int(bbox["page_number"])
         return {
             "text": text,
@@ -472,30 +821,33 @@ class DocumentLayoutNoSkillV2Service:
     def _normalize_figure_id(figure_id: str) -> str:
         return re.sub(r"[^0-9]+", ".", (figure_id or "").lower()).strip(".")
 
-    @classmethod
-    def _figure_reference_patterns(cls, figure_id: str) -> list[re.Pattern[str]]:
-        normalized = cls._normalize_figure_id(figure_id)
-        if not normalized:
-            return []
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _compiled_figure_reference_patterns(
+        normalized: str,
+    ) -> tuple[re.Pattern[str], ...]:
         dashed = normalized.replace(".", "-")
         escaped_normalized = re.escape(normalized)
         escaped_dashed = re.escape(dashed)
-        return [
+        return (
             re.compile(rf"\bfigure\s+{escaped_normalized}\b", re.IGNORECASE),
             re.compile(rf"\bfig\.?\s*{escaped_normalized}\b", re.IGNORECASE),
             re.compile(rf"\bfigure\s+{escaped_dashed}\b", re.IGNORECASE),
             re.compile(rf"\bfig\.?\s*{escaped_dashed}\b", re.IGNORECASE),
             re.compile(rf"\({escaped_normalized}\)", re.IGNORECASE),
-        ]
+        )
+
+    @classmethod
+    def _figure_reference_patterns(cls, figure_id: str) -> list[re.Pattern[str]]:
+        normalized = cls._normalize_figure_id(figure_id)
+        if not normalized:
+            return []
+        return list(cls._compiled_figure_reference_patterns(normalized))
 
     @classmethod
     def _extract_figure_reference_ids(cls, text: str) -> set[str]:
         references: set[str] = set()
-        for pattern in [
-            re.compile(r"\bfigure\s+([0-9]+(?:[.-][0-9]+)*)\b", re.IGNORECASE),
-            re.compile(r"\bfig\.?\s*([0-9]+(?:[.-][0-9]+)*)\b", re.IGNORECASE),
-            re.compile(r"\(([0-9]+(?:\.[0-9]+)+)\)", re.IGNORECASE),
-        ]:
+        for pattern in FIGURE_REFERENCE_ID_PATTERNS:
             for match in pattern.finditer(text):
                 references.add(cls._normalize_figure_id(match.group(1)))
         return references
@@ -583,18 +935,28 @@ class DocumentLayoutNoSkillV2Service:
 
     def _search_request(
         self, method: str, path: str, body: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        return through_cassette(
+            "search", (method, path, body), lambda: self._send_search_request(method, path, body)
+        )
+
+    def _send_search_request(
+        self, method: str, path: str, body: dict[str, Any] | None = None
     ) -> dict[str, Any]:
         url = f"{self.search_endpoint}{path}?api-version={SEARCH_API_VERSION}"
-        data = json.dumps(body).encode("utf-8") if body is not None else None
-        req = Request(url, data=data, method=method)
+        data, headers = encode_search_body(
+            body, gzip_min_bytes=self.search_gzip_min_bytes
+        )
+        req = Request(url, data=data, method=method, headers=headers)
         req.add_header("api-key", self.search_api_key)
-        req.add_header("Content-Type", "application/json")
 
         try:
-            with urlopen(req, timeout=120) as resp:
-                raw = resp.read()
-                return json.loads(raw.decode("utf-8")) if raw else {}
+            with span("search.request", method=method, path=path):
+                with urlopen(req, timeout=120) as resp:
+                    raw = resp.read()
+                    return loads(raw) if raw else {}
         except HTTPError as exc:
+            count_metric("remote_errors_total", backend="search", status=exc.code)
             detail = exc.read().decode("utf-8", errors="replace")
             raise SearchApiError(
                 method=method,
@@ -603,6 +965,7 @@ class DocumentLayoutNoSkillV2Service:
                 detail=detail,
             ) from exc
         except URLError as exc:
+            count_metric("remote_errors_total", backend="search", status="network")
             raise SearchApiError(
                 method=method,
                 path=path,
@@ -611,6 +974,11 @@ class DocumentLayoutNoSkillV2Service:
             ) from exc
 
     def _search_delete_if_exists(self, path: str) -> None:
+        through_cassette(
+            "search", ("DELETE", path), lambda: self._send_search_delete_if_exists(path)
+        )
+
+    def _send_search_delete_if_exists(self, path: str) -> None:
         url = f"{self.search_endpoint}{path}?api-version={SEARCH_API_VERSION}"
         req = Request(url, method="DELETE")
         req.add_header("api-key", self.search_api_key)
@@ -646,8 +1014,7 @@ class DocumentLayoutNoSkillV2Service:
             self._search_delete_if_exists(f"/indexes/{quote(index_name)}")
 
         self._log(f"Creating or updating index '{index_name}'")
-        search_index_client = self.ai_search_service.get_search_index_client()
-        search_index_client.create_or_update_index(
+        self.ai_search_service.create_or_update_index(
             build_shared_index(
                 name=index_name, embedding_dimensions=self.embedding_dimensions
             )
@@ -667,9 +1034,11 @@ class DocumentLayoutNoSkillV2Service:
                     {"@search.action": "mergeOrUpload", **record} for record in batch
                 ]
             }
-            self._search_request(
-                "POST", f"/indexes/{quote(index_name)}/docs/index", body
-            )
+            with span("search.upload"):
+                self._search_request(
+                    "POST", f"/indexes/{quote(index_name)}/docs/index", body
+                )
+            count_metric("records_uploaded_total", len(batch), index=index_name)
 
     def _save_artifact(
         self, *, container_name: str, blob_name: str, payload: Any
@@ -721,6 +1090,25 @@ class DocumentLayoutNoSkillV2Service:
         local_path.write_bytes(data)
         return str(local_path)
 
+    def _load_artifact(self, *, container_name: str, blob_name: str) -> Any | None:
+        if self.storage_service:
+            if not self.storage_service.blob_exists(
+                container_name=container_name, blob_name=blob_name
+            ):
+                return None
+            data = self.storage_service.download_bytes(
+                container_name=container_name, blob_name=blob_name
+            )
+        else:
+            local_path = Path("local_documents") / container_name / blob_name
+            if not local_path.exists():
+                return None
+            data = local_path.read_bytes()
+        try:
+            return loads(data)
+        except ValueError:
+            return None
+
     def _load_demo_files(self, demo_dir: Path) -> list[Path]:
         if not demo_dir.exists():
             raise FileNotFoundError(f"Demo folder not found: {demo_dir}")
@@ -863,10 +1251,11 @@ class DocumentLayoutNoSkillV2Service:
             f"(deployment='{self.embedding_deployment}', chars={len(normalized)})"
         )
         try:
-            return self.openai_service.embeddings(
-                deployment=self.embedding_deployment,
-                text=normalized,
-            )
+            with span("embedding"):
+                return self.openai_service.embeddings(
+                    deployment=self.embedding_deployment,
+                    text=normalized,
+                )
         except OpenAIServiceError as exc:
             raise OpenAIApiError.from_service_error(exc) from exc
 
@@ -925,6 +1314,7 @@ class DocumentLayoutNoSkillV2Service:
         figure_bbox: dict[str, float] | None,
         page_number: int,
         page_paragraphs: dict[int, list[dict[str, Any]]],
+        paragraph_index: "ParagraphSpatialIndex | None" = None,
     ) -> tuple[str, str]:
         same_page = page_paragraphs.get(page_number, [])
         candidate_count = len(same_page)
@@ -936,9 +1326,10 @@ class DocumentLayoutNoSkillV2Service:
             return "", ""
 
         caption_terms = self._caption_keywords(caption)
+        paragraph_index = paragraph_index or ParagraphSpatialIndex(page_paragraphs)
         filtered = [
             paragraph
-            for paragraph in same_page
+            for paragraph in paragraph_index.nearby(page_number, figure_bbox)
             if self._is_spatial_candidate(
                 figure_bbox=figure_bbox,
                 paragraph_bbox=paragraph["bbox"],
@@ -997,7 +1388,11 @@ class DocumentLayoutNoSkillV2Service:
         return self._searchable_text(relevant), self._searchable_text(surrounding)
 
     def _generate_document_summary(
-        self, *, source_name: str, document_text: str
+        self,
+        *,
+        source_name: str,
+        document_text: str,
+        artifact_container: str | None = None,
     ) -> str:
         normalized = self._searchable_text(document_text)
         if not normalized:
@@ -1028,18 +1423,53 @@ class DocumentLayoutNoSkillV2Service:
             "Do not speculate beyond the provided text.\n\n"
             f"DOCUMENT TEXT:\n{sample}"
         )
+        cache_key = self._model_cache_key(
+            stage="summary",
+            deployment=deployment,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+        )
+        blob_name = f"{DOCUMENT_SUMMARY_ARTIFACT_PREFIX}/{Path(source_name).stem}.json"
+        if artifact_container:
+            cached = self._load_artifact(container_name=artifact_container, blob_name=blob_name)
+            if (
+                isinstance(cached, dict)
+                and cached.get("cache_key") == cache_key
+                and isinstance(cached.get("summary"), str)
+            ):
+                self._log(
+                    f"Reusing cached document summary for '{source_name}' "
+                    f"(summary_chars={len(cached['summary'])})"
+                )
+                return cached["summary"]
+
         try:
-            summary = self._searchable_text(
-                self._responses_text(
-                    deployment=deployment,
-                    system_prompt=system_prompt,
-                    user_prompt=user_prompt,
+            with span("document.summary"):
+                summary = self._searchable_text(
+                    self._responses_text(
+                        deployment=deployment,
+                        system_prompt=system_prompt,
+                        user_prompt=user_prompt,
+                    )
                 )
-            )
             self._log(
                 f"Generated document summary for '{source_name}' "
                 f"(summary_chars={len(summary)})"
             )
+            if artifact_container and summary:
+                summary_artifact = self._save_artifact(
+                    container_name=artifact_container,
+                    blob_name=blob_name,
+                    payload={
+                        "source": source_name,
+                        "deployment": deployment,
+                        "cache_key": cache_key,
+                        "summary": summary,
+                    },
+                )
+                self._log(
+                    f"Persisted document summary for '{source_name}' to '{summary_artifact}'"
+                )
             return summary
         except ValueError as exc:
             self._log(
@@ -1048,19 +1478,15 @@ class DocumentLayoutNoSkillV2Service:
             return ""
 
     def _extract_figure_bytes(self, *, result_id: str, figure_id: str) -> bytes:
-        stream = self.di_service.client.get_analyze_result_figure(
-            model_id="prebuilt-layout",
-            result_id=result_id,
-            figure_id=figure_id,
-        )
-        return b"".join(stream)
+        return self.di_service.get_figure_bytes(result_id=result_id, figure_id=figure_id)
 
     def _extract_figure_text(self, figure_bytes: bytes) -> str:
-        result = self.di_service.analyze_bytes(
-            data=figure_bytes,
-            model_id="prebuilt-read",
-            content_format=DocumentContentFormat.TEXT,
-        )
+        with span("figure.ocr"):
+            result = self.di_service.analyze_bytes(
+                data=figure_bytes,
+                model_id="prebuilt-read",
+                content_format=DocumentContentFormat.TEXT,
+            )
         return self._searchable_text(getattr(result, "content", "") or "")
 
     def _build_figure_analysis_payload(
@@ -1164,34 +1590,124 @@ class DocumentLayoutNoSkillV2Service:
             "confidence_notes": cls._optional_text(grounded.get("confidence_notes")),
         }
 
-    def _interpret_figure(
-        self, *, figure_bytes: bytes, analysis_payload: dict[str, Any]
-    ) -> dict[str, Any]:
+    def _prepare_model_image(
+        self,
+        *,
+        figure_bytes: bytes,
+        figure_id: str,
+        image_preprocess: ImagePreprocessOptions | None,
+    ) -> tuple[bytes, str]:
+        if image_preprocess is None or not image_preprocess.enabled:
+            return figure_bytes, "image/png"
+        if not preprocessing_available():
+            self._log(
+                f"Pillow is not installed; sending the original PNG for figure '{figure_id}'"
+            )
+            return figure_bytes, "image/png"
+        with span("figure.preprocess"):
+            model_image, model_image_type = preprocess_image(figure_bytes, image_preprocess)
         self._log(
-            f"Starting grounded interpretation for figure '{analysis_payload['figure_id']}' "
-            f"on page {analysis_payload['page_number']}"
+            f"Prepared model image for figure '{figure_id}' "
+            f"(original_bytes={len(figure_bytes)}, sent_bytes={len(model_image)}, "
+            f"content_type='{model_image_type}')"
         )
-        system_prompt = (
-            "You are a grounded figure interpretation model. Interpret the image visually first, "
-            "then ground your interpretation using OCR, caption, relevant associated text, surrounding text, "
-            "and document summary in that order of authority. Never let weaker context override stronger evidence. "
-            "If evidence is ambiguous, say so. "
-            "Do not make causal claims unless causation is explicitly stated in the provided evidence. "
-            "For comparisons, use cautious language such as 'appears higher', 'appears lower', or 'among the lowest' "
-            "unless the ranking is visually unambiguous. "
-            "Prefer temporal descriptions such as earlier peak, later peak, or concurrent movement over causal explanations."
+        return model_image, model_image_type
+
+    @staticmethod
+    def _model_image_variant(image_preprocess: ImagePreprocessOptions | None) -> str:
+        if image_preprocess is None or not image_preprocess.enabled or not preprocessing_available():
+            return ""
+        return dumps(asdict(image_preprocess), sort_keys=True)
+
+    @staticmethod
+    def _model_cache_key(
+        *,
+        stage: str,
+        deployment: str,
+        system_prompt: str,
+        user_prompt: str,
+        figure_bytes: bytes | None = None,
+        json_schema: dict[str, Any] | None = None,
+        image_variant: str = "",
+    ) -> str:
+        """Keys a model call by its exact request, so evidence, prompt or schema edits miss.
+
+        `figure_bytes` is the original figure; `image_variant` names the preprocessing applied
+        to it, so cache hits skip the decode and re-encode.
+        """
+        return LocalJsonCache.make_key(
+            MODEL_CACHE_VERSION,
+            stage,
+            deployment,
+            hashlib.sha256(figure_bytes).hexdigest() if figure_bytes is not None else "",
+            image_variant,
+            dumps_bytes(json_schema, sort_keys=True) if json_schema is not None else b"",
+            system_prompt,
+            user_prompt,
         )
-        user_prompt = (
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        return -(-len(text) // CHARS_PER_TOKEN_ESTIMATE)
+
+    @staticmethod
+    def _trim_to_tokens(text: str, max_tokens: int) -> str:
+        max_chars = max(max_tokens, 0) * CHARS_PER_TOKEN_ESTIMATE
+        if len(text) <= max_chars:
+            return text
+        if max_chars <= 1:
+            return ""
+        cut = text[: max_chars - 1]
+        boundary = cut.rfind(" ")
+        if boundary > max_chars // 2:
+            cut = cut[:boundary]
+        return cut.rstrip() + "…"
+
+    @classmethod
+    def _figure_prompt_evidence(
+        cls,
+        analysis_payload: dict[str, Any],
+        *,
+        token_budget: int = FIGURE_EVIDENCE_TOKEN_BUDGET,
+    ) -> dict[str, Any]:
+        """Semantic subset of the figure-analysis payload, trimmed to `token_budget`.
+
+        Bounding polygons, source and artifact URIs are dropped. Text fields are kept in
+        authority order until the budget runs out; the first that does not fit is cut at a
+        word boundary and any lower-priority text is emptied.
+        """
+        header = {
+            "source_name": analysis_payload.get("source_name"),
+            "figure_id": analysis_payload.get("figure_id"),
+            "page_number": analysis_payload.get("page_number"),
+            "visual_heuristics": analysis_payload.get("visual_heuristics") or {},
+        }
+        remaining = token_budget - cls._estimate_tokens(dumps(header))
+        texts: dict[str, str] = {}
+        for field in FIGURE_EVIDENCE_TEXT_FIELDS:
+            text = str(analysis_payload.get(field) or "")
+            texts[field] = cls._trim_to_tokens(text, remaining)
+            if texts[field] != text:
+                # The word-boundary cut leaves slack; spending it on a fragment of weaker text is noise.
+                remaining = 0
+            else:
+                remaining -= cls._estimate_tokens(text)
+        return {**header, **texts}
+
+    @classmethod
+    def _interpretation_user_prompt(cls, analysis_payload: dict[str, Any]) -> str:
+        evidence = cls._figure_prompt_evidence(analysis_payload)
+        return (
             "Interpret this figure using only the evidence in this request.\n\n"
-            f"SOURCE NAME:\n{analysis_payload['source_name']}\n\n"
-            f"FIGURE ID:\n{analysis_payload['figure_id']}\n\n"
-            f"PAGE NUMBER:\n{analysis_payload['page_number']}\n\n"
-            f"CAPTION:\n{analysis_payload['caption']}\n\n"
-            f"OCR TEXT:\n{analysis_payload['ocr_text']}\n\n"
-            f"RELEVANT ASSOCIATED TEXT:\n{analysis_payload['relevant_associated_text']}\n\n"
-            f"SURROUNDING TEXT:\n{analysis_payload['surrounding_text']}\n\n"
-            f"DOCUMENT SUMMARY:\n{analysis_payload['document_summary']}\n\n"
-            f"VISUAL HEURISTICS:\n{json.dumps(analysis_payload['visual_heuristics'], ensure_ascii=False)}\n\n"
+            f"SOURCE NAME:\n{evidence['source_name']}\n\n"
+            f"FIGURE ID:\n{evidence['figure_id']}\n\n"
+            f"PAGE NUMBER:\n{evidence['page_number']}\n\n"
+            f"CAPTION:\n{evidence['caption']}\n\n"
+            f"OCR TEXT:\n{evidence['ocr_text']}\n\n"
+            f"RELEVANT ASSOCIATED TEXT:\n{evidence['relevant_associated_text']}\n\n"
+            f"SURROUNDING TEXT:\n{evidence['surrounding_text']}\n\n"
+            f"DOCUMENT SUMMARY:\n{evidence['document_summary']}\n\n"
+            f"VISUAL HEURISTICS:\n{dumps(evidence['visual_heuristics'])}\n\n"
             "Priority order:\n"
             "1. Image + OCR/caption\n"
             "2. Relevant associated text\n"
@@ -1205,12 +1721,77 @@ class DocumentLayoutNoSkillV2Service:
             "- Keep 'uncertainties' to at most 2 short items.\n\n"
             "Return a structured interpretation that matches the required schema."
         )
-        grounded = self._responses_structured_with_image(
-            deployment=self.interpret_deployment,
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
+
+    def _structured_figure_call(
+        self,
+        *,
+        stage: str,
+        system_prompt: str,
+        user_prompt: str,
+        json_schema: dict[str, Any],
+        figure_bytes: bytes,
+        analysis_payload: dict[str, Any],
+        figure_cache: LocalJsonCache | None = None,
+        image_preprocess: ImagePreprocessOptions | None = None,
+    ) -> dict[str, Any]:
+        cache_key = None
+        cached = None
+        if figure_cache is not None:
+            cache_key = self._model_cache_key(
+                stage=stage,
+                deployment=self.interpret_deployment,
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                figure_bytes=figure_bytes,
+                json_schema=json_schema,
+                image_variant=self._model_image_variant(image_preprocess),
+            )
+            cached = figure_cache.get(cache_key)
+        if isinstance(cached, dict) and isinstance(cached.get("grounded"), dict):
+            self._log(
+                f"Reusing cached {stage} response for figure '{analysis_payload['figure_id']}'"
+            )
+            return cached["grounded"]
+
+        model_image, model_image_type = self._prepare_model_image(
+            figure_bytes=figure_bytes,
+            figure_id=str(analysis_payload["figure_id"]),
+            image_preprocess=image_preprocess,
+        )
+        with span(f"figure.{stage}"):
+            grounded = self._responses_structured_with_image(
+                deployment=self.interpret_deployment,
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                json_schema=json_schema,
+                image_bytes=model_image,
+                mime_type=model_image_type,
+            )
+        if figure_cache is not None and cache_key is not None:
+            figure_cache.set(cache_key, {"grounded": grounded})
+        return grounded
+
+    def _interpret_figure(
+        self,
+        *,
+        figure_bytes: bytes,
+        analysis_payload: dict[str, Any],
+        figure_cache: LocalJsonCache | None = None,
+        image_preprocess: ImagePreprocessOptions | None = None,
+    ) -> dict[str, Any]:
+        self._log(
+            f"Starting grounded interpretation for figure '{analysis_payload['figure_id']}' "
+            f"on page {analysis_payload['page_number']}"
+        )
+        grounded = self._structured_figure_call(
+            stage="interpret",
+            system_prompt=FIGURE_INTERPRETATION_SYSTEM_PROMPT,
+            user_prompt=self._interpretation_user_prompt(analysis_payload),
             json_schema=FIGURE_INTERPRETATION_SCHEMA,
-            image_bytes=figure_bytes,
+            figure_bytes=figure_bytes,
+            analysis_payload=analysis_payload,
+            figure_cache=figure_cache,
+            image_preprocess=image_preprocess,
         )
         grounded = self._validate_grounded_interpretation(grounded)
         self._log(
@@ -1219,6 +1800,62 @@ class DocumentLayoutNoSkillV2Service:
         )
         return grounded
 
+    @staticmethod
+    def _figure_summary_method(*, figure_calls: str, figure_verbalization: str) -> str:
+        if figure_calls == "fused":
+            return "aoai-fused-interpretation-markdown"
+        if figure_verbalization == "template":
+            return "aoai-grounded-interpretation+template-markdown"
+        return "aoai-grounded-interpretation+semantic-markdown"
+
+    def _interpret_and_verbalize_figure(
+        self,
+        *,
+        figure_bytes: bytes,
+        analysis_payload: dict[str, Any],
+        figure_cache: LocalJsonCache | None = None,
+        image_preprocess: ImagePreprocessOptions | None = None,
+    ) -> tuple[dict[str, Any], str]:
+        """Fused mode: one structured call returns the grounded fields plus the final markdown."""
+        self._log(
+            f"Starting fused interpretation and verbalization for figure '{analysis_payload['figure_id']}' "
+            f"on page {analysis_payload['page_number']}"
+        )
+        system_prompt = (
+            FIGURE_INTERPRETATION_SYSTEM_PROMPT
+            + " Then write the grounded interpretation as concise semantic markdown for retrieval "
+            "in the 'markdown' field, without adding facts beyond the interpretation."
+        )
+        user_prompt = (
+            self._interpretation_user_prompt(analysis_payload)
+            + "\n\nFor the 'markdown' field only:\n"
+            + FIGURE_MARKDOWN_RULES
+        )
+        response = self._structured_figure_call(
+            stage="fused",
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            json_schema=FIGURE_FUSED_SCHEMA,
+            figure_bytes=figure_bytes,
+            analysis_payload=analysis_payload,
+            figure_cache=figure_cache,
+            image_preprocess=image_preprocess,
+        )
+        grounded = self._validate_grounded_interpretation(response)
+        markdown = str(response.get("markdown") or "").strip()
+        if not markdown:
+            self._log(
+                f"Fused response for '{analysis_payload['figure_id']}' had no markdown; using deterministic fallback."
+            )
+            markdown = self._markdown_from_grounded(
+                grounded=grounded, analysis_payload=analysis_payload
+            )
+        self._log(
+            f"Completed fused interpretation for figure '{analysis_payload['figure_id']}' "
+            f"(type='{grounded.get('figure_type')}', markdown_chars={len(markdown)})"
+        )
+        return grounded, markdown
+
     @classmethod
     def _markdown_from_grounded(
         cls,
@@ -1226,24 +1863,21 @@ class DocumentLayoutNoSkillV2Service:
         grounded: dict[str, Any],
         analysis_payload: dict[str, Any],
     ) -> str:
-        relationships = grounded.get("key_relationships") or []
-        uncertainties = grounded.get("uncertainties") or []
+        """Render every grounded field as section markdown without a model call."""
+        relationships = cls._normalize_string_list(grounded.get("key_relationships"))
+        uncertainties = cls._normalize_string_list(grounded.get("uncertainties"))
         supporting_context = grounded.get("supporting_context") or {}
         evidence_lines: list[str] = []
-        for key in [
-            "image_evidence",
-            "ocr_evidence",
-            "relevant_text_evidence",
-            "surrounding_text_evidence",
-            "document_summary_evidence",
-        ]:
+        for key, label in FIGURE_EVIDENCE_LABELS:
             values = supporting_context.get(key) or []
-            for value in values[:3]:
+            for value in values[:MAX_SUPPORTING_EVIDENCE_PER_FIELD]:
                 normalized = cls._searchable_text(str(value))
                 if normalized:
-                    evidence_lines.append(f"- {normalized}")
+                    evidence_lines.append(f"- {label}: {normalized}")
 
         context_lines: list[str] = []
+        if analysis_payload.get("caption"):
+            context_lines.append(analysis_payload["caption"])
         if analysis_payload.get("relevant_associated_text"):
             context_lines.append(analysis_payload["relevant_associated_text"])
         if analysis_payload.get("document_summary"):
@@ -1255,19 +1889,20 @@ class DocumentLayoutNoSkillV2Service:
             cls._searchable_text(
                 str(grounded.get("what_it_shows") or "No summary available.")
             ),
-            "",
-            "## Interpretation",
-            cls._searchable_text(
-                " ".join(
-                    str(value)
-                    for value in relationships
-                    if cls._searchable_text(str(value))
-                )
-            )
-            or "Interpretation details were limited to the grounded evidence available.",
-            "",
-            "## Evidence",
         ]
+        figure_type = cls._searchable_text(str(grounded.get("figure_type") or ""))
+        if figure_type and figure_type != "figure":
+            lines.extend(["", f"Figure type: {figure_type}."])
+
+        lines.extend(["", "## Interpretation"])
+        if relationships:
+            lines.extend(f"- {value}" for value in relationships)
+        else:
+            lines.append(
+                "Interpretation details were limited to the grounded evidence available."
+            )
+
+        lines.extend(["", "## Evidence"])
         if evidence_lines:
             lines.extend(evidence_lines)
         else:
@@ -1283,11 +1918,11 @@ class DocumentLayoutNoSkillV2Service:
 
         if uncertainties:
             lines.extend(["", "## Uncertainties"])
-            lines.extend(
-                f"- {cls._searchable_text(str(value))}"
-                for value in uncertainties
-                if cls._searchable_text(str(value))
-            )
+            lines.extend(f"- {value}" for value in uncertainties)
+
+        confidence_notes = cls._searchable_text(str(grounded.get("confidence_notes") or ""))
+        if confidence_notes:
+            lines.extend(["", "## Confidence", confidence_notes])
 
         return "\n".join(lines).strip()
 
@@ -1296,37 +1931,50 @@ class DocumentLayoutNoSkillV2Service:
         *,
         grounded: dict[str, Any],
         analysis_payload: dict[str, Any],
+        figure_cache: LocalJsonCache | None = None,
     ) -> str:
         self._log(
             f"Starting figure verbalization for '{analysis_payload['figure_id']}' "
             f"using deployment '{self.verbalization_deployment}'"
         )
-        system_prompt = (
-            "You convert grounded figure interpretations into concise semantic markdown for retrieval. "
-            "Do not invent facts. Keep metadata out of the prose unless it materially helps retrieval. "
-            "Be consistent and restrained. Avoid unsupported causal or strongest/weakest claims."
-        )
+        system_prompt = FIGURE_VERBALIZATION_SYSTEM_PROMPT
         user_prompt = (
-            "Write markdown with exactly these sections in this order: Figure Summary, Interpretation, Evidence, Context.\n"
-            "Formatting rules:\n"
-            "- Figure Summary: exactly 1 short paragraph, at most 2 sentences.\n"
-            "- Interpretation: 2 to 4 bullet points.\n"
-            "- Evidence: 3 to 4 bullet points.\n"
-            "- Context: exactly 1 short paragraph, at most 2 sentences.\n"
-            "- Do not add any other sections.\n"
-            "- Prefer cautious comparison wording unless the grounded interpretation is explicit.\n"
-            "- Do not use causal language unless the grounded interpretation or evidence explicitly states it.\n"
-            "Base it strictly on the grounded interpretation and extracted evidence below.\n\n"
-            f"GROUNDED INTERPRETATION:\n{json.dumps(grounded, ensure_ascii=False, indent=2)}\n\n"
-            f"EXTRACTED EVIDENCE:\n{json.dumps(analysis_payload, ensure_ascii=False, indent=2)}"
+            FIGURE_MARKDOWN_RULES
+            + "Base it strictly on the grounded interpretation and extracted evidence below.\n\n"
+            f"GROUNDED INTERPRETATION:\n{dumps(grounded)}\n\n"
+            f"EXTRACTED EVIDENCE:\n{dumps(self._figure_prompt_evidence(analysis_payload))}"
         )
 
-        try:
-            markdown = self._responses_text(
+        cache_key = None
+        if figure_cache is not None:
+            cache_key = self._model_cache_key(
+                stage="verbalize",
                 deployment=self.verbalization_deployment,
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
-            ).strip()
+            )
+            cached = figure_cache.get(cache_key)
+            # An empty entry (written before empty responses fell back) counts as a miss.
+            if isinstance(cached, dict) and cached.get("markdown") and isinstance(
+                cached["markdown"], str
+            ):
+                self._log(
+                    f"Reusing cached figure verbalization for '{analysis_payload['figure_id']}'"
+                )
+                return cached["markdown"]
+
+        try:
+            with span("figure.verbalize"):
+                markdown = self._responses_text(
+                    deployment=self.verbalization_deployment,
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
+                ).strip()
+            if not markdown:
+                raise ValueError("The verbalization response had no markdown.")
+            # Deterministic fallbacks are cheap to rebuild and are not cached.
+            if figure_cache is not None and cache_key is not None:
+                figure_cache.set(cache_key, {"markdown": markdown})
             self._log(
                 f"Completed figure verbalization for '{analysis_payload['figure_id']}' "
                 f"(markdown_chars={len(markdown)})"
@@ -1347,30 +1995,117 @@ class DocumentLayoutNoSkillV2Service:
         chunk_size: int,
         chunk_overlap: int,
         content_format: str = DEFAULT_CONTENT_FORMAT,
+        chunk_job: Future | None = None,
+        deduplicator: ChunkDeduplicator | None = None,
     ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
-        payload = json.loads(path.read_text(encoding="utf-8"))
+        deduplicator = deduplicator or ChunkDeduplicator()
+        payload = loads(path.read_bytes())
         source_name = path.stem
         metadata = self._metadata_from_payload(payload, source_name)
-        chunks = self._chunk_document_text(
-            str(payload.get("content") or ""),
-            content_format=content_format,
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-        )
+        if chunk_job is not None:
+            chunks = chunk_job.result()
+        else:
+            chunks = self._chunk_document_text(
+                str(payload.get("content") or ""),
+                content_format=content_format,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+            )
         self._log(f"Derived {len(chunks)} text chunk(s) from JSON source '{path.name}'")
 
         records: list[dict[str, Any]] = []
+        pending_count = 0
         for ordinal, chunk in enumerate(chunks, start=1):
+            record_id = self._make_record_id(source_name, "text", ordinal)
+            if deduplicator.canonical_for(record_id, chunk) is not None:
+                continue
+            try:
+                content_vector = self._embed_text(chunk)
+            except OpenAIBatchPending:
+                pending_count += 1
+                continue
             records.append(
                 {
-                    "id": self._make_record_id(source_name, "text", ordinal),
+                    "id": record_id,
                     "metadata": metadata,
                     "content": chunk,
-                    "contentVector": self._embed_text(chunk),
+                    "contentVector": content_vector,
                 }
             )
+        if pending_count:
+            raise OpenAIBatchPending(
+                f"{pending_count} embedding request(s) for '{path.name}' are waiting on a batch."
+            )
+        if len(records) < len(chunks):
+            self._log(
+                f"Skipped {len(chunks) - len(records)} duplicate text chunk(s) "
+                f"from JSON source '{path.name}'"
+            )
         return records, []
 
+    def _derive_figure_markdown(
+        self,
+        *,
+        figure_id: str,
+        figure_bytes: bytes,
+        analysis_payload: dict[str, Any],
+        chunk_container: str,
+        source_name: str,
+        figure_cache: LocalJsonCache | None = None,
+        image_preprocess: ImagePreprocessOptions | None = None,
+        figure_calls: str = "separate",
+        figure_verbalization: str = "llm",
+    ) -> tuple[str, str, str]:
+        """Interprets and verbalizes one figure and persists the grounded and markdown artifacts."""
+        fused_markdown = None
+        if figure_calls == "fused":
+            grounded, fused_markdown = self._interpret_and_verbalize_figure(
+                figure_bytes=figure_bytes,
+                analysis_payload=analysis_payload,
+                figure_cache=figure_cache,
+                image_preprocess=image_preprocess,
+            )
+        else:
+            grounded = self._interpret_figure(
+                figure_bytes=figure_bytes,
+                analysis_payload=analysis_payload,
+                figure_cache=figure_cache,
+                image_preprocess=image_preprocess,
+            )
+        grounded_artifact = self._save_artifact(
+            container_name=chunk_container,
+            blob_name=f"figure-grounded-v2/{source_name}/{figure_id}.json",
+            payload=grounded,
+        )
+        self._log(
+            f"Persisted grounded interpretation artifact for '{figure_id}' to '{grounded_artifact}'"
+        )
+        if fused_markdown is not None:
+            figure_markdown = fused_markdown
+        elif figure_verbalization == "template":
+            figure_markdown = self._markdown_from_grounded(
+                grounded=grounded, analysis_payload=analysis_payload
+            )
+            self._log(
+                f"Rendered template markdown for '{figure_id}' "
+                f"(markdown_chars={len(figure_markdown)})"
+            )
+        else:
+            figure_markdown = self._verbalize_figure(
+                grounded=grounded,
+                analysis_payload=analysis_payload,
+                figure_cache=figure_cache,
+            )
+        markdown_artifact = self._save_text_artifact(
+            container_name=chunk_container,
+            blob_name=f"figure-markdown-v2/{source_name}/{figure_id}.md",
+            text=figure_markdown,
+        )
+        self._log(
+            f"Persisted markdown artifact for '{figure_id}' to '{markdown_artifact}'"
+        )
+        return grounded_artifact, markdown_artifact, figure_markdown
+
     def _pdf_records(
         self,
         *,
@@ -1379,8 +2114,16 @@ class DocumentLayoutNoSkillV2Service:
         chunk_size: int,
         chunk_overlap: int,
         content_format: str = DEFAULT_CONTENT_FORMAT,
+        cpu_pool: CpuStagePool | None = None,
+        deduplicator: ChunkDeduplicator | None = None,
+        figure_cache: LocalJsonCache | None = None,
+        image_preprocess: ImagePreprocessOptions | None = None,
+        figure_calls: str = "separate",
+        figure_verbalization: str = "llm",
     ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
         normalized_content_format = self._normalize_content_format(content_format)
+        cpu_pool = cpu_pool or CpuStagePool()
+        deduplicator = deduplicator or ChunkDeduplicator()
         self._log(f"Analyzing PDF source '{path.name}' with Document Intelligence")
         result, operation_id = self.di_service.analyze_file_with_figures(
             path=path,
@@ -1410,16 +2153,16 @@ class DocumentLayoutNoSkillV2Service:
         page_text: dict[int, list[str]] = {}
         page_paragraphs: dict[int, list[dict[str, Any]]] = {}
         full_document_parts: list[str] = []
-        for index, paragraph in enumerate(getattr(result, "paragraphs", None) or []):
+        paragraphs = list(getattr(result, "paragraphs", None) or [])
+        paragraph_records = self._build_paragraph_records(
+            paragraphs=paragraphs,
+            page_dimensions=page_dimensions,
+        )
+        for paragraph, paragraph_record in zip(paragraphs, paragraph_records):
             content = self._searchable_text(getattr(paragraph, "content", "") or "")
             if not content:
                 continue
             full_document_parts.append(content)
-            paragraph_record = self._build_paragraph_record(
-                paragraph=paragraph,
-                index=index,
-                page_dimensions=page_dimensions,
-            )
             if not paragraph_record:
                 continue
             page_number = paragraph_record["page_number"]
@@ -1431,177 +2174,211 @@ class DocumentLayoutNoSkillV2Service:
             f"geometry_paragraph_count={sum(len(items) for items in page_paragraphs.values())})"
         )
 
-        document_summary = self._generate_document_summary(
-            source_name=path.name,
-            document_text=sanitized_document_text_content
-            or " ".join(full_document_parts),
-        )
+        paragraph_index = ParagraphSpatialIndex(page_paragraphs)
 
-        records: list[dict[str, Any]] = []
-        support_artifacts: list[dict[str, Any]] = []
-        ordinal = 1
-        text_chunk_count = 0
-        for chunk in self._chunk_document_text(
+        # Chunk in the CPU stage pool while the summary request waits on the network.
+        chunk_job = self._submit_chunk_job(
+            cpu_pool,
             sanitized_document_text_content
             or "\n\n".join(" ".join(page_text[p]) for p in sorted(page_text)),
             content_format=normalized_content_format,
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
-        ):
+        )
+        pending_count = 0
+        try:
+            document_summary = self._generate_document_summary(
+                source_name=path.name,
+                document_text=sanitized_document_text_content
+                or " ".join(full_document_parts),
+                artifact_container=chunk_container,
+            )
+        except OpenAIBatchPending:
+            # Figure prompts embed the summary, so figures wait for the next batch pass.
+            pending_count += 1
+            document_summary = None
+
+        records: list[dict[str, Any]] = []
+        support_artifacts: list[dict[str, Any]] = []
+        ordinal = 1
+        text_chunk_count = 0
+        duplicate_chunk_count = 0
+        for chunk in chunk_job.result():
             content = chunk.strip()
+            record_id = self._make_record_id(source_name, "text", ordinal)
+            ordinal += 1
+            if deduplicator.canonical_for(record_id, content) is not None:
+                duplicate_chunk_count += 1
+                continue
+            try:
+                content_vector = self._embed_text(content)
+            except OpenAIBatchPending:
+                pending_count += 1
+                continue
             records.append(
                 {
-                    "id": self._make_record_id(source_name, "text", ordinal),
+                    "id": record_id,
                     "metadata": base_metadata,
                     "content": content,
-                    "contentVector": self._embed_text(content),
+                    "contentVector": content_vector,
                 }
             )
-            ordinal += 1
             text_chunk_count += 1
         self._log(
             f"Derived {text_chunk_count} text chunk record(s) from PDF source '{path.name}' "
-            f"(content_format='{normalized_content_format}')"
+            f"(content_format='{normalized_content_format}', "
+            f"skipped_duplicates={duplicate_chunk_count})"
         )
 
         figures = getattr(result, "figures", None) or []
         self._log(f"Found {len(figures)} figure(s) in PDF source '{path.name}'")
-        for figure in figures:
-            if not operation_id:
-                raise ValueError(
-                    "Document Intelligence analyze result did not return operation_id for figures."
-                )
-            figure_id = getattr(figure, "id", None) or f"figure-{ordinal}"
-            caption = self._searchable_text(
-                getattr(getattr(figure, "caption", None), "content", None) or ""
-            )
-            page_number = self._page_number_from_regions(figure) or 0
-            bounding_regions = self._bounding_regions_record(
-                getattr(figure, "bounding_regions", None)
-            )
-            figure_bbox = self._bbox_from_bounding_regions(
-                bounding_regions=bounding_regions,
-                page_dimensions=page_dimensions,
-            )
+        if document_summary is None:
             self._log(
-                f"Processing figure '{figure_id}' from '{path.name}' "
-                f"(page={page_number}, caption_present={bool(caption)}, regions={len(bounding_regions)})"
+                f"Deferring {len(figures)} figure(s) in '{path.name}' until the document summary batch completes"
             )
-            figure_bytes = self._extract_figure_bytes(
-                result_id=operation_id, figure_id=figure_id
-            )
-            figure_ocr_text = self._extract_figure_text(figure_bytes)
-            relevant_text, surrounding_text = self._select_relevant_text(
-                figure_id=figure_id,
-                caption=caption,
-                figure_bbox=figure_bbox,
-                page_number=page_number,
-                page_paragraphs=page_paragraphs,
-            )
-            visual_heuristics = self._guess_visual_heuristics(
-                caption=caption,
-                figure_ocr_text=figure_ocr_text,
-                relevant_text=relevant_text,
-                surrounding_text=surrounding_text,
-            )
-            self._log(
-                f"Figure '{figure_id}' context prepared "
-                f"(ocr_chars={len(figure_ocr_text)}, relevant_chars={len(relevant_text)}, "
-                f"surrounding_chars={len(surrounding_text)})"
-            )
-            image_artifact_uri = self._write_binary_artifact(
-                container_name=chunk_container,
-                blob_name=f"figures-v2/{source_name}/{figure_id}.png",
-                data=figure_bytes,
-                content_type="image/png",
-            )
-            self._log(
-                f"Persisted figure image for '{figure_id}' to '{image_artifact_uri}'"
-            )
-            analysis_payload = self._build_figure_analysis_payload(
-                source_name=path.name,
-                source_url=source_url,
-                page_number=page_number,
-                figure_id=figure_id,
-                caption=caption,
-                bounding_regions=bounding_regions,
-                figure_ocr_text=figure_ocr_text,
-                relevant_text=relevant_text,
-                surrounding_text=surrounding_text,
-                document_summary=document_summary,
-                visual_heuristics=visual_heuristics,
-                image_artifact_uri=image_artifact_uri,
-            )
-            analysis_artifact = self._save_artifact(
-                container_name=chunk_container,
-                blob_name=f"figure-analysis-v2/{source_name}/{figure_id}.json",
-                payload=analysis_payload,
-            )
-            self._log(
-                f"Persisted figure-analysis artifact for '{figure_id}' to '{analysis_artifact}'"
-            )
-            grounded = self._interpret_figure(
-                figure_bytes=figure_bytes,
-                analysis_payload=analysis_payload,
-            )
-            grounded_artifact = self._save_artifact(
-                container_name=chunk_container,
-                blob_name=f"figure-grounded-v2/{source_name}/{figure_id}.json",
-                payload=grounded,
-            )
-            self._log(
-                f"Persisted grounded interpretation artifact for '{figure_id}' to '{grounded_artifact}'"
-            )
-            figure_markdown = self._verbalize_figure(
-                grounded=grounded,
-                analysis_payload=analysis_payload,
-            )
-            markdown_artifact = self._save_text_artifact(
-                container_name=chunk_container,
-                blob_name=f"figure-markdown-v2/{source_name}/{figure_id}.md",
-                text=figure_markdown,
-            )
-            self._log(
-                f"Persisted markdown artifact for '{figure_id}' to '{markdown_artifact}'"
-            )
-            support_artifacts.append(
-                {
-                    "source": path.name,
-                    "figure_id": figure_id,
-                    "analysis_artifact": analysis_artifact,
-                    "grounded_artifact": grounded_artifact,
-                    "markdown_artifact": markdown_artifact,
-                    "image_artifact": image_artifact_uri,
-                }
-            )
-            records.append(
-                {
-                    "id": self._make_record_id(source_name, "image", ordinal),
-                    "metadata": self._metadata_record(
-                        source_type="image",
-                        category=base_metadata["category"],
-                        topic=base_metadata["topic"],
-                        subtopic=base_metadata["subtopic"],
-                        source_url=image_artifact_uri,
-                        source_url_text=f"{path.name} figure {figure_id}",
-                        source_name=path.name,
-                        page_number=page_number,
+            figures = []
+        for figure in figures:
+            with span("figure", source=path.name) as figure_span:
+                if not operation_id:
+                    raise ValueError(
+                        "Document Intelligence analyze result did not return operation_id for figures."
+                    )
+                figure_id = getattr(figure, "id", None) or f"figure-{ordinal}"
+                figure_span["figure_id"] = figure_id
+                caption = self._searchable_text(
+                    getattr(getattr(figure, "caption", None), "content", None) or ""
+                )
+                page_number = self._page_number_from_regions(figure) or 0
+                bounding_regions = self._bounding_regions_record(
+                    getattr(figure, "bounding_regions", None)
+                )
+                figure_bbox = self._bbox_from_bounding_regions(
+                    bounding_regions=bounding_regions,
+                    page_dimensions=page_dimensions,
+                )
+                self._log(
+                    f"Processing figure '{figure_id}' from '{path.name}' "
+                    f"(page={page_number}, caption_present={bool(caption)}, regions={len(bounding_regions)})"
+                )
+                figure_bytes = self._extract_figure_bytes(
+                    result_id=operation_id, figure_id=figure_id
+                )
+                figure_ocr_text = self._extract_figure_text(figure_bytes)
+                with span("figure.context"):
+                    relevant_text, surrounding_text = self._select_relevant_text(
                         figure_id=figure_id,
-                        summary_method="aoai-grounded-interpretation+semantic-markdown",
-                        bounding_regions=bounding_regions,
-                        ocr_text=figure_ocr_text,
                         caption=caption,
-                    ),
-                    "content": figure_markdown,
-                    "contentVector": self._embed_text(figure_markdown),
-                }
-            )
-            ordinal += 1
-            self._log(
-                f"Completed figure record for '{figure_id}' "
-                f"(content_chars={len(figure_markdown)}, total_support_artifacts={len(support_artifacts)})"
-            )
+                        figure_bbox=figure_bbox,
+                        page_number=page_number,
+                        page_paragraphs=page_paragraphs,
+                        paragraph_index=paragraph_index,
+                    )
+                visual_heuristics = self._guess_visual_heuristics(
+                    caption=caption,
+                    figure_ocr_text=figure_ocr_text,
+                    relevant_text=relevant_text,
+                    surrounding_text=surrounding_text,
+                )
+                self._log(
+                    f"Figure '{figure_id}' context prepared "
+                    f"(ocr_chars={len(figure_ocr_text)}, relevant_chars={len(relevant_text)}, "
+                    f"surrounding_chars={len(surrounding_text)})"
+                )
+                image_artifact_uri = self._write_binary_artifact(
+                    container_name=chunk_container,
+                    blob_name=f"figures-v2/{source_name}/{figure_id}.png",
+                    data=figure_bytes,
+                    content_type="image/png",
+                )
+                self._log(
+                    f"Persisted figure image for '{figure_id}' to '{image_artifact_uri}'"
+                )
+                analysis_payload = self._build_figure_analysis_payload(
+                    source_name=path.name,
+                    source_url=source_url,
+                    page_number=page_number,
+                    figure_id=figure_id,
+                    caption=caption,
+                    bounding_regions=bounding_regions,
+                    figure_ocr_text=figure_ocr_text,
+                    relevant_text=relevant_text,
+                    surrounding_text=surrounding_text,
+                    document_summary=document_summary,
+                    visual_heuristics=visual_heuristics,
+                    image_artifact_uri=image_artifact_uri,
+                )
+                analysis_artifact = self._save_artifact(
+                    container_name=chunk_container,
+                    blob_name=f"figure-analysis-v2/{source_name}/{figure_id}.json",
+                    payload=analysis_payload,
+                )
+                self._log(
+                    f"Persisted figure-analysis artifact for '{figure_id}' to '{analysis_artifact}'"
+                )
+                try:
+                    grounded_artifact, markdown_artifact, figure_markdown = (
+                        self._derive_figure_markdown(
+                            figure_id=figure_id,
+                            figure_bytes=figure_bytes,
+                            analysis_payload=analysis_payload,
+                            chunk_container=chunk_container,
+                            source_name=source_name,
+                            figure_cache=figure_cache,
+                            image_preprocess=image_preprocess,
+                            figure_calls=figure_calls,
+                            figure_verbalization=figure_verbalization,
+                        )
+                    )
+                    content_vector = self._embed_text(figure_markdown)
+                except OpenAIBatchPending:
+                    pending_count += 1
+                    ordinal += 1
+                    continue
+                support_artifacts.append(
+                    {
+                        "source": path.name,
+                        "figure_id": figure_id,
+                        "analysis_artifact": analysis_artifact,
+                        "grounded_artifact": grounded_artifact,
+                        "markdown_artifact": markdown_artifact,
+                        "image_artifact": image_artifact_uri,
+                    }
+                )
+                records.append(
+                    {
+                        "id": self._make_record_id(source_name, "image", ordinal),
+                        "metadata": self._metadata_record(
+                            source_type="image",
+                            category=base_metadata["category"],
+                            topic=base_metadata["topic"],
+                            subtopic=base_metadata["subtopic"],
+                            source_url=image_artifact_uri,
+                            source_url_text=f"{path.name} figure {figure_id}",
+                            source_name=path.name,
+                            page_number=page_number,
+                            figure_id=figure_id,
+                            summary_method=self._figure_summary_method(
+                                figure_calls=figure_calls,
+                                figure_verbalization=figure_verbalization,
+                            ),
+                            bounding_regions=bounding_regions,
+                            ocr_text=figure_ocr_text,
+                            caption=caption,
+                        ),
+                        "content": figure_markdown,
+                        "contentVector": content_vector,
+                    }
+                )
+                ordinal += 1
+                self._log(
+                    f"Completed figure record for '{figure_id}' "
+                    f"(content_chars={len(figure_markdown)}, total_support_artifacts={len(support_artifacts)})"
+                )
 
+        if pending_count:
+            raise OpenAIBatchPending(
+                f"{pending_count} OpenAI request chain(s) for '{path.name}' are waiting on a batch."
+            )
         if not records:
             raise ValueError(f"No extractable content found in PDF: {path}")
         self._log(
@@ -1618,25 +2395,43 @@ class DocumentLayoutNoSkillV2Service:
         chunk_size: int,
         chunk_overlap: int,
         content_format: str = DEFAULT_CONTENT_FORMAT,
+        cpu_pool: CpuStagePool | None = None,
+        chunk_job: Future | None = None,
+        deduplicator: ChunkDeduplicator | None = None,
+        figure_cache: LocalJsonCache | None = None,
+        image_preprocess: ImagePreprocessOptions | None = None,
+        figure_calls: str = "separate",
+        figure_verbalization: str = "llm",
     ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
-        suffix = path.suffix.lower()
-        self._log(f"Processing source '{path.name}' as '{suffix}'")
-        if suffix == ".json":
-            return self._json_records(
-                path=path,
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                content_format=content_format,
-            )
-        if suffix == ".pdf":
-            return self._pdf_records(
-                path=path,
-                chunk_container=chunk_container,
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                content_format=content_format,
-            )
-        raise ValueError(f"Unsupported demo file type: {path.suffix}")
+        with span("source", source=path.name), usage_source(path.name):
+            suffix = path.suffix.lower()
+            self._log(f"Processing source '{path.name}' as '{suffix}'")
+            if deduplicator is not None:
+                deduplicator.start_source(path.name)
+            if suffix == ".json":
+                return self._json_records(
+                    path=path,
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap,
+                    content_format=content_format,
+                    chunk_job=chunk_job,
+                    deduplicator=deduplicator,
+                )
+            if suffix == ".pdf":
+                return self._pdf_records(
+                    path=path,
+                    chunk_container=chunk_container,
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap,
+                    content_format=content_format,
+                    cpu_pool=cpu_pool,
+                    deduplicator=deduplicator,
+                    figure_cache=figure_cache,
+                    image_preprocess=image_preprocess,
+                    figure_calls=figure_calls,
+                    figure_verbalization=figure_verbalization,
+                )
+            raise ValueError(f"Unsupported demo file type: {path.suffix}")
 
     def _write_source_artifact(
         self,
@@ -1645,6 +2440,7 @@ class DocumentLayoutNoSkillV2Service:
         source_path: Path,
         records: list[dict[str, Any]],
         support_artifacts: list[dict[str, Any]],
+        artifact_vectors: str = "inline",
     ) -> str:
         artifact = {
             "source": source_path.name,
@@ -1654,6 +2450,19 @@ class DocumentLayoutNoSkillV2Service:
             "records": records,
         }
         blob_name = f"{source_path.stem}.json"
+        if artifact_vectors == "sidecar":
+            slim_records, vectors = split_vectors(records)
+            vector_blob_name = sidecar_name(blob_name)
+            self._write_binary_artifact(
+                container_name=container_name,
+                blob_name=vector_blob_name,
+                data=encode_npy(vectors),
+                content_type=NPY_CONTENT_TYPE,
+            )
+            artifact["records"] = slim_records
+            artifact["vectorSidecar"] = sidecar_descriptor(
+                name=vector_blob_name, vectors=vectors, dtype="float32"
+            )
         artifact_uri = self._save_artifact(
             container_name=container_name, blob_name=blob_name, payload=artifact
         )
@@ -1667,6 +2476,9 @@ class DocumentLayoutNoSkillV2Service:
         self,
         *,
         records: list[dict[str, Any]],
+        artifact_vectors: str = "inline",
+        figure_calls: str = "separate",
+        figure_verbalization: str = "llm",
     ) -> str:
         generated_at = datetime.now(timezone.utc)
         image_records = [
@@ -1691,6 +2503,8 @@ class DocumentLayoutNoSkillV2Service:
         payload = {
             "pipeline": "document-layout-no-skill-v2",
             "mode": "demo",
+            "figure_calls": figure_calls,
+            "figure_verbalization": figure_verbalization,
             "generated_at": generated_at.isoformat(),
             "record_count": len(image_records),
             "records": image_records,
@@ -1699,6 +2513,14 @@ class DocumentLayoutNoSkillV2Service:
             DEFAULT_SEMANTIC_DEVIATION_DIR
             / f"semantic-run-{generated_at.strftime('%Y%m%dT%H%M%S%fZ')}.json"
         )
+        if artifact_vectors == "sidecar":
+            slim_records, vectors = split_vectors(image_records, field="vector")
+            vector_path = out_path.with_name(sidecar_name(out_path.name))
+            self.local_output_store.save_stream([encode_npy(vectors)], str(vector_path))
+            payload["records"] = slim_records
+            payload["vectorSidecar"] = sidecar_descriptor(
+                name=vector_path.name, vectors=vectors, dtype="float32", field="vector"
+            )
         self.local_output_store.save(payload, str(out_path))
         self._log(
             f"Persisted semantic deviation snapshot to '{out_path}' "
@@ -1706,6 +2528,23 @@ class DocumentLayoutNoSkillV2Service:
         )
         return str(out_path)
 
+    def _batch_pending_payload(
+        self, *, mode: str, pending_sources: list[str]
+    ) -> dict[str, Any]:
+        self._log(
+            f"Stopping before index upload; {len(pending_sources)} source(s) are waiting on "
+            "OpenAI batch results. Submit the batch input files, place the outputs under "
+            "results/, and run again."
+        )
+        return {
+            "pipeline": "document-layout-no-skill-v2",
+            "mode": mode,
+            "status": "openai-batch-pending",
+            "pending_sources": pending_sources,
+            "record_count": 0,
+            "records": [],
+        }
+
     def run(
         self,
         *,
@@ -1716,6 +2555,13 @@ class DocumentLayoutNoSkillV2Service:
         chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
         content_format: str = DEFAULT_CONTENT_FORMAT,
         hard_refresh: bool = False,
+        cpu_workers: int = 0,
+        dedup: str = "off",
+        artifact_vectors: str = "inline",
+        figure_cache: LocalJsonCache | None = None,
+        image_preprocess: ImagePreprocessOptions | None = None,
+        figure_calls: str = "separate",
+        figure_verbalization: str = "llm",
     ) -> dict[str, Any]:
         path = Path(src)
         if not path.exists():
@@ -1723,21 +2569,37 @@ class DocumentLayoutNoSkillV2Service:
         self._log(
             f"Starting single-source v2 run for '{path}' "
             f"(chunk_container='{chunk_container}', chunk_size={chunk_size}, "
-            f"chunk_overlap={chunk_overlap}, content_format='{self._normalize_content_format(content_format)}')"
+            f"chunk_overlap={chunk_overlap}, content_format='{self._normalize_content_format(content_format)}', "
+            f"dedup='{dedup}')"
         )
 
-        records, support_artifacts = self._process_source(
-            path=path,
-            chunk_container=chunk_container,
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            content_format=content_format,
-        )
+        deduplicator = ChunkDeduplicator(dedup)
+        with CpuStagePool(max_workers=cpu_workers) as cpu_pool:
+            try:
+                records, support_artifacts = self._process_source(
+                    path=path,
+                    chunk_container=chunk_container,
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap,
+                    content_format=content_format,
+                    cpu_pool=cpu_pool,
+                    deduplicator=deduplicator,
+                    figure_cache=figure_cache,
+                    image_preprocess=image_preprocess,
+                    figure_calls=figure_calls,
+                    figure_verbalization=figure_verbalization,
+                )
+            except OpenAIBatchPending as exc:
+                self._log(str(exc))
+                return self._batch_pending_payload(
+                    mode="single-source", pending_sources=[path.name]
+                )
         artifact_uri = self._write_source_artifact(
             container_name=chunk_container,
             source_path=path,
             records=records,
             support_artifacts=support_artifacts,
+            artifact_vectors=artifact_vectors,
         )
         index_name = self._target_index_name(name_prefix)
         self._ensure_target_index(index_name=index_name, hard_refresh=hard_refresh)
@@ -1758,6 +2620,9 @@ class DocumentLayoutNoSkillV2Service:
             "target_index": index_name,
             "record_count": len(records),
             "content_format": self._normalize_content_format(content_format),
+            "dedup": deduplicator.stats(),
+            "figure_calls": figure_calls,
+            "figure_verbalization": figure_verbalization,
             "embedding": {
                 "mode": "azure_openai",
                 "deployment": self.embedding_deployment,
@@ -1777,50 +2642,88 @@ class DocumentLayoutNoSkillV2Service:
         chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
         content_format: str = DEFAULT_CONTENT_FORMAT,
         hard_refresh: bool = True,
+        cpu_workers: int = 0,
+        dedup: str = "off",
+        artifact_vectors: str = "inline",
+        figure_cache: LocalJsonCache | None = None,
+        image_preprocess: ImagePreprocessOptions | None = None,
+        figure_calls: str = "separate",
+        figure_verbalization: str = "llm",
     ) -> dict[str, Any]:
         demo_path = Path(demo_dir)
         files = self._load_demo_files(demo_path)
         derived_artifacts: list[dict[str, Any]] = []
         all_records: list[dict[str, Any]] = []
         all_support_artifacts: list[dict[str, Any]] = []
+        pending_sources: list[str] = []
 
         self._log(
             f"Starting v2 demo run from '{demo_path}' "
             f"(source_count={len(files)}, chunk_container='{chunk_container}', "
             f"chunk_size={chunk_size}, chunk_overlap={chunk_overlap}, "
-            f"content_format='{self._normalize_content_format(content_format)}')"
+            f"content_format='{self._normalize_content_format(content_format)}', dedup='{dedup}')"
         )
-        for path in files:
-            self._log(f"Deriving v2 records for '{path.name}'")
-            records, support_artifacts = self._process_source(
-                path=path,
-                chunk_container=chunk_container,
-                chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap,
-                content_format=content_format,
-            )
-            artifact_uri = self._write_source_artifact(
-                container_name=chunk_container,
-                source_path=path,
-                records=records,
-                support_artifacts=support_artifacts,
-            )
-            derived_artifacts.append(
-                {
-                    "source": path.name,
-                    "artifact": artifact_uri,
-                    "record_count": len(records),
-                    "support_artifact_count": len(support_artifacts),
-                }
-            )
-            all_records.extend(records)
-            all_support_artifacts.extend(support_artifacts)
+        deduplicator = ChunkDeduplicator(dedup)
+        with CpuStagePool(max_workers=cpu_workers) as cpu_pool:
+            json_chunk_jobs: dict[Path, Future] = {}
+            if cpu_pool.enabled:
+                json_chunk_jobs = self._submit_json_chunk_jobs(
+                    cpu_pool=cpu_pool,
+                    files=files,
+                    content_format=content_format,
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap,
+                )
+            for path in files:
+                self._log(f"Deriving v2 records for '{path.name}'")
+                try:
+                    records, support_artifacts = self._process_source(
+                        path=path,
+                        chunk_container=chunk_container,
+                        chunk_size=chunk_size,
+                        chunk_overlap=chunk_overlap,
+                        content_format=content_format,
+                        cpu_pool=cpu_pool,
+                        chunk_job=json_chunk_jobs.get(path),
+                        deduplicator=deduplicator,
+                        figure_cache=figure_cache,
+                        image_preprocess=image_preprocess,
+                        figure_calls=figure_calls,
+                        figure_verbalization=figure_verbalization,
+                    )
+                except OpenAIBatchPending as exc:
+                    self._log(str(exc))
+                    pending_sources.append(path.name)
+                    continue
+                artifact_uri = self._write_source_artifact(
+                    container_name=chunk_container,
+                    source_path=path,
+                    records=records,
+                    support_artifacts=support_artifacts,
+                    artifact_vectors=artifact_vectors,
+                )
+                derived_artifacts.append(
+                    {
+                        "source": path.name,
+                        "artifact": artifact_uri,
+                        "record_count": len(records),
+                        "support_artifact_count": len(support_artifacts),
+                    }
+                )
+                all_records.extend(records)
+                all_support_artifacts.extend(support_artifacts)
+
+        if pending_sources:
+            return self._batch_pending_payload(mode="demo", pending_sources=pending_sources)
 
         index_name = self._target_index_name(name_prefix)
         self._ensure_target_index(index_name=index_name, hard_refresh=hard_refresh)
         self._upload_records(index_name=index_name, records=all_records)
         semantic_deviation_artifact = self._write_semantic_deviation_artifact(
-            records=all_records
+            records=all_records,
+            artifact_vectors=artifact_vectors,
+            figure_calls=figure_calls,
+            figure_verbalization=figure_verbalization,
         )
         self._log(
             f"Demo finished with {len(all_records)} indexed record(s) "
@@ -1840,6 +2743,9 @@ class DocumentLayoutNoSkillV2Service:
             "support_artifacts": all_support_artifacts,
             "semantic_deviation_artifact": semantic_deviation_artifact,
             "content_format": self._normalize_content_format(content_format),
+            "dedup": deduplicator.stats(),
+            "figure_calls": figure_calls,
+            "figure_verbalization": figure_verbalization,
             "embedding": {
                 "mode": "azure_openai",
                 "deployment": self.embedding_deployment,
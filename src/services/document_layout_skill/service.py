@@ -1,4 +1,3 @@
-import json
 import hashlib
 import mimetypes
 import re
@@ -10,6 +9,7 @@ from urllib.parse import quote, urlparse
 from urllib.request import Request, urlopen
 
 from src.conf.conf import get_config
+from src.serialization import loads
 from src.services.ai_search.service import AISearchService
 from src.services.shared import (
     DEFAULT_CHUNK_CONTAINER,
@@ -20,8 +20,11 @@ from src.services.shared import (
     VECTOR_ALGORITHM_NAME,
     VECTOR_PROFILE_NAME,
     build_shared_index,
+    encode_search_body,
 )
 from src.services.storage_account import AzureStorageAccountService
+from src.storage import through_cassette
+from src.telemetry import count_metric, span
 
 SEARCH_API_VERSION = "2025-11-01-preview"
 EMBEDDING_DIMENSIONS = 1024
@@ -79,6 +82,7 @@ class DocumentLayoutSkillService:
 
         self.search_endpoint: str = search_endpoint.rstrip("/")
         self.search_api_key: str = search_api_key
+        self.search_gzip_min_bytes: int | None = config.get("ai_search_gzip_min_bytes")
         self.storage_blob_endpoint: str = storage_blob_endpoint.rstrip("/")
         self.storage_blob_api_key: str = storage_blob_api_key
         self.foundry_resource_uri: str = self._normalize_foundry_resource_uri(foundry_endpoint)
@@ -125,17 +129,24 @@ class DocumentLayoutSkillService:
         )
 
     def _search_request(self, method: str, path: str, body: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        return through_cassette(
+            "search", (method, path, body), lambda: self._send_search_request(method, path, body)
+        )
+
+    def _send_search_request(
+        self, method: str, path: str, body: Dict[str, Any] | None = None
+    ) -> Dict[str, Any]:
         url = f"{self.search_endpoint}{path}?api-version={SEARCH_API_VERSION}"
-        data = json.dumps(body).encode("utf-8") if body is not None else None
-        req = Request(url, data=data, method=method)
+        data, headers = encode_search_body(body, gzip_min_bytes=self.search_gzip_min_bytes)
+        req = Request(url, data=data, method=method, headers=headers)
         req.add_header("api-key", self.search_api_key)
-        req.add_header("Content-Type", "application/json")
 
         try:
-            with urlopen(req, timeout=120) as resp:
+            with span("search.request", method=method, path=path), urlopen(req, timeout=120) as resp:
                 raw = resp.read()
-                return json.loads(raw.decode("utf-8")) if raw else {}
+                return loads(raw) if raw else {}
         except HTTPError as exc:
+            count_metric("remote_errors_total", backend="search", status=exc.code)
             detail = exc.read().decode("utf-8", errors="replace")
             raise SearchApiError(
                 method=method,
@@ -144,6 +155,7 @@ class DocumentLayoutSkillService:
                 detail=detail,
             ) from exc
         except URLError as exc:
+            count_metric("remote_errors_total", backend="search", status="network")
             raise SearchApiError(
                 method=method,
                 path=path,
@@ -192,6 +204,11 @@ class DocumentLayoutSkillService:
         return min(requested_chunk_size, MAX_MULTIMODAL_TEXT_CHARS)
 
     def _search_delete_if_exists(self, path: str) -> None:
+        through_cassette(
+            "search", ("DELETE", path), lambda: self._send_search_delete_if_exists(path)
+        )
+
+    def _send_search_delete_if_exists(self, path: str) -> None:
         url = f"{self.search_endpoint}{path}?api-version={SEARCH_API_VERSION}"
         req = Request(url, method="DELETE")
         req.add_header("api-key", self.search_api_key)
@@ -239,11 +256,13 @@ class DocumentLayoutSkillService:
     def _upload_records(self, *, index_name: str, records: list[dict[str, Any]]) -> None:
         if not records:
             return
-        self._search_request(
-            "POST",
-            f"/indexes/{quote(index_name)}/docs/index",
-            {"value": [{"@search.action": "mergeOrUpload", **record} for record in records]},
-        )
+        with span("search.upload"):
+            self._search_request(
+                "POST",
+                f"/indexes/{quote(index_name)}/docs/index",
+                {"value": [{"@search.action": "mergeOrUpload", **record} for record in records]},
+            )
+        count_metric("records_uploaded_total", len(records), index=index_name)
 
     @staticmethod
     def _source_name_from_url(source_url: str) -> str:
@@ -378,6 +397,7 @@ class DocumentLayoutSkillService:
                     f"Indexer '{indexer_name}' is busy; retrying in {delay:.1f}s "
                     f"(attempt {attempt + 1})"
                 )
+                count_metric("retries_total", backend="search")
                 time.sleep(delay)
                 attempt += 1
 
@@ -562,7 +582,7 @@ class DocumentLayoutSkillService:
             },
         )
 
-        self.ai_search_service.get_search_index_client().create_or_update_index(
+        self.ai_search_service.create_or_update_index(
             build_shared_index(name=target_index_name, embedding_dimensions=self.embedding_dimensions)
         )
 
@@ -728,9 +748,10 @@ class DocumentLayoutSkillService:
         self._run_indexer_with_backoff(indexer_name=indexer_name, max_wait_seconds=5.0)
 
         self._log(f"Waiting for indexer '{indexer_name}' to finish")
-        status = self._wait_for_indexer(
-            lambda: self._search_request("GET", f"/indexers/{quote(indexer_name)}/status")
-        )
+        with span("search.indexer"):
+            status = self._wait_for_indexer(
+                lambda: self._search_request("GET", f"/indexers/{quote(indexer_name)}/status")
+            )
         self._log(f"Indexer '{indexer_name}' completed successfully")
 
         escaped_source_blob_url = source_blob_url.replace("'", "''")
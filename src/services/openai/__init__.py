@@ -1,3 +1,18 @@
+from .batch import (
+    DEFAULT_OPENAI_BATCH_DIR,
+    OpenAIBatch,
+    OpenAIBatchPending,
+    active_openai_batch,
+    openai_batch_run,
+)
 from .service import OpenAIService, OpenAIServiceError
 
-__all__ = ["OpenAIService", "OpenAIServiceError"]
+__all__ = [
+    "DEFAULT_OPENAI_BATCH_DIR",
+    "OpenAIBatch",
+    "OpenAIBatchPending",
+    "OpenAIService",
+    "OpenAIServiceError",
+    "active_openai_batch",
+    "openai_batch_run",
+]
@@ -0,0 +1,154 @@
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+from src.serialization import dumps, dumps_bytes, loads
+from src.storage import LocalJsonCache
+from src.telemetry import count_metric, record_openai_usage
+
+DEFAULT_OPENAI_BATCH_DIR = Path(".openai-batch")
+OPENAI_BATCH_INPUT_DIR = "input"
+OPENAI_BATCH_RESULTS_DIR = "results"
+# Azure OpenAI Batch accepts up to 100k requests per file; stay well under it.
+MAX_BATCH_REQUESTS_PER_FILE = 50000
+
+
+class OpenAIBatchPending(Exception):
+    """Raised instead of a response when a request was queued for the next batch file.
+
+    Deliberately not a `ValueError`, so callers that fall back on service errors do not
+    mistake a deferred request for a failed one.
+    """
+
+
+class OpenAIBatch:
+    """Two-phase Azure OpenAI Batch store rooted at `root`.
+
+    Requests are identified by a `custom_id` hashed from their path and body. Responses are
+    served from every `*.jsonl` under `results/` (the Batch output format). Unanswered
+    requests are queued and written as Batch input JSONL under `input/`, one file per
+    deployment, when `write_input` is called at the end of a pass.
+    """
+
+    def __init__(self, root: str | Path = DEFAULT_OPENAI_BATCH_DIR) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._results = self._load_results(self.root / OPENAI_BATCH_RESULTS_DIR)
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._served = 0
+        self._input_files: list[str] = []
+
+    @staticmethod
+    def request_id(path: str, payload: dict[str, Any]) -> str:
+        return LocalJsonCache.make_key("openai-batch", path, dumps_bytes(payload, sort_keys=True))
+
+    @staticmethod
+    def _load_results(directory: Path) -> dict[str, dict[str, Any]]:
+        results: dict[str, dict[str, Any]] = {}
+        for path in sorted(directory.glob("*.jsonl")):
+            for line in path.read_text(encoding="utf-8").splitlines():
+                if not line.strip():
+                    continue
+                entry = loads(line)
+                custom_id = entry.get("custom_id") if isinstance(entry, dict) else None
+                if custom_id:
+                    results[str(custom_id)] = entry
+        return results
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def resolve(self, *, path: str, payload: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+        """Returns the recorded `(status_code, body)` or queues the request and raises."""
+        custom_id = self.request_id(path, payload)
+        entry = self._results.get(custom_id)
+        if entry is None:
+            with self._lock:
+                self._pending.setdefault(
+                    custom_id,
+                    {"custom_id": custom_id, "method": "POST", "url": f"/v1{path}", "body": payload},
+                )
+            count_metric("openai_batch_requests_total", result="pending")
+            raise OpenAIBatchPending(f"Azure OpenAI {path} request {custom_id[:12]} queued for batch.")
+
+        response = entry.get("response") or {}
+        status_code = response.get("status_code")
+        body = response.get("body")
+        error = entry.get("error")
+        if error or not isinstance(body, dict) or int(status_code or 200) >= 400:
+            count_metric("openai_batch_requests_total", result="error")
+            return int(status_code or 500), {"error": error or body}
+        with self._lock:
+            self._served += 1
+        count_metric("openai_batch_requests_total", result="served")
+        record_openai_usage(payload.get("model"), body.get("usage"))
+        return int(status_code or 200), body
+
+    def write_input(self) -> list[str]:
+        """Writes queued requests as Batch input JSONL, one file per deployment."""
+        with self._lock:
+            pending = list(self._pending.values())
+        if not pending:
+            return []
+        directory = self.root / OPENAI_BATCH_INPUT_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        sequence = 1 + max(
+            (
+                int(path.name.split("-")[1])
+                for path in directory.glob("batch-*.jsonl")
+                if path.name.split("-")[1].isdigit()
+            ),
+            default=0,
+        )
+        by_deployment: dict[str, list[dict[str, Any]]] = {}
+        for request in pending:
+            by_deployment.setdefault(str(request["body"].get("model") or "default"), []).append(request)
+
+        written: list[str] = []
+        for deployment, requests in sorted(by_deployment.items()):
+            for part, start in enumerate(range(0, len(requests), MAX_BATCH_REQUESTS_PER_FILE), start=1):
+                path = directory / f"batch-{sequence:04d}-{deployment}-{part:02d}.jsonl"
+                path.write_text(
+                    "".join(
+                        f"{dumps(request)}\n"
+                        for request in requests[start:start + MAX_BATCH_REQUESTS_PER_FILE]
+                    ),
+                    encoding="utf-8",
+                )
+                written.append(str(path))
+        with self._lock:
+            self._input_files.extend(written)
+        return written
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "root": str(self.root),
+                "results": len(self._results),
+                "served": self._served,
+                "pending": len(self._pending),
+                "input_files": list(self._input_files),
+            }
+
+
+_active_batch: OpenAIBatch | None = None
+
+
+def active_openai_batch() -> OpenAIBatch | None:
+    return _active_batch
+
+
+@contextmanager
+def openai_batch_run(root: str | Path = DEFAULT_OPENAI_BATCH_DIR) -> Iterator[OpenAIBatch]:
+    """Routes OpenAI requests through a batch store for the duration of the block."""
+    global _active_batch
+    previous = _active_batch
+    batch = OpenAIBatch(root)
+    _active_batch = batch
+    try:
+        yield batch
+    finally:
+        _active_batch = previous
@@ -5,6 +5,11 @@ from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
 from src.conf.conf import get_config
+from src.serialization import dumps, dumps_bytes, loads
+from src.storage import through_cassette
+from src.telemetry import count_metric, record_openai_usage, span
+
+from .batch import active_openai_batch
 
 DEFAULT_AZURE_OPENAI_API_VERSION = "v1"
 DeploymentPurpose = Literal["chat", "interpret", "verbalization", "embedding"]
@@ -82,22 +87,41 @@ class OpenAIService:
         if not self.api_key:
             raise ValueError("Azure OpenAI API key is not configured.")
 
+        batch = active_openai_batch()
+        if batch is not None:
+            status_code, response = batch.resolve(path=path, payload=payload)
+            if status_code >= 400:
+                raise OpenAIServiceError(
+                    path=path, status_code=status_code, detail=dumps(response)
+                )
+            return response
+
+        return through_cassette(
+            "openai", (path, payload), lambda: self._send_request(path=path, payload=payload)
+        )
+
+    def _send_request(self, *, path: str, payload: dict) -> dict:
         url = f"{self.base_url}{path}"
-        data = json.dumps(payload).encode("utf-8")
+        data = dumps_bytes(payload)
         req = Request(url, data=data, method="POST")
         req.add_header("api-key", self.api_key)
         req.add_header("Content-Type", "application/json")
 
         try:
-            with urlopen(req, timeout=300) as resp:
+            with span("openai.request", path=path), urlopen(req, timeout=300) as resp:
                 raw = resp.read()
-                return json.loads(raw.decode("utf-8")) if raw else {}
         except HTTPError as exc:
+            count_metric("remote_errors_total", backend="openai", status=exc.code)
             detail = exc.read().decode("utf-8", errors="replace")
             raise OpenAIServiceError(path=path, status_code=exc.code, detail=detail) from exc
         except URLError as exc:
+            count_metric("remote_errors_total", backend="openai", status="network")
             raise OpenAIServiceError(path=path, status_code=None, detail=str(exc)) from exc
 
+        response = loads(raw) if raw else {}
+        record_openai_usage(payload.get("model"), response.get("usage"))
+        return response
+
     @staticmethod
     def _extract_response_text(payload: dict) -> str:
         output_text = payload.get("output_text")
@@ -118,18 +142,18 @@ class OpenAIService:
             normalized = normalized.removeprefix("```json").removeprefix("```").removesuffix("```").strip()
 
         try:
-            return json.loads(normalized)
+            return loads(normalized)
         except json.JSONDecodeError:
             start = normalized.find("{")
             end = normalized.rfind("}")
             if start != -1 and end != -1 and end >= start:
-                return json.loads(normalized[start:end + 1])
+                return loads(normalized[start:end + 1])
 
             start = normalized.find("[")
             end = normalized.rfind("]")
             if start == -1 or end == -1 or end < start:
                 raise ValueError("Azure OpenAI response did not contain valid JSON.")
-            return json.loads(normalized[start:end + 1])
+            return loads(normalized[start:end + 1])
 
     @classmethod
     def _parse_json_response_text(cls, text: str) -> dict:
@@ -1,3 +1,12 @@
+from .cpu_pool import CpuStagePool
+from .dedup import DEDUP_SCOPES, ChunkDeduplicator, DedupScope
+from .image_preprocess import (
+    IMAGE_FORMATS,
+    ImageFormat,
+    ImagePreprocessOptions,
+    preprocess_image,
+    preprocessing_available,
+)
 from .index_schema import (
     DEFAULT_CHUNK_CONTAINER,
     DEFAULT_DATASOURCE_NAME,
@@ -8,6 +17,8 @@ from .index_schema import (
     VECTOR_PROFILE_NAME,
     build_shared_index,
 )
+from .remote_pool import RemoteCallPool
+from .search_rest import DEFAULT_SEARCH_GZIP_LEVEL, encode_search_body
 from .text_processing import (
     chunk_markdown_deterministic,
     chunk_text_deterministic,
@@ -15,15 +26,27 @@ from .text_processing import (
 )
 
 __all__ = [
+    "ChunkDeduplicator",
+    "CpuStagePool",
+    "DEDUP_SCOPES",
+    "DedupScope",
     "DEFAULT_CHUNK_CONTAINER",
     "DEFAULT_DATASOURCE_NAME",
     "DEFAULT_INDEXER_NAME",
     "DEFAULT_TARGET_INDEX_NAME",
     "DEFAULT_SKILLSET_NAME",
+    "DEFAULT_SEARCH_GZIP_LEVEL",
+    "IMAGE_FORMATS",
+    "ImageFormat",
+    "ImagePreprocessOptions",
+    "RemoteCallPool",
     "VECTOR_ALGORITHM_NAME",
     "VECTOR_PROFILE_NAME",
     "build_shared_index",
     "chunk_markdown_deterministic",
     "chunk_text_deterministic",
+    "encode_search_body",
+    "preprocess_image",
+    "preprocessing_available",
     "strip_figure_blocks_from_markdown",
 ]
@@ -0,0 +1,45 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable
+
+
+class CpuStagePool:
+    """Optional process pool for pure CPU stages such as chunking and HTML rendering.
+
+    `max_workers=0` runs submitted work inline on the calling thread. Submitted callables
+    and arguments must be picklable, so pass module-level functions and plain data such as
+    the `as_dict()` analyze result rather than SDK objects.
+    """
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        self.max_workers = int(max_workers or 0)
+        if self.max_workers < 0:
+            raise ValueError("max_workers must be zero or positive.")
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        if not self.enabled:
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> "CpuStagePool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,147 @@
+import hashlib
+import re
+from typing import Any, Literal
+
+DedupScope = Literal["off", "source", "corpus"]
+DEDUP_SCOPES: tuple[str, ...] = ("off", "source", "corpus")
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+DEFAULT_MAX_HAMMING_DISTANCE = 3
+DEFAULT_MIN_NEAR_DUPLICATE_TOKENS = 8
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_PATTERN.findall((text or "").lower())
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def simhash64(text: str, *, shingle_size: int = 3) -> int:
+    tokens = _tokens(text)
+    if not tokens:
+        return 0
+    size = max(1, min(shingle_size, len(tokens)))
+    weights = [0] * SIMHASH_BITS
+    for start in range(len(tokens) - size + 1):
+        value = _feature_hash(" ".join(tokens[start : start + size]))
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if (value >> bit) & 1 else -1
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(left: int, right: int) -> int:
+    return (left ^ right).bit_count()
+
+
+class ChunkDeduplicator:
+    """Collapses exact and SimHash near-duplicate text chunks before they are embedded.
+
+    Fingerprints are bucketed by 16-bit bands, so any pair within `max_distance <= 3`
+    bits shares at least one band and is found without a full scan.
+    """
+
+    def __init__(
+        self,
+        scope: str = "off",
+        *,
+        max_distance: int = DEFAULT_MAX_HAMMING_DISTANCE,
+        min_tokens: int = DEFAULT_MIN_NEAR_DUPLICATE_TOKENS,
+    ) -> None:
+        if scope not in DEDUP_SCOPES:
+            raise ValueError(
+                f"Unsupported dedup scope '{scope}'. Expected one of: {', '.join(DEDUP_SCOPES)}."
+            )
+        self.scope = scope
+        self.max_distance = max(0, min(int(max_distance), SIMHASH_BANDS - 1))
+        self.min_tokens = max(1, int(min_tokens))
+        self._checked = 0
+        self._duplicates: list[dict[str, Any]] = []
+        self._reset_index()
+
+    @property
+    def enabled(self) -> bool:
+        return self.scope != "off"
+
+    def _reset_index(self) -> None:
+        self._exact: dict[str, str] = {}
+        self._fingerprints: dict[str, int] = {}
+        self._bands: list[dict[int, list[str]]] = [{} for _ in range(SIMHASH_BANDS)]
+
+    def start_source(self, source_name: str) -> None:
+        if self.scope == "source":
+            self._reset_index()
+
+    @staticmethod
+    def _band_keys(fingerprint: int) -> list[int]:
+        return [
+            (fingerprint >> (band * _BAND_BITS)) & _BAND_MASK
+            for band in range(SIMHASH_BANDS)
+        ]
+
+    def _near_match(self, fingerprint: int) -> tuple[str, int] | None:
+        best: tuple[str, int] | None = None
+        seen: set[str] = set()
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            for record_id in self._bands[band].get(key, []):
+                if record_id in seen:
+                    continue
+                seen.add(record_id)
+                distance = hamming_distance(fingerprint, self._fingerprints[record_id])
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (record_id, distance)
+        return best
+
+    def canonical_for(self, record_id: str, text: str) -> str | None:
+        """Returns the canonical record id when `text` duplicates an earlier chunk, else registers it."""
+        if not self.enabled:
+            return None
+        self._checked += 1
+        tokens = _tokens(text)
+        exact_key = hashlib.sha1(" ".join(tokens).encode("utf-8")).hexdigest()
+        canonical_id = self._exact.get(exact_key)
+        if canonical_id is not None:
+            self._duplicates.append(
+                {"id": record_id, "canonical_id": canonical_id, "match": "exact", "distance": 0}
+            )
+            return canonical_id
+
+        fingerprint = simhash64(text) if len(tokens) >= self.min_tokens else None
+        if fingerprint is not None:
+            near = self._near_match(fingerprint)
+            if near is not None:
+                self._duplicates.append(
+                    {"id": record_id, "canonical_id": near[0], "match": "near", "distance": near[1]}
+                )
+                return near[0]
+
+        self._exact[exact_key] = record_id
+        if fingerprint is not None:
+            self._fingerprints[record_id] = fingerprint
+            for band, key in enumerate(self._band_keys(fingerprint)):
+                self._bands[band].setdefault(key, []).append(record_id)
+        return None
+
+    def stats(self) -> dict[str, Any]:
+        exact = sum(1 for item in self._duplicates if item["match"] == "exact")
+        return {
+            "scope": self.scope,
+            "max_hamming_distance": self.max_distance,
+            "checked_chunks": self._checked,
+            "skipped_chunks": len(self._duplicates),
+            "exact_duplicates": exact,
+            "near_duplicates": len(self._duplicates) - exact,
+            "duplicates": list(self._duplicates),
+        }
@@ -0,0 +1,92 @@
+import io
+from dataclasses import dataclass
+from typing import Literal
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - Pillow is optional
+    Image = None
+
+ImageFormat = Literal["png", "jpeg", "webp"]
+IMAGE_FORMATS: tuple[str, ...] = ("png", "jpeg", "webp")
+IMAGE_MIME_TYPES: dict[str, str] = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+}
+
+
+@dataclass(frozen=True)
+class ImagePreprocessOptions:
+    """How figure images are reduced before they are sent to a multimodal model.
+
+    `max_edge=0` keeps the original dimensions. `quality` applies to JPEG and WebP.
+    """
+
+    max_edge: int = 0
+    image_format: ImageFormat = "png"
+    quality: int = 85
+    grayscale: bool = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_edge > 0 or self.image_format != "png" or self.grayscale
+
+    def __post_init__(self) -> None:
+        if self.image_format not in IMAGE_FORMATS:
+            raise ValueError(
+                f"Unsupported image format '{self.image_format}'. Expected one of: {', '.join(IMAGE_FORMATS)}."
+            )
+        if self.max_edge < 0:
+            raise ValueError("max_edge must be zero or positive.")
+        if not 1 <= self.quality <= 100:
+            raise ValueError("quality must be between 1 and 100.")
+
+
+def preprocessing_available() -> bool:
+    return Image is not None
+
+
+def preprocess_image(
+    data: bytes, options: ImagePreprocessOptions, *, content_type: str = "image/png"
+) -> tuple[bytes, str]:
+    """Downscale and re-encode an image, returning `(bytes, content_type)`.
+
+    The original is returned unchanged when preprocessing is disabled, Pillow is not
+    installed, the image cannot be decoded, or a re-encode at the original size would
+    not make it smaller. Downscaled images are always kept, since image tokens follow
+    pixel dimensions rather than bytes.
+    """
+    if not options.enabled or Image is None:
+        return data, content_type
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            image = source.copy()
+    except (OSError, ValueError):
+        return data, content_type
+
+    original_size = image.size
+    if options.max_edge and max(image.size) > options.max_edge:
+        image.thumbnail((options.max_edge, options.max_edge), Image.Resampling.LANCZOS)
+
+    if options.grayscale:
+        image = image.convert("LA" if "A" in image.getbands() else "L")
+
+    if options.image_format == "jpeg" and image.mode not in ("RGB", "L"):
+        # JPEG has no alpha channel; flatten onto white so transparent chart areas stay light.
+        rgba = image.convert("RGBA")
+        flattened = Image.new("RGB", image.size, "white")
+        flattened.paste(rgba, mask=rgba.getchannel("A"))
+        image = flattened.convert("L") if options.grayscale else flattened
+
+    buffer = io.BytesIO()
+    if options.image_format == "png":
+        image.save(buffer, format="PNG", optimize=True)
+    elif options.image_format == "jpeg":
+        image.save(buffer, format="JPEG", quality=options.quality, optimize=True)
+    else:
+        image.save(buffer, format="WEBP", quality=options.quality, method=4)
+    encoded = buffer.getvalue()
+    if image.size == original_size and len(encoded) >= len(data):
+        return data, content_type
+    return encoded, IMAGE_MIME_TYPES[options.image_format]
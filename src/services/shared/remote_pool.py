@@ -0,0 +1,68 @@
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class RemoteCallPool:
+    """Optional thread pool for I/O-bound remote calls, capped per backend.
+
+    `max_workers=0` runs submitted work inline on the calling thread. `limits` bounds the
+    calls in flight per backend name; unlisted backends are bounded only by `max_workers`.
+    Each call runs in a copy of the submitting context, so spans and usage attribution
+    still nest under the caller. Work running in the pool must not wait on other futures
+    from the same pool.
+    """
+
+    def __init__(self, max_workers: int | None = None, limits: dict[str, int] | None = None) -> None:
+        self.max_workers = int(max_workers or 0)
+        if self.max_workers < 0:
+            raise ValueError("max_workers must be zero or positive.")
+        self._limits = {
+            backend: threading.BoundedSemaphore(max(1, int(limit)))
+            for backend, limit in (limits or {}).items()
+        }
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def _call(
+        self, backend: str, fn: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> Any:
+        limit = self._limits.get(backend)
+        if limit is None:
+            return fn(*args, **kwargs)
+        with limit:
+            return fn(*args, **kwargs)
+
+    def submit(self, backend: str, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        if not self.enabled:
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="remote-call"
+                )
+        context = contextvars.copy_context()
+        return self._executor.submit(context.run, self._call, backend, fn, args, kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "RemoteCallPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
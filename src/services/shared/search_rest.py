@@ -0,0 +1,28 @@
+import gzip
+from typing import Any
+
+from src.serialization import dumps_bytes
+
+DEFAULT_SEARCH_GZIP_LEVEL = 5
+
+
+def encode_search_body(
+    body: dict[str, Any] | None,
+    *,
+    gzip_min_bytes: int | None = None,
+    gzip_level: int = DEFAULT_SEARCH_GZIP_LEVEL,
+) -> tuple[bytes | None, dict[str, str]]:
+    """Encodes a Search REST body, gzip-compressing it once it reaches `gzip_min_bytes`.
+
+    Returns the request data and the headers to send with it. Compression is off when
+    `gzip_min_bytes` is None or not positive.
+    """
+    headers = {"Content-Type": "application/json"}
+    if body is None:
+        return None, headers
+
+    data = dumps_bytes(body)
+    if gzip_min_bytes is not None and gzip_min_bytes > 0 and len(data) >= gzip_min_bytes:
+        data = gzip.compress(data, compresslevel=gzip_level, mtime=0)
+        headers["Content-Encoding"] = "gzip"
+    return data, headers
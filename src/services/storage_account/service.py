@@ -1,12 +1,14 @@
-import json
 import time
-from typing import Any
+from typing import Any, Iterable
 
 from azure.storage.blob import BlobServiceClient, ContentSettings
 from azure.core.credentials import TokenCredential
 from azure.core.exceptions import HttpResponseError, ResourceNotFoundError, ResourceExistsError
 
 from src.auth.iam import IAM
+from src.serialization import dumps_bytes
+from src.storage import decode_bytes, encode_bytes, through_cassette
+from src.telemetry import span
 
 
 class AzureStorageAccountService:
@@ -51,6 +53,13 @@ class AzureStorageAccountService:
             raise
 
     def ensure_container(self, container_name: str) -> None:
+        through_cassette(
+            "blob",
+            ("ensure_container", container_name),
+            lambda: self._ensure_container(container_name),
+        )
+
+    def _ensure_container(self, container_name: str) -> None:
         container_client = self.client.get_container_client(container_name)
         deadline = time.time() + 60
         while time.time() < deadline:
@@ -72,6 +81,13 @@ class AzureStorageAccountService:
         raise TimeoutError(f"Timed out ensuring container exists: {container_name}")
 
     def delete_container_if_exists(self, container_name: str) -> None:
+        through_cassette(
+            "blob",
+            ("delete_container", container_name),
+            lambda: self._delete_container_if_exists(container_name),
+        )
+
+    def _delete_container_if_exists(self, container_name: str) -> None:
         container_client = self.client.get_container_client(container_name)
         try:
             container_client.delete_container()
@@ -99,13 +115,18 @@ class AzureStorageAccountService:
         content_type: str | None = None,
         overwrite: bool = True,
     ) -> str:
-        self.ensure_container(container_name)
-        blob_client = self.client.get_blob_client(container=container_name, blob=blob_name)
-        kwargs: dict[str, Any] = {"overwrite": overwrite}
-        if content_type:
-            kwargs["content_settings"] = ContentSettings(content_type=content_type)
-        blob_client.upload_blob(data, **kwargs)
-        return blob_client.url
+        def upload() -> str:
+            self.ensure_container(container_name)
+            blob_client = self.client.get_blob_client(container=container_name, blob=blob_name)
+            kwargs: dict[str, Any] = {"overwrite": overwrite}
+            if content_type:
+                kwargs["content_settings"] = ContentSettings(content_type=content_type)
+            with span("blob.write", container=container_name, blob=blob_name):
+                blob_client.upload_blob(data, **kwargs)
+            return blob_client.url
+
+        # Writes are keyed by target only; replay returns the recorded URL without uploading.
+        return through_cassette("blob", ("upload", container_name, blob_name), upload)
 
     def upload_text(
         self,
@@ -131,7 +152,7 @@ class AzureStorageAccountService:
         payload: Any,
         overwrite: bool = True,
     ) -> str:
-        data = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+        data = dumps_bytes(payload, indent=True)
         return self.upload_bytes(
             container_name=container_name,
             blob_name=blob_name,
@@ -140,23 +161,60 @@ class AzureStorageAccountService:
             overwrite=overwrite,
         )
 
+    def upload_stream(
+        self,
+        *,
+        container_name: str,
+        blob_name: str,
+        chunks: Iterable[bytes],
+        content_type: str | None = None,
+        overwrite: bool = True,
+    ) -> str:
+        def upload() -> str:
+            self.ensure_container(container_name)
+            blob_client = self.client.get_blob_client(container=container_name, blob=blob_name)
+            kwargs: dict[str, Any] = {"overwrite": overwrite}
+            if content_type:
+                kwargs["content_settings"] = ContentSettings(content_type=content_type)
+            # An iterable body is uploaded as staged blocks without materializing the whole blob.
+            with span("blob.write", container=container_name, blob=blob_name):
+                blob_client.upload_blob(chunks, **kwargs)
+            return blob_client.url
+
+        return through_cassette("blob", ("upload", container_name, blob_name), upload)
+
     def download_bytes(self, *, container_name: str, blob_name: str) -> bytes:
-        blob_client = self.client.get_blob_client(container=container_name, blob=blob_name)
-        stream = blob_client.download_blob()
-        return stream.readall()
+        def download() -> bytes:
+            blob_client = self.client.get_blob_client(container=container_name, blob=blob_name)
+            stream = blob_client.download_blob()
+            return stream.readall()
+
+        return through_cassette(
+            "blob",
+            ("download", container_name, blob_name),
+            download,
+            encode=encode_bytes,
+            decode=decode_bytes,
+        )
 
     def blob_exists(self, *, container_name: str, blob_name: str) -> bool:
-        blob_client = self.client.get_blob_client(container=container_name, blob=blob_name)
+        def exists() -> bool:
+            blob_client = self.client.get_blob_client(container=container_name, blob=blob_name)
 
-        try:
-            return blob_client.exists()
-        except (ResourceNotFoundError, HttpResponseError):
-            return False
+            try:
+                return blob_client.exists()
+            except (ResourceNotFoundError, HttpResponseError):
+                return False
+
+        return through_cassette("blob", ("exists", container_name, blob_name), exists)
 
     def list_blobs(self, *, container_name: str, prefix: str | None = None) -> list[str]:
-        container_client = self.client.get_container_client(container_name)
-        blobs = container_client.list_blobs(name_starts_with=prefix)
-        return [blob.name for blob in blobs]
+        def list_names() -> list[str]:
+            container_client = self.client.get_container_client(container_name)
+            blobs = container_client.list_blobs(name_starts_with=prefix)
+            return [blob.name for blob in blobs]
+
+        return through_cassette("blob", ("list", container_name, prefix or ""), list_names)
 
     def get_blob_url(self, *, container_name: str, blob_name: str) -> str:
         blob_client = self.client.get_blob_client(container=container_name, blob=blob_name)
@@ -1,3 +1,67 @@
+from .cache import LocalJsonCache
+from .cassette import (
+    CASSETTE_MODES,
+    DEFAULT_CASSETTE_DIR,
+    Cassette,
+    CassetteMissError,
+    CassetteMode,
+    active_cassette,
+    cassette_run,
+    decode_bytes,
+    encode_bytes,
+    through_cassette,
+)
+from .output_format import (
+    OUTPUT_FORMATS,
+    OUTPUT_VECTOR_MODES,
+    OutputFormat,
+    OutputVectors,
+    compact_payload,
+    encode_output,
+    output_content_type,
+    output_path_for_format,
+)
 from .output_store import LocalOutputStore
+from .vector_sidecar import (
+    ARTIFACT_VECTOR_MODES,
+    NPY_CONTENT_TYPE,
+    ArtifactVectors,
+    attach_vectors,
+    encode_npy,
+    load_npy,
+    sidecar_descriptor,
+    sidecar_name,
+    split_vectors,
+)
 
-__all__ = ["LocalOutputStore"]
+__all__ = [
+    "ARTIFACT_VECTOR_MODES",
+    "ArtifactVectors",
+    "CASSETTE_MODES",
+    "Cassette",
+    "CassetteMissError",
+    "CassetteMode",
+    "DEFAULT_CASSETTE_DIR",
+    "LocalJsonCache",
+    "LocalOutputStore",
+    "NPY_CONTENT_TYPE",
+    "OUTPUT_FORMATS",
+    "OUTPUT_VECTOR_MODES",
+    "OutputFormat",
+    "OutputVectors",
+    "active_cassette",
+    "attach_vectors",
+    "cassette_run",
+    "compact_payload",
+    "decode_bytes",
+    "encode_bytes",
+    "encode_npy",
+    "encode_output",
+    "load_npy",
+    "output_content_type",
+    "output_path_for_format",
+    "sidecar_descriptor",
+    "sidecar_name",
+    "split_vectors",
+    "through_cassette",
+]
@@ -0,0 +1,77 @@
+import contextlib
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from src.serialization import dumps_bytes, loads
+from src.telemetry import count_metric
+
+DEFAULT_CACHE_DIR = Path(".cache")
+
+
+class LocalJsonCache:
+    """File-system JSON cache with one file per key under `<root>/<namespace>/`.
+
+    Hits refresh the entry's mtime, so `prune` evicts the least recently used entries.
+    """
+
+    def __init__(self, namespace: str, root: str | Path = DEFAULT_CACHE_DIR) -> None:
+        self.namespace = namespace
+        self.directory = Path(root) / namespace
+
+    @staticmethod
+    def make_key(*parts: str | bytes) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part if isinstance(part, bytes) else part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Any | None:
+        path = self._path(key)
+        try:
+            value = loads(path.read_bytes())
+        except FileNotFoundError:
+            count_metric("cache_requests_total", namespace=self.namespace, result="miss")
+            return None
+        except ValueError:
+            path.unlink(missing_ok=True)
+            count_metric("cache_requests_total", namespace=self.namespace, result="miss")
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        count_metric("cache_requests_total", namespace=self.namespace, result="hit")
+        return value
+
+    def set(self, key: str, value: Any) -> str:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(dumps_bytes(value))
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return str(path)
+
+    def prune(self, max_entries: int) -> int:
+        """Deletes the least recently used entries beyond `max_entries` and returns the count."""
+        entries: list[tuple[float, Path]] = []
+        for path in self.directory.glob("*.json"):
+            with contextlib.suppress(FileNotFoundError):
+                entries.append((path.stat().st_mtime, path))
+        excess = len(entries) - max(max_entries, 0)
+        if excess <= 0:
+            return 0
+        entries.sort(key=lambda entry: entry[0])
+        for _, path in entries[:excess]:
+            path.unlink(missing_ok=True)
+        count_metric("cache_evictions_total", excess, namespace=self.namespace)
+        return excess
@@ -0,0 +1,163 @@
+import base64
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Literal, TypeVar
+
+from src.serialization import dumps_bytes
+
+from .cache import LocalJsonCache
+
+CassetteMode = Literal["record", "replay", "reuse"]
+CASSETTE_MODES: tuple[str, ...] = ("record", "replay", "reuse")
+DEFAULT_CASSETTE_DIR = Path(".cassettes")
+CASSETTE_NAMESPACE_PREFIX = "cassette"
+
+T = TypeVar("T")
+
+
+class CassetteMissError(ValueError):
+    """Raised in replay mode when a request was never recorded."""
+
+    def __init__(self, *, service: str, key: str) -> None:
+        self.service = service
+        self.key = key
+        super().__init__(
+            f"No recorded {service} response for request {key[:12]}; re-run with --cassette record."
+        )
+
+
+def encode_bytes(value: bytes) -> str:
+    return base64.b64encode(value).decode("ascii")
+
+
+def decode_bytes(value: str) -> bytes:
+    return base64.b64decode(value)
+
+
+def _key_part(part: Any) -> str | bytes:
+    if isinstance(part, bytes):
+        return part
+    if isinstance(part, str):
+        return part
+    return dumps_bytes(part, sort_keys=True)
+
+
+class Cassette:
+    """Records remote responses keyed by request hash, or serves them back without network.
+
+    Each service gets its own `LocalJsonCache` namespace under `root`. Entries are wrapped in
+    an envelope so recorded `None` results replay as `None` rather than as misses. `reuse`
+    replays recorded responses and records the rest. `services` limits the cassette to the
+    named services; other calls go straight to the network.
+    """
+
+    def __init__(
+        self,
+        mode: CassetteMode,
+        root: str | Path = DEFAULT_CASSETTE_DIR,
+        services: tuple[str, ...] | None = None,
+    ) -> None:
+        if mode not in CASSETTE_MODES:
+            raise ValueError(
+                f"Unsupported cassette mode '{mode}'. Expected one of: {', '.join(CASSETTE_MODES)}."
+            )
+        self.mode = mode
+        self.root = Path(root)
+        self.services = services
+        self._lock = threading.Lock()
+        self._stores: dict[str, LocalJsonCache] = {}
+        self._counts: dict[str, int] = {}
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @staticmethod
+    def request_key(*parts: Any) -> str:
+        return LocalJsonCache.make_key(*(_key_part(part) for part in parts))
+
+    def _store(self, service: str) -> LocalJsonCache:
+        with self._lock:
+            store = self._stores.get(service)
+            if store is None:
+                store = LocalJsonCache(f"{CASSETTE_NAMESPACE_PREFIX}-{service}", root=self.root)
+                self._stores[service] = store
+            return store
+
+    def _count(self, service: str) -> None:
+        with self._lock:
+            self._counts[service] = self._counts.get(service, 0) + 1
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            return {"mode": self.mode, "root": str(self.root), "calls": dict(self._counts)}
+
+    def call(
+        self,
+        service: str,
+        parts: tuple[Any, ...] | Callable[[], tuple[Any, ...]],
+        fetch: Callable[[], T],
+        *,
+        encode: Callable[[T], Any] | None = None,
+        decode: Callable[[Any], T] | None = None,
+    ) -> T:
+        if self.services is not None and service not in self.services:
+            return fetch()
+        key = self.request_key(service, *(parts() if callable(parts) else parts))
+        store = self._store(service)
+        if self.mode != "record":
+            envelope = store.get(key)
+            if isinstance(envelope, dict) and "response" in envelope:
+                self._count(service)
+                response = envelope["response"]
+                return decode(response) if decode is not None else response
+            if self.replaying:
+                raise CassetteMissError(service=service, key=key)
+
+        value = fetch()
+        store.set(key, {"response": encode(value) if encode is not None else value})
+        self._count(service)
+        return value
+
+
+_active_cassette: Cassette | None = None
+
+
+def active_cassette() -> Cassette | None:
+    return _active_cassette
+
+
+@contextmanager
+def cassette_run(
+    mode: CassetteMode,
+    root: str | Path = DEFAULT_CASSETTE_DIR,
+    services: tuple[str, ...] | None = None,
+) -> Iterator[Cassette]:
+    global _active_cassette
+    previous = _active_cassette
+    cassette = Cassette(mode, root, services)
+    _active_cassette = cassette
+    try:
+        yield cassette
+    finally:
+        _active_cassette = previous
+
+
+def through_cassette(
+    service: str,
+    parts: tuple[Any, ...] | Callable[[], tuple[Any, ...]],
+    fetch: Callable[[], T],
+    *,
+    encode: Callable[[T], Any] | None = None,
+    decode: Callable[[Any], T] | None = None,
+) -> T:
+    """Calls `fetch`, recording or replaying its result when a cassette run is active.
+
+    `parts` may be a callable for keys that are costly to build (e.g. a digest of the input);
+    it is only called when an active cassette handles `service`.
+    """
+    cassette = _active_cassette
+    if cassette is None:
+        return fetch()
+    return cassette.call(service, parts, fetch, encode=encode, decode=decode)
@@ -0,0 +1,111 @@
+import zlib
+from typing import Any, Iterable, Iterator, Literal
+
+from src.serialization import dumps_bytes
+
+OutputVectors = Literal["full", "none", "ref"]
+OutputFormat = Literal["json", "ndjson", "ndjson.gz"]
+OUTPUT_VECTOR_MODES: tuple[str, ...] = ("full", "none", "ref")
+OUTPUT_FORMATS: tuple[str, ...] = ("json", "ndjson", "ndjson.gz")
+
+VECTOR_FIELD_NAME = "contentVector"
+RECORD_LIST_KEYS = ("records", "chunks", "images")
+
+
+def _target_index(payload: dict[str, Any]) -> str | None:
+    objects = payload.get("objects")
+    if isinstance(objects, dict) and objects.get("index"):
+        return str(objects["index"])
+    target_index = payload.get("target_index")
+    return str(target_index) if target_index else None
+
+
+def _compact_record(
+    record: Any, *, output_vectors: OutputVectors, target_index: str | None
+) -> Any:
+    if output_vectors == "full" or not isinstance(record, dict) or VECTOR_FIELD_NAME not in record:
+        return record
+    compacted = {key: value for key, value in record.items() if key != VECTOR_FIELD_NAME}
+    if output_vectors == "ref":
+        compacted[VECTOR_FIELD_NAME] = {
+            "$ref": {
+                "index": target_index,
+                "key": record.get("id"),
+                "field": VECTOR_FIELD_NAME,
+            }
+        }
+    return compacted
+
+
+def compact_payload(payload: Any, output_vectors: OutputVectors = "full") -> Any:
+    """Drops record vectors (`none`) or replaces them with a pointer into the target index (`ref`)."""
+    if output_vectors == "full" or not isinstance(payload, dict):
+        return payload
+    target_index = _target_index(payload)
+    compacted = dict(payload)
+    for key in RECORD_LIST_KEYS:
+        records = payload.get(key)
+        if isinstance(records, list):
+            compacted[key] = [
+                _compact_record(record, output_vectors=output_vectors, target_index=target_index)
+                for record in records
+            ]
+    return compacted
+
+
+def iter_ndjson_lines(payload: Any, output_vectors: OutputVectors = "full") -> Iterator[bytes]:
+    """Yields a summary line followed by one line per record, compacting records as they are written.
+
+    The summary carries every top-level field except the record lists, which are replaced
+    by the `record_count`; `chunks`/`images` are views over `records` and are not repeated.
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get("records"), list):
+        yield dumps_bytes(compact_payload(payload, output_vectors)) + b"\n"
+        return
+
+    records = payload["records"]
+    target_index = _target_index(payload)
+    summary = {key: value for key, value in payload.items() if key not in RECORD_LIST_KEYS}
+    summary["record_count"] = len(records)
+    summary["output_vectors"] = output_vectors
+    yield dumps_bytes(summary) + b"\n"
+    for record in records:
+        compacted = _compact_record(record, output_vectors=output_vectors, target_index=target_index)
+        yield dumps_bytes(compacted) + b"\n"
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def encode_output(
+    payload: Any,
+    *,
+    output_format: OutputFormat = "json",
+    output_vectors: OutputVectors = "full",
+) -> Iterator[bytes]:
+    if output_format == "json":
+        yield dumps_bytes(compact_payload(payload, output_vectors), indent=True)
+        return
+    lines = iter_ndjson_lines(payload, output_vectors)
+    yield from gzip_chunks(lines) if output_format == "ndjson.gz" else lines
+
+
+def output_content_type(output_format: OutputFormat) -> str:
+    if output_format == "ndjson":
+        return "application/x-ndjson; charset=utf-8"
+    if output_format == "ndjson.gz":
+        return "application/gzip"
+    return "application/json; charset=utf-8"
+
+
+def output_path_for_format(path: str, output_format: OutputFormat) -> str:
+    if output_format == "json" or path.endswith(f".{output_format}"):
+        return path
+    stem = path[: -len(".json")] if path.endswith(".json") else path
+    return f"{stem}.{output_format}"
@@ -1,6 +1,7 @@
-import json
 from pathlib import Path
-from typing import Any, Protocol
+from typing import Any, Iterable, Protocol
+
+from src.serialization import dumps_bytes
 
 
 class OutputStore(Protocol):
@@ -19,4 +20,12 @@ class LocalOutputStore:
             path.write_text(payload, encoding="utf-8")
             return
 
-        path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        path.write_bytes(dumps_bytes(payload, indent=True))
+
+    def save_stream(self, chunks: Iterable[bytes], out_path: str) -> None:
+        path = Path(out_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with path.open("wb") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
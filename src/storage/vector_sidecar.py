@@ -0,0 +1,130 @@
+import ast
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Literal
+
+ArtifactVectors = Literal["inline", "sidecar"]
+ARTIFACT_VECTOR_MODES: tuple[str, ...] = ("inline", "sidecar")
+SidecarDtype = Literal["float32", "float16"]
+
+NPY_MAGIC = b"\x93NUMPY"
+NPY_CONTENT_TYPE = "application/octet-stream"
+VECTOR_FIELD_NAME = "contentVector"
+VECTOR_ROW_FIELD_NAME = "contentVectorRow"
+_NPY_DESCR = {"float32": "<f4", "float16": "<f2"}
+_NPY_ALIGNMENT = 64
+
+
+def sidecar_name(json_name: str) -> str:
+    stem = json_name[: -len(".json")] if json_name.endswith(".json") else json_name
+    return f"{stem}.vectors.npy"
+
+
+def encode_npy(vectors: list[list[float]], dtype: SidecarDtype = "float32") -> bytes:
+    """Encodes equal-length vectors as a 2-D little-endian `.npy` (format 1.0) without numpy."""
+    rows = len(vectors)
+    dimensions = len(vectors[0]) if vectors else 0
+    if any(len(vector) != dimensions for vector in vectors):
+        raise ValueError("All sidecar vectors must have the same dimensions.")
+
+    header = (
+        f"{{'descr': '{_NPY_DESCR[dtype]}', 'fortran_order': False, "
+        f"'shape': ({rows}, {dimensions}), }}"
+    )
+    prefix_length = len(NPY_MAGIC) + 2 + 2
+    padding = -(prefix_length + len(header) + 1) % _NPY_ALIGNMENT
+    header_bytes = (header + " " * padding + "\n").encode("latin1")
+
+    if dtype == "float16":
+        body = struct.pack(f"<{rows * dimensions}e", *(value for vector in vectors for value in vector))
+    else:
+        values = array("f", (value for vector in vectors for value in vector))
+        if sys.byteorder != "little":
+            values.byteswap()
+        body = values.tobytes()
+    return NPY_MAGIC + b"\x01\x00" + struct.pack("<H", len(header_bytes)) + header_bytes + body
+
+
+def _parse_npy_header(data: bytes) -> tuple[dict[str, Any], int]:
+    if data[: len(NPY_MAGIC)] != NPY_MAGIC:
+        raise ValueError("Not an .npy vector sidecar.")
+    major = data[len(NPY_MAGIC)]
+    if major == 1:
+        header_length = struct.unpack("<H", data[8:10])[0]
+        offset = 10
+    else:
+        header_length = struct.unpack("<I", data[8:12])[0]
+        offset = 12
+    header = ast.literal_eval(data[offset : offset + header_length].decode("latin1"))
+    return header, offset + header_length
+
+
+def load_npy(path: str | Path, *, mmap: bool = True) -> Any:
+    """Loads a sidecar as a (memory-mapped) numpy array, or as nested lists without numpy."""
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover - pure-Python fallback
+        np = None
+    if np is not None:
+        return np.load(path, mmap_mode="r" if mmap else None)
+
+    data = Path(path).read_bytes()
+    header, offset = _parse_npy_header(data)
+    rows, dimensions = header["shape"]
+    count = rows * dimensions
+    if header["descr"] == "<f2":
+        values = list(struct.unpack_from(f"<{count}e", data, offset))
+    else:
+        block = array("f")
+        block.frombytes(data[offset : offset + count * 4])
+        if sys.byteorder != "little":
+            block.byteswap()
+        values = block.tolist()
+    return [values[row * dimensions : (row + 1) * dimensions] for row in range(rows)]
+
+
+def split_vectors(
+    records: list[dict[str, Any]], field: str = VECTOR_FIELD_NAME
+) -> tuple[list[dict[str, Any]], list[list[float]]]:
+    """Moves record vectors out into a row list, leaving `<field>Row` indexes in slim records."""
+    row_field = VECTOR_ROW_FIELD_NAME if field == VECTOR_FIELD_NAME else f"{field}Row"
+    slim_records: list[dict[str, Any]] = []
+    vectors: list[list[float]] = []
+    for record in records:
+        vector = record.get(field)
+        slim = {key: value for key, value in record.items() if key != field}
+        if vector:
+            slim[row_field] = len(vectors)
+            vectors.append(vector)
+        else:
+            slim[row_field] = None
+        slim_records.append(slim)
+    return slim_records, vectors
+
+
+def sidecar_descriptor(
+    *, name: str, vectors: list[list[float]], dtype: SidecarDtype, field: str = VECTOR_FIELD_NAME
+) -> dict[str, Any]:
+    return {
+        "path": name,
+        "format": "npy",
+        "dtype": dtype,
+        "field": field,
+        "shape": [len(vectors), len(vectors[0]) if vectors else 0],
+    }
+
+
+def attach_vectors(
+    records: list[dict[str, Any]], vectors: Any, field: str = VECTOR_FIELD_NAME
+) -> list[dict[str, Any]]:
+    """Inverse of `split_vectors` for consumers that need inline float lists again."""
+    row_field = VECTOR_ROW_FIELD_NAME if field == VECTOR_FIELD_NAME else f"{field}Row"
+    restored: list[dict[str, Any]] = []
+    for record in records:
+        row = record.get(row_field)
+        full = {key: value for key, value in record.items() if key != row_field}
+        full[field] = [float(value) for value in vectors[row]] if row is not None else []
+        restored.append(full)
+    return restored
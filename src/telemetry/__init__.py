@@ -0,0 +1,57 @@
+from .metrics import (
+    MetricsHttpServer,
+    MetricsRegistry,
+    MetricsTextfileWriter,
+    active_metrics,
+    count_metric,
+    metrics_run,
+)
+from .perf import PerfRecorder, active_recorder, perf_run
+from .profiling import (
+    PROFILE_MODES,
+    ProfileMode,
+    ProfileSession,
+    active_profile,
+    profile_path_for_output,
+    profile_run,
+)
+from .spans import span
+from .trace import TraceRecorder, active_tracer, trace_run
+from .usage import (
+    UsageRecorder,
+    active_usage,
+    record_document_intelligence_pages,
+    record_openai_usage,
+    record_vision_call,
+    usage_run,
+    usage_source,
+)
+
+__all__ = [
+    "MetricsHttpServer",
+    "MetricsRegistry",
+    "MetricsTextfileWriter",
+    "PROFILE_MODES",
+    "PerfRecorder",
+    "ProfileMode",
+    "ProfileSession",
+    "TraceRecorder",
+    "UsageRecorder",
+    "active_metrics",
+    "active_profile",
+    "active_recorder",
+    "active_tracer",
+    "active_usage",
+    "count_metric",
+    "metrics_run",
+    "perf_run",
+    "profile_path_for_output",
+    "profile_run",
+    "record_document_intelligence_pages",
+    "record_openai_usage",
+    "record_vision_call",
+    "span",
+    "trace_run",
+    "usage_run",
+    "usage_source",
+]
@@ -0,0 +1,250 @@
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator
+
+METRIC_PREFIX = "document_reader"
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+DEFAULT_TEXTFILE_INTERVAL_SECONDS = 15.0
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Spans that wrap a single remote call, keyed to the backend label they report under.
+REMOTE_CALL_BACKENDS = {
+    "di.analyze": "document_intelligence",
+    "figure.fetch": "document_intelligence",
+    "openai.request": "openai",
+    "search.request": "search",
+    "vision.request": "vision",
+    "blob.write": "blob",
+}
+# Structural spans that also count units of work.
+SPAN_COUNTERS = {
+    "source": "sources_total",
+    "figure": "figures_total",
+}
+
+_HELP = {
+    "stage_seconds": "Duration of instrumented pipeline stages.",
+    "remote_call_seconds": "Latency of remote calls by backend.",
+    "sources_total": "Sources processed, by outcome.",
+    "figures_total": "Figures processed, by outcome.",
+    "records_uploaded_total": "Records sent to Azure AI Search.",
+    "remote_errors_total": "Failed remote calls by backend and HTTP status (429 = throttled).",
+    "retries_total": "Retried remote operations by backend.",
+    "cache_requests_total": "Local cache lookups by namespace and result.",
+    "cache_evictions_total": "Local cache entries evicted by namespace.",
+}
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class MetricsRegistry:
+    """In-process counters and histograms rendered in the Prometheus text exposition format."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self._lock = threading.Lock()
+        self._buckets = tuple(sorted(buckets))
+        self._counters: dict[str, dict[LabelKey, float]] = {}
+        self._histograms: dict[str, dict[LabelKey, list[float]]] = {}
+
+    def inc(self, name: str, amount: float = 1.0, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # Per-bucket counts, then sum and count.
+            state = series.setdefault(key, [0.0] * (len(self._buckets) + 2))
+            position = bisect_left(self._buckets, value)
+            if position < len(self._buckets):
+                state[position] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def observe_span(self, stage: str, seconds: float, *, failed: bool) -> None:
+        self.observe("stage_seconds", seconds, stage=stage)
+        backend = REMOTE_CALL_BACKENDS.get(stage)
+        if backend is not None:
+            self.observe("remote_call_seconds", seconds, backend=backend)
+        counter = SPAN_COUNTERS.get(stage)
+        if counter is not None:
+            self.inc(counter, status="error" if failed else "ok")
+
+    def render(self) -> str:
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {
+                name: {key: list(state) for key, state in series.items()}
+                for name, series in self._histograms.items()
+            }
+
+        lines: list[str] = []
+        for name in sorted(counters):
+            metric = f"{METRIC_PREFIX}_{name}"
+            if name in _HELP:
+                lines.append(f"# HELP {metric} {_HELP[name]}")
+            lines.append(f"# TYPE {metric} counter")
+            for key, value in sorted(counters[name].items()):
+                lines.append(f"{metric}{_format_labels(key)} {_format_value(value)}")
+        for name in sorted(histograms):
+            metric = f"{METRIC_PREFIX}_{name}"
+            if name in _HELP:
+                lines.append(f"# HELP {metric} {_HELP[name]}")
+            lines.append(f"# TYPE {metric} histogram")
+            for key, state in sorted(histograms[name].items()):
+                cumulative = 0.0
+                for bound, count in zip(self._buckets, state):
+                    cumulative += count
+                    le = (("le", _format_value(bound)),)
+                    lines.append(f"{metric}_bucket{_format_labels(key, le)} {_format_value(cumulative)}")
+                inf = (("le", "+Inf"),)
+                lines.append(f"{metric}_bucket{_format_labels(key, inf)} {_format_value(state[-1])}")
+                lines.append(f"{metric}_sum{_format_labels(key)} {_format_value(state[-2])}")
+                lines.append(f"{metric}_count{_format_labels(key)} {_format_value(state[-1])}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsTextfileWriter:
+    """Periodically rewrites a node-exporter textfile-collector `.prom` file while a run is active."""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        path: str | Path,
+        interval_seconds: float = DEFAULT_TEXTFILE_INTERVAL_SECONDS,
+    ) -> None:
+        self.registry = registry
+        self.path = Path(path)
+        self.interval_seconds = interval_seconds
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._loop, name="metrics-textfile", daemon=True
+        )
+
+    def write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(self.registry.render())
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _loop(self) -> None:
+        while not self._stopped.wait(self.interval_seconds):
+            self.write()
+
+    def start(self) -> None:
+        self.write()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+        self.write()
+
+
+class MetricsHttpServer:
+    """Serves the registry at `http://<host>:<port>/metrics` from a daemon thread."""
+
+    def __init__(self, registry: MetricsRegistry, port: int, host: str = "127.0.0.1") -> None:
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                return
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-http", daemon=True
+        )
+
+    @property
+    def port(self) -> int:
+        return self._server.server_port
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+_active_metrics: MetricsRegistry | None = None
+
+
+def active_metrics() -> MetricsRegistry | None:
+    return _active_metrics
+
+
+@contextmanager
+def metrics_run(
+    *, textfile: str | None = None, port: int | None = None
+) -> Iterator[MetricsRegistry]:
+    """Activates a registry and its exporters; the textfile gets a final write on exit."""
+    global _active_metrics
+    previous = _active_metrics
+    registry = MetricsRegistry()
+    exporters: list[MetricsTextfileWriter | MetricsHttpServer] = []
+    if textfile:
+        exporters.append(MetricsTextfileWriter(registry, textfile))
+    if port is not None:
+        exporters.append(MetricsHttpServer(registry, port))
+    started: list[MetricsTextfileWriter | MetricsHttpServer] = []
+    _active_metrics = registry
+    try:
+        for exporter in exporters:
+            exporter.start()
+            started.append(exporter)
+        yield registry
+    finally:
+        for exporter in reversed(started):
+            exporter.stop()
+        _active_metrics = previous
+
+
+def count_metric(name: str, amount: float = 1.0, **labels: Any) -> None:
+    registry = _active_metrics
+    if registry is not None:
+        registry.inc(name, amount, **labels)
@@ -0,0 +1,64 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class PerfRecorder:
+    """Thread-safe per-stage duration collector for one pipeline run."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._durations: dict[str, list[float]] = {}
+        self._started = time.perf_counter()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._durations.setdefault(stage, []).append(seconds)
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            durations = {stage: sorted(values) for stage, values in self._durations.items()}
+        stages = {
+            stage: {
+                "count": len(values),
+                "total_s": round(sum(values), 6),
+                "p50_s": round(_percentile(values, 0.50), 6),
+                "p95_s": round(_percentile(values, 0.95), 6),
+                "max_s": round(values[-1], 6),
+            }
+            for stage, values in sorted(
+                durations.items(), key=lambda item: sum(item[1]), reverse=True
+            )
+        }
+        return {"wall_s": round(time.perf_counter() - self._started, 6), "stages": stages}
+
+
+_active_recorder: PerfRecorder | None = None
+
+
+def active_recorder() -> PerfRecorder | None:
+    return _active_recorder
+
+
+@contextmanager
+def perf_run() -> Iterator[PerfRecorder]:
+    """Activates a fresh recorder for the duration of a pipeline run."""
+    global _active_recorder
+    previous = _active_recorder
+    recorder = PerfRecorder()
+    _active_recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _active_recorder = previous
+
@@ -0,0 +1,168 @@
+import cProfile
+import pstats
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Literal
+
+ProfileMode = Literal["cprofile", "tracemalloc"]
+PROFILE_MODES: tuple[str, ...] = ("cprofile", "tracemalloc")
+PROFILE_SUFFIXES = {"cprofile": ".prof", "tracemalloc": ".tracemalloc"}
+DEFAULT_TOP_ENTRIES = 25
+TRACEMALLOC_FRAMES = 10
+
+
+def profile_path_for_output(output_path: str, mode: ProfileMode) -> str:
+    stem = output_path
+    for suffix in (".json", ".ndjson", ".ndjson.gz"):
+        if stem.endswith(suffix):
+            stem = stem[: -len(suffix)]
+            break
+    return f"{stem}{PROFILE_SUFFIXES[mode]}"
+
+
+class ProfileSession:
+    """cProfile or tracemalloc session, optionally scoped to a set of span stages.
+
+    With `stages`, only time spent inside matching spans (a stage or any `stage.*` child)
+    is profiled, and tracemalloc reports the allocation growth across those spans. Scoping
+    follows the thread that started the session; worker threads and processes are not profiled.
+    """
+
+    def __init__(self, mode: ProfileMode, stages: tuple[str, ...] = ()) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(
+                f"Unsupported profile mode '{mode}'. Expected one of: {', '.join(PROFILE_MODES)}."
+            )
+        self.mode = mode
+        self.stages = tuple(stage for stage in stages if stage)
+        self._thread_id = threading.get_ident()
+        self._depth = 0
+        self._profile = cProfile.Profile() if mode == "cprofile" else None
+        self._stage_snapshots: list[tracemalloc.Snapshot] = []
+        self._stage_growth: Counter[tuple[str, int]] = Counter()
+        self._stage_counts: Counter[tuple[str, int]] = Counter()
+        self._snapshot: tracemalloc.Snapshot | None = None
+
+    def _matches(self, stage: str) -> bool:
+        return any(stage == scoped or stage.startswith(f"{scoped}.") for scoped in self.stages)
+
+    def _start(self) -> None:
+        if self._profile is not None:
+            self._profile.enable()
+        elif self.stages:
+            self._stage_snapshots.append(tracemalloc.take_snapshot())
+
+    def _stop(self) -> None:
+        if self._profile is not None:
+            self._profile.disable()
+        elif self.stages:
+            before = self._stage_snapshots.pop()
+            for stat in tracemalloc.take_snapshot().compare_to(before, "lineno"):
+                if stat.size_diff > 0:
+                    frame = stat.traceback[0]
+                    self._stage_growth[(frame.filename, frame.lineno)] += stat.size_diff
+                    self._stage_counts[(frame.filename, frame.lineno)] += max(stat.count_diff, 0)
+
+    def begin(self) -> None:
+        if self.mode == "tracemalloc":
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        if not self.stages:
+            self._start()
+
+    def end(self) -> None:
+        if not self.stages:
+            self._stop()
+        if self.mode == "tracemalloc":
+            self._snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+    def enter_stage(self, stage: str) -> None:
+        if not self.stages or threading.get_ident() != self._thread_id or not self._matches(stage):
+            return
+        self._depth += 1
+        if self._depth == 1:
+            self._start()
+
+    def exit_stage(self, stage: str) -> None:
+        if not self.stages or threading.get_ident() != self._thread_id or not self._matches(stage):
+            return
+        self._depth -= 1
+        if self._depth == 0:
+            self._stop()
+
+    def dump(self, path: str | Path) -> str:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if self._profile is not None:
+            self._profile.dump_stats(str(target))
+        elif self._snapshot is not None:
+            self._snapshot.dump(str(target))
+        return str(target)
+
+    def _cprofile_summary(self, limit: int) -> list[dict[str, Any]]:
+        assert self._profile is not None
+        # pstats entries map (file, line, function) to (primitive calls, calls, tottime, cumtime, callers).
+        entries = pstats.Stats(self._profile).stats  # type: ignore[attr-defined]
+        rows = sorted(entries.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        return [
+            {
+                "function": f"{filename}:{lineno}({name})",
+                "calls": timings[0],
+                "total_s": round(timings[2], 6),
+                "cumulative_s": round(timings[3], 6),
+            }
+            for (filename, lineno, name), timings in rows
+        ]
+
+    def _tracemalloc_summary(self, limit: int) -> list[dict[str, Any]]:
+        if self.stages:
+            return [
+                {
+                    "site": f"{filename}:{lineno}",
+                    "size_kib": round(size / 1024, 1),
+                    "count": self._stage_counts[(filename, lineno)],
+                }
+                for (filename, lineno), size in self._stage_growth.most_common(limit)
+            ]
+        if self._snapshot is None:
+            return []
+        return [
+            {
+                "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_kib": round(stat.size / 1024, 1),
+                "count": stat.count,
+            }
+            for stat in self._snapshot.statistics("lineno")[:limit]
+        ]
+
+    def summary(self, limit: int = DEFAULT_TOP_ENTRIES) -> dict[str, Any]:
+        summary: dict[str, Any] = {"mode": self.mode, "stages": list(self.stages)}
+        if self.mode == "cprofile":
+            summary["top_cumulative"] = self._cprofile_summary(limit)
+        else:
+            summary["top_allocations"] = self._tracemalloc_summary(limit)
+        return summary
+
+
+_active_profile: ProfileSession | None = None
+
+
+def active_profile() -> ProfileSession | None:
+    return _active_profile
+
+
+@contextmanager
+def profile_run(mode: ProfileMode, stages: tuple[str, ...] = ()) -> Iterator[ProfileSession]:
+    global _active_profile
+    previous = _active_profile
+    session = ProfileSession(mode, stages)
+    _active_profile = session
+    session.begin()
+    try:
+        yield session
+    finally:
+        session.end()
+        _active_profile = previous
@@ -0,0 +1,60 @@
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from .metrics import active_metrics
+from .perf import active_recorder
+from .profiling import active_profile
+from .trace import active_tracer
+
+_span_ids = itertools.count(1)
+_current_span_id: ContextVar[int | None] = ContextVar("current_span_id", default=None)
+
+
+@contextmanager
+def span(stage: str, **attributes: Any) -> Iterator[dict[str, Any]]:
+    """Times the enclosed block under `stage`; a no-op unless a perf, trace, metrics or profile run is active.
+
+    Spans may nest (for example `figure.ocr` around `di.analyze`), so stage totals overlap.
+    The yielded dict can be filled with trace attributes that are only known inside the block.
+    """
+    recorder = active_recorder()
+    tracer = active_tracer()
+    metrics = active_metrics()
+    profile = active_profile()
+    if recorder is None and tracer is None and metrics is None and profile is None:
+        yield attributes
+        return
+
+    span_id = next(_span_ids)
+    parent_id = _current_span_id.get()
+    token = _current_span_id.set(span_id)
+    failed = False
+    if profile is not None:
+        profile.enter_stage(stage)
+    started = time.perf_counter_ns()
+    try:
+        yield attributes
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        duration_ns = time.perf_counter_ns() - started
+        if profile is not None:
+            profile.exit_stage(stage)
+        _current_span_id.reset(token)
+        if recorder is not None:
+            recorder.record(stage, duration_ns / 1e9)
+        if metrics is not None:
+            metrics.observe_span(stage, duration_ns / 1e9, failed=failed)
+        if tracer is not None:
+            tracer.add_span(
+                name=stage,
+                start_ns=started,
+                duration_ns=duration_ns,
+                span_id=span_id,
+                parent_id=parent_id,
+                attributes=attributes,
+            )
@@ -0,0 +1,77 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+
+class TraceRecorder:
+    """Collects finished spans and exports them as Chrome trace-event JSON (Perfetto, chrome://tracing)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._events: list[dict[str, Any]] = []
+        self._thread_names: dict[int, str] = {}
+        self._origin_ns = time.perf_counter_ns()
+        self._pid = os.getpid()
+
+    def add_span(
+        self,
+        *,
+        name: str,
+        start_ns: int,
+        duration_ns: int,
+        span_id: int,
+        parent_id: int | None,
+        attributes: dict[str, Any],
+    ) -> None:
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": name.split(".", 1)[0],
+            "ph": "X",
+            "ts": (start_ns - self._origin_ns) / 1000,
+            "dur": duration_ns / 1000,
+            "pid": self._pid,
+            "tid": thread.ident or 0,
+            "args": {"span_id": span_id, "parent_id": parent_id, **attributes},
+        }
+        with self._lock:
+            self._events.append(event)
+            self._thread_names.setdefault(thread.ident or 0, thread.name)
+
+    def chrome_trace(self) -> dict[str, Any]:
+        with self._lock:
+            events = sorted(self._events, key=lambda event: event["ts"])
+            thread_names = dict(self._thread_names)
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self._pid,
+                "tid": tid,
+                "args": {"name": thread_name},
+            }
+            for tid, thread_name in sorted(thread_names.items())
+        ]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+
+_active_tracer: TraceRecorder | None = None
+
+
+def active_tracer() -> TraceRecorder | None:
+    return _active_tracer
+
+
+@contextmanager
+def trace_run() -> Iterator[TraceRecorder]:
+    """Activates span tracing until the block exits."""
+    global _active_tracer
+    previous = _active_tracer
+    tracer = TraceRecorder()
+    _active_tracer = tracer
+    try:
+        yield tracer
+    finally:
+        _active_tracer = previous
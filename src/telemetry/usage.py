@@ -0,0 +1,113 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+_current_source: ContextVar[str | None] = ContextVar("usage_source", default=None)
+
+
+def _empty_usage() -> dict[str, dict[str, dict[str, int]]]:
+    return {"openai": {}, "document_intelligence": {}, "vision": {}}
+
+
+def _add(bucket: dict[str, dict[str, int]], key: str, counts: dict[str, int]) -> None:
+    totals = bucket.setdefault(key, {name: 0 for name in counts})
+    for name, value in counts.items():
+        totals[name] = totals.get(name, 0) + value
+
+
+class UsageRecorder:
+    """Thread-safe billable-usage counters for one run, split per source and totalled per run."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._run = _empty_usage()
+        self._sources: dict[str, dict[str, dict[str, dict[str, int]]]] = {}
+
+    def _record(self, service: str, key: str, counts: dict[str, int]) -> None:
+        source = _current_source.get()
+        with self._lock:
+            _add(self._run[service], key, counts)
+            if source is not None:
+                source_usage = self._sources.setdefault(source, _empty_usage())
+                _add(source_usage[service], key, counts)
+
+    def record_openai(self, deployment: str, usage: dict[str, Any] | None) -> None:
+        usage = usage or {}
+        prompt_tokens = int(usage.get("input_tokens", usage.get("prompt_tokens")) or 0)
+        completion_tokens = int(usage.get("output_tokens", usage.get("completion_tokens")) or 0)
+        total_tokens = int(usage.get("total_tokens") or prompt_tokens + completion_tokens)
+        self._record(
+            "openai",
+            deployment,
+            {
+                "calls": 1,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": total_tokens,
+            },
+        )
+
+    def record_document_intelligence(self, model_id: str, pages: int) -> None:
+        self._record("document_intelligence", model_id, {"calls": 1, "pages": int(pages)})
+
+    def record_vision(self, route: str) -> None:
+        self._record("vision", route, {"calls": 1})
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "run": {service: dict(values) for service, values in self._run.items()},
+                "sources": {
+                    source: {service: dict(values) for service, values in usage.items()}
+                    for source, usage in self._sources.items()
+                },
+            }
+
+
+_active_usage: UsageRecorder | None = None
+
+
+def active_usage() -> UsageRecorder | None:
+    return _active_usage
+
+
+@contextmanager
+def usage_run() -> Iterator[UsageRecorder]:
+    """Activates a fresh usage recorder for the duration of a pipeline run."""
+    global _active_usage
+    previous = _active_usage
+    recorder = UsageRecorder()
+    _active_usage = recorder
+    try:
+        yield recorder
+    finally:
+        _active_usage = previous
+
+
+@contextmanager
+def usage_source(source_name: str) -> Iterator[None]:
+    """Attributes usage recorded inside the block (on this thread or context) to `source_name`."""
+    token = _current_source.set(source_name)
+    try:
+        yield
+    finally:
+        _current_source.reset(token)
+
+
+def record_openai_usage(deployment: str | None, usage: dict[str, Any] | None) -> None:
+    recorder = _active_usage
+    if recorder is not None:
+        recorder.record_openai(deployment or "unknown", usage)
+
+
+def record_document_intelligence_pages(model_id: str, pages: int) -> None:
+    recorder = _active_usage
+    if recorder is not None:
+        recorder.record_document_intelligence(model_id, pages)
+
+
+def record_vision_call(route: str) -> None:
+    recorder = _active_usage
+    if recorder is not None:
+        recorder.record_vision(route)
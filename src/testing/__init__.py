@@ -0,0 +1,23 @@
+from .fake_azure import (
+    FAKE_BACKENDS,
+    FakeAzureServer,
+    FakeAzureSettings,
+    FaultProfile,
+    deterministic_vector,
+    fake_openai_response,
+    sample_from_schema,
+    synthetic_png,
+)
+from .openai_batch import fulfill_openai_batch
+
+__all__ = [
+    "FAKE_BACKENDS",
+    "FakeAzureServer",
+    "FakeAzureSettings",
+    "FaultProfile",
+    "deterministic_vector",
+    "fake_openai_response",
+    "fulfill_openai_batch",
+    "sample_from_schema",
+    "synthetic_png",
+]
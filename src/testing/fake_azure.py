@@ -0,0 +1,811 @@
+import base64
+import gzip
+import hashlib
+import itertools
+import random
+import struct
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+from src.serialization import dumps_bytes, loads
+
+FAKE_API_KEY = "fake-key"
+FAKE_BLOB_ACCOUNT = "devstoreaccount1"
+FAKE_BLOB_SAS = "sv=2024-08-04&sig=fake"
+FAKE_CHAT_DEPLOYMENT = "fake-chat"
+FAKE_EMBEDDING_DEPLOYMENT = "fake-embedding"
+FAKE_BACKENDS: tuple[str, ...] = ("document_intelligence", "openai", "search", "blob", "vision")
+PAGE_WIDTH_INCHES = 8.5
+PAGE_HEIGHT_INCHES = 11.0
+READ_MODEL_ID = "prebuilt-read"
+_WORDS = (
+    "growth", "inflation", "output", "policy", "demand", "supply", "rates", "trade",
+    "energy", "labor", "prices", "credit", "investment", "markets", "forecast", "risk",
+    "economies", "households", "productivity", "employment", "commodity", "financial",
+)
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    """Latency and error injection for one fake backend."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+
+
+@dataclass
+class FakeAzureSettings:
+    """Behaviour of a `FakeAzureServer`.
+
+    `faults` is keyed by backend (`document_intelligence`, `openai`, `search`, `blob`, `vision`).
+    `di_results` replays recorded `AnalyzeResult.as_dict()` payloads round-robin for layout
+    requests; without them a synthetic layout with `pages`, `paragraphs_per_page` and
+    `figures_per_page` is generated from the uploaded bytes.
+    """
+
+    faults: dict[str, FaultProfile] = field(default_factory=dict)
+    embedding_dimensions: int = 1536
+    vision_embedding_dimensions: int = 1024
+    di_results: tuple[dict[str, Any], ...] = ()
+    figure_png: bytes | None = None
+    pages: int = 2
+    paragraphs_per_page: int = 6
+    words_per_paragraph: int = 60
+    figures_per_page: int = 1
+    seed: int = 0
+
+
+def synthetic_png(width: int = 64, height: int = 48) -> bytes:
+    """A small valid RGB gradient PNG, used as the default figure image."""
+    rows = b"".join(
+        b"\x00"
+        + bytes(
+            channel
+            for x in range(width)
+            for channel in (x * 4 % 256, y * 5 % 256, (x + y) * 2 % 256)
+        )
+        for y in range(height)
+    )
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+
+def deterministic_vector(seed_material: bytes | str, dimensions: int) -> list[float]:
+    """Unit-length pseudo-random vector derived from `seed_material`."""
+    if isinstance(seed_material, str):
+        seed_material = seed_material.encode("utf-8")
+    rng = random.Random(hashlib.sha256(seed_material).digest())
+    values = [rng.gauss(0.0, 1.0) for _ in range(dimensions)]
+    norm = sum(value * value for value in values) ** 0.5 or 1.0
+    return [round(value / norm, 6) for value in values]
+
+
+def sample_from_schema(schema: dict[str, Any], name: str = "value") -> Any:
+    """Minimal value that satisfies a strict structured-output JSON schema."""
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "anyOf" in schema:
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+        return sample_from_schema(options[0] if options else schema["anyOf"][0], name)
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((item for item in kind if item != "null"), "null")
+    if kind == "object":
+        return {
+            key: sample_from_schema(value, key)
+            for key, value in (schema.get("properties") or {}).items()
+        }
+    if kind == "array":
+        count = max(int(schema.get("minItems") or 0), 1)
+        return [sample_from_schema(schema.get("items") or {}, name) for _ in range(count)]
+    if kind == "integer":
+        return 1
+    if kind == "number":
+        return 0.5
+    if kind == "boolean":
+        return True
+    if kind == "null":
+        return None
+    return f"synthetic {name.replace('_', ' ')}"
+
+
+def _polygon(left: float, top: float, right: float, bottom: float) -> list[float]:
+    return [left, top, right, top, right, bottom, left, bottom]
+
+
+def _http_date() -> str:
+    return formatdate(usegmt=True)
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(len(text) // 4, 1)
+
+
+def fake_openai_response(
+    path: str, payload: dict[str, Any], settings: FakeAzureSettings
+) -> tuple[int, dict[str, Any]]:
+    """Synthesizes an Azure OpenAI v1 `/responses` or `/embeddings` reply as `(status, body)`."""
+    if path.endswith("/embeddings"):
+        inputs = payload.get("input")
+        inputs = inputs if isinstance(inputs, list) else [inputs or ""]
+        dimensions = int(payload.get("dimensions") or settings.embedding_dimensions)
+        tokens = sum(_estimate_tokens(str(text)) for text in inputs)
+        return 200, {
+            "object": "list",
+            "model": payload.get("model"),
+            "data": [
+                {
+                    "object": "embedding",
+                    "index": index,
+                    "embedding": deterministic_vector(str(text), dimensions),
+                }
+                for index, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+    if path.endswith("/responses"):
+        prompt_parts: list[str] = []
+        image_count = 0
+        for item in payload.get("input") or []:
+            for content in item.get("content") or []:
+                if content.get("type") == "input_image":
+                    image_count += 1
+                elif content.get("text"):
+                    prompt_parts.append(str(content["text"]))
+        text_format = (payload.get("text") or {}).get("format") or {}
+        if text_format.get("type") == "json_schema":
+            text = dumps_bytes(sample_from_schema(text_format.get("schema") or {})).decode("utf-8")
+        else:
+            words = " ".join(prompt_parts[-1:]).split()[:40]
+            text = "Synthetic response: " + " ".join(words)
+        input_tokens = sum(_estimate_tokens(part) for part in prompt_parts) + 85 * image_count
+        output_tokens = _estimate_tokens(text)
+        return 200, {
+            "id": f"resp_{uuid.uuid4().hex}",
+            "object": "response",
+            "status": "completed",
+            "model": payload.get("model"),
+            "output": [
+                {
+                    "type": "message",
+                    "role": "assistant",
+                    "content": [{"type": "output_text", "text": text}],
+                }
+            ],
+            "usage": {
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        }
+    return 404, {"error": {"code": "NotFound", "message": f"Unsupported Azure OpenAI path {path}."}}
+
+
+class _FakeAzureState:
+    """In-memory resources shared by all handler threads."""
+
+    def __init__(self, settings: FakeAzureSettings) -> None:
+        self.settings = settings
+        self.lock = threading.Lock()
+        self.rng = random.Random(settings.seed)
+        self.replay = itertools.cycle(settings.di_results) if settings.di_results else None
+        self.figure_png = settings.figure_png or synthetic_png()
+        self.analyze_results: dict[str, dict[str, Any]] = {}
+        self.containers: dict[str, dict[str, bytes]] = {}
+        self.staged_blocks: dict[tuple[str, str], dict[str, bytes]] = {}
+        self.indexes: dict[str, dict[str, Any]] = {}
+        self.documents: dict[str, dict[str, dict[str, Any]]] = {}
+        self.request_counts: dict[str, int] = {backend: 0 for backend in FAKE_BACKENDS}
+        self.injected_errors: dict[str, int] = {backend: 0 for backend in FAKE_BACKENDS}
+
+    def fault_for(self, backend: str) -> tuple[float, int | None]:
+        """Counts the request and returns (delay seconds, injected error status or None)."""
+        profile = self.settings.faults.get(backend) or FaultProfile()
+        with self.lock:
+            self.request_counts[backend] += 1
+            delay_ms = profile.latency_ms + self.rng.uniform(0.0, profile.jitter_ms)
+            failed = profile.error_rate > 0 and self.rng.random() < profile.error_rate
+            if failed:
+                self.injected_errors[backend] += 1
+        return max(delay_ms, 0.0) / 1000.0, profile.error_status if failed else None
+
+    def next_replay(self) -> dict[str, Any] | None:
+        if self.replay is None:
+            return None
+        with self.lock:
+            recorded = next(self.replay)
+        return recorded.get("analyzeResult", recorded)
+
+    def synthesize_layout(self, data: bytes, model_id: str, content_format: str) -> dict[str, Any]:
+        settings = self.settings
+        rng = random.Random(hashlib.sha256(data).digest())
+        markdown = content_format == "markdown"
+        parts: list[str] = []
+        offset = 0
+        pages: list[dict[str, Any]] = []
+        paragraphs: list[dict[str, Any]] = []
+        figures: list[dict[str, Any]] = []
+
+        def append(text: str) -> dict[str, int]:
+            nonlocal offset
+            if parts:
+                parts.append("\n\n")
+                offset += 2
+            span = {"offset": offset, "length": len(text)}
+            parts.append(text)
+            offset += len(text)
+            return span
+
+        for page_number in range(1, settings.pages + 1):
+            page_start = offset
+            lines: list[dict[str, Any]] = []
+            row_height = 4.5 / max(settings.paragraphs_per_page, 1)
+            for ordinal in range(settings.paragraphs_per_page):
+                words = [rng.choice(_WORDS) for _ in range(settings.words_per_paragraph)]
+                if ordinal == 0 and settings.figures_per_page:
+                    words[:3] = ["Figure", f"{page_number}.1", "shows"]
+                text = " ".join(words).capitalize() + "."
+                top = 1.0 + ordinal * row_height
+                region = {
+                    "pageNumber": page_number,
+                    "polygon": _polygon(1.0, top, 7.5, top + row_height * 0.8),
+                }
+                span = append(text)
+                paragraphs.append({"content": text, "spans": [span], "boundingRegions": [region]})
+                lines.append({"content": text, "polygon": region["polygon"], "spans": [span]})
+            for ordinal in range(1, settings.figures_per_page + 1):
+                figure_id = f"{page_number}.{ordinal}"
+                caption_text = f"Figure {figure_id}: Synthetic {rng.choice(_WORDS)} series"
+                band = 5.5 / settings.figures_per_page
+                top = 5.5 + (ordinal - 1) * band
+                caption_region = {
+                    "pageNumber": page_number,
+                    "polygon": _polygon(1.5, top, 7.0, top + 0.3),
+                }
+                figure_region = {
+                    "pageNumber": page_number,
+                    "polygon": _polygon(1.5, top + 0.3, 7.0, top + band - 0.1),
+                }
+                block = (
+                    f"<figure>\n<figcaption>{caption_text}</figcaption>\n</figure>"
+                    if markdown
+                    else caption_text
+                )
+                span = append(block)
+                caption_offset = span["offset"] + block.index(caption_text)
+                caption_span = {"offset": caption_offset, "length": len(caption_text)}
+                paragraphs.append(
+                    {
+                        "role": "caption",
+                        "content": caption_text,
+                        "spans": [caption_span],
+                        "boundingRegions": [caption_region],
+                    }
+                )
+                figures.append(
+                    {
+                        "id": figure_id,
+                        "boundingRegions": [figure_region],
+                        "spans": [span],
+                        "elements": [],
+                        "caption": {
+                            "content": caption_text,
+                            "boundingRegions": [caption_region],
+                            "spans": [caption_span],
+                        },
+                    }
+                )
+            pages.append(
+                {
+                    "pageNumber": page_number,
+                    "angle": 0.0,
+                    "width": PAGE_WIDTH_INCHES,
+                    "height": PAGE_HEIGHT_INCHES,
+                    "unit": "inch",
+                    "spans": [{"offset": page_start, "length": offset - page_start}],
+                    "words": [],
+                    "lines": lines,
+                }
+            )
+
+        return {
+            "apiVersion": "2024-11-30",
+            "modelId": model_id,
+            "stringIndexType": "textElements",
+            "content": "".join(parts),
+            "contentFormat": "markdown" if markdown else "text",
+            "pages": pages,
+            "paragraphs": paragraphs,
+            "figures": figures,
+        }
+
+    def synthesize_read(self, data: bytes) -> dict[str, Any]:
+        rng = random.Random(hashlib.sha256(data).digest())
+        text = " ".join(
+            [rng.choice(_WORDS).capitalize(), "2021", "2022", "2023", "Percent", rng.choice(_WORDS)]
+        )
+        span = {"offset": 0, "length": len(text)}
+        return {
+            "apiVersion": "2024-11-30",
+            "modelId": READ_MODEL_ID,
+            "stringIndexType": "textElements",
+            "content": text,
+            "contentFormat": "text",
+            "pages": [
+                {
+                    "pageNumber": 1,
+                    "angle": 0.0,
+                    "width": 64,
+                    "height": 48,
+                    "unit": "pixel",
+                    "spans": [span],
+                    "words": [],
+                    "lines": [{"content": text, "polygon": _polygon(0, 0, 64, 8), "spans": [span]}],
+                }
+            ],
+            "paragraphs": [{"content": text, "spans": [span]}],
+        }
+
+
+class _FakeAzureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_FakeAzureHttpServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return
+
+    @property
+    def state(self) -> _FakeAzureState:
+        return self.server.state
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            blocks = []
+            while True:
+                size = int(self.rfile.readline().split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                blocks.append(self.rfile.read(size))
+                self.rfile.readline()
+            body = b"".join(blocks)
+        else:
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.headers.get("Content-Encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+        return body
+
+    def _send(
+        self,
+        status: int,
+        body: bytes = b"",
+        *,
+        content_type: str | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Date", _http_date())
+        self.send_header("x-ms-request-id", str(uuid.uuid4()))
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Any, headers: dict[str, str] | None = None) -> None:
+        self._send(status, dumps_bytes(payload), content_type="application/json", headers=headers)
+
+    def _send_error_json(self, status: int, code: str, message: str) -> None:
+        self._send_json(status, {"error": {"code": code, "message": message}}, {"Retry-After": "0"})
+
+    def _send_storage_error(self, status: int, code: str) -> None:
+        body = (
+            '<?xml version="1.0" encoding="utf-8"?>'
+            f"<Error><Code>{code}</Code><Message>{code}</Message></Error>"
+        ).encode("utf-8")
+        self._send(
+            status,
+            body,
+            content_type="application/xml",
+            headers={"x-ms-error-code": code, "Retry-After": "0"},
+        )
+
+    @staticmethod
+    def _backend(path: str) -> str:
+        if path.startswith("/documentintelligence/"):
+            return "document_intelligence"
+        if path.startswith("/openai/"):
+            return "openai"
+        if path.startswith(("/computervision/", "/vision/")):
+            return "vision"
+        if path.startswith("/indexes"):
+            return "search"
+        return "blob"
+
+    def _dispatch(self) -> None:
+        url = urlsplit(self.path)
+        path = unquote(url.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        body = self._read_body() if self.command in ("POST", "PUT") else b""
+        backend = self._backend(path)
+        delay, injected_status = self.state.fault_for(backend)
+        if delay:
+            time.sleep(delay)
+        if injected_status is not None:
+            if backend == "blob":
+                self._send_storage_error(injected_status, "ServerBusy")
+            else:
+                self._send_error_json(injected_status, "InjectedFault", "Injected by FakeAzureServer.")
+            return
+        handler = {
+            "document_intelligence": self._handle_document_intelligence,
+            "openai": self._handle_openai,
+            "vision": self._handle_vision,
+            "search": self._handle_search,
+            "blob": self._handle_blob,
+        }[backend]
+        handler(path, query, body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _dispatch
+
+    # Document Intelligence: analyze (long-running), poll, and figure images.
+    def _handle_document_intelligence(self, path: str, query: dict[str, str], body: bytes) -> None:
+        parts = path.strip("/").split("/")
+        if self.command == "POST" and path.endswith(":analyze"):
+            model_id = parts[2].split(":", 1)[0]
+            if model_id == READ_MODEL_ID:
+                result = self.state.synthesize_read(body)
+            else:
+                result = self.state.next_replay() or self.state.synthesize_layout(
+                    body, model_id, query.get("outputContentFormat", "text")
+                )
+            result_id = str(uuid.uuid4())
+            with self.state.lock:
+                self.state.analyze_results[result_id] = result
+            location = (
+                f"http://{self.headers.get('Host')}/documentintelligence/documentModels/"
+                f"{model_id}/analyzeResults/{result_id}?api-version={query.get('api-version', '')}"
+            )
+            self._send(202, headers={"Operation-Location": location, "Retry-After": "0"})
+            return
+        if self.command == "GET" and len(parts) >= 5 and parts[3] == "analyzeResults":
+            result = self.state.analyze_results.get(parts[4])
+            if result is None:
+                self._send_error_json(404, "NotFound", "Unknown analyze result.")
+            elif len(parts) == 7 and parts[5] == "figures":
+                self._send(200, self.state.figure_png, content_type="image/png")
+            else:
+                now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+                self._send_json(
+                    200,
+                    {
+                        "status": "succeeded",
+                        "createdDateTime": now,
+                        "lastUpdatedDateTime": now,
+                        "analyzeResult": result,
+                    },
+                )
+            return
+        self._send_error_json(404, "NotFound", f"Unsupported Document Intelligence path {path}.")
+
+    # Azure OpenAI v1: Responses and embeddings.
+    def _handle_openai(self, path: str, query: dict[str, str], body: bytes) -> None:
+        status, payload = fake_openai_response(
+            path, loads(body) if body else {}, self.state.settings
+        )
+        self._send_json(status, payload)
+
+    # Azure AI Vision: multimodal embeddings and Image Analysis 3.2.
+    def _handle_vision(self, path: str, query: dict[str, str], body: bytes) -> None:
+        dimensions = self.state.settings.vision_embedding_dimensions
+        if path.endswith("retrieval:vectorizeText"):
+            text = str((loads(body) if body else {}).get("text") or "")
+            vector = deterministic_vector(text, dimensions)
+            self._send_json(200, {"modelVersion": query.get("model-version"), "vector": vector})
+            return
+        if path.endswith("retrieval:vectorizeImage"):
+            vector = deterministic_vector(body, dimensions)
+            self._send_json(200, {"modelVersion": query.get("model-version"), "vector": vector})
+            return
+        if path.endswith("/analyze"):
+            self._send_json(
+                200,
+                {
+                    "description": {
+                        "tags": ["chart", "text"],
+                        "captions": [{"text": "a chart with lines and text", "confidence": 0.9}],
+                    },
+                    "tags": [
+                        {"name": "chart", "confidence": 0.95},
+                        {"name": "text", "confidence": 0.9},
+                    ],
+                    "objects": [],
+                    "metadata": {"width": 64, "height": 48, "format": "Png"},
+                },
+            )
+            return
+        self._send_error_json(404, "NotFound", f"Unsupported Azure AI Vision path {path}.")
+
+    # Azure AI Search: index definitions and document batches.
+    def _handle_search(self, path: str, query: dict[str, str], body: bytes) -> None:
+        if path.startswith("/indexes('") and self.command == "PUT":
+            name = path[len("/indexes('") : path.index("')")]
+            definition = loads(body) if body else {"name": name}
+            with self.state.lock:
+                created = name not in self.state.indexes
+                self.state.indexes[name] = definition
+                self.state.documents.setdefault(name, {})
+            self._send_json(201 if created else 200, definition)
+            return
+        parts = path.strip("/").split("/")
+        if len(parts) == 2 and self.command == "DELETE":
+            with self.state.lock:
+                existed = self.state.indexes.pop(parts[1], None) is not None
+                self.state.documents.pop(parts[1], None)
+            if existed:
+                self._send(204)
+            else:
+                self._send_error_json(404, "NotFound", f"Index '{parts[1]}' not found.")
+            return
+        if len(parts) == 4 and parts[2:] == ["docs", "index"] and self.command == "POST":
+            name = parts[1]
+            actions = (loads(body) if body else {}).get("value") or []
+            results = []
+            with self.state.lock:
+                documents = self.state.documents.setdefault(name, {})
+                for action in actions:
+                    document = {
+                        key: value
+                        for key, value in action.items()
+                        # Vectors are dropped so long benchmark runs keep a flat memory profile.
+                        if key != "@search.action" and not key.endswith("Vector")
+                    }
+                    key = str(document.get("id"))
+                    if action.get("@search.action") == "delete":
+                        documents.pop(key, None)
+                    else:
+                        documents[key] = document
+                    results.append({"key": key, "status": True, "errorMessage": None, "statusCode": 200})
+            self._send_json(200, {"value": results})
+            return
+        self._send_error_json(404, "NotFound", f"Unsupported Azure AI Search path {path}.")
+
+    # Blob Storage: containers, block blobs and listings under `/<account>/<container>/<blob>`.
+    def _blob_headers(self, data: bytes) -> dict[str, str]:
+        return {
+            "ETag": f'"0x{hashlib.md5(data).hexdigest()[:16].upper()}"',
+            "Last-Modified": _http_date(),
+            "x-ms-blob-type": "BlockBlob",
+            "x-ms-version": self.headers.get("x-ms-version", ""),
+        }
+
+    def _handle_blob(self, path: str, query: dict[str, str], body: bytes) -> None:
+        parts = path.strip("/").split("/", 2)
+        if len(parts) < 2 or not parts[1]:
+            self._send_storage_error(400, "InvalidUri")
+            return
+        container_name = parts[1]
+        blob_name = parts[2] if len(parts) == 3 else None
+        state = self.state
+        if blob_name is None:
+            self._handle_container(container_name, query)
+            return
+
+        with state.lock:
+            container = state.containers.get(container_name)
+        if container is None:
+            self._send_storage_error(404, "ContainerNotFound")
+            return
+        key = (container_name, blob_name)
+        comp = query.get("comp")
+        if self.command == "PUT" and comp == "block":
+            with state.lock:
+                state.staged_blocks.setdefault(key, {})[query.get("blockid", "")] = body
+            self._send(201, headers={"x-ms-request-server-encrypted": "true"})
+            return
+        if self.command == "PUT" and comp == "blocklist":
+            block_ids = [element.text or "" for element in ElementTree.fromstring(body)]
+            with state.lock:
+                staged = state.staged_blocks.pop(key, {})
+                data = b"".join(staged.get(block_id, b"") for block_id in block_ids)
+                container[blob_name] = data
+            headers = {**self._blob_headers(data), "x-ms-request-server-encrypted": "true"}
+            self._send(201, headers=headers)
+            return
+        if self.command == "PUT":
+            with state.lock:
+                container[blob_name] = body
+            self._send(
+                201,
+                headers={
+                    **self._blob_headers(body),
+                    "Content-MD5": base64.b64encode(hashlib.md5(body).digest()).decode("ascii"),
+                    "x-ms-request-server-encrypted": "true",
+                },
+            )
+            return
+        with state.lock:
+            data = container.get(blob_name)
+        if data is None:
+            self._send_storage_error(404, "BlobNotFound")
+            return
+        if self.command == "DELETE":
+            with state.lock:
+                container.pop(blob_name, None)
+            self._send(202)
+            return
+        headers = self._blob_headers(data)
+        requested_range = self.headers.get("x-ms-range") or self.headers.get("Range")
+        if self.command == "GET" and requested_range:
+            if not data:
+                self._send_storage_error(416, "InvalidRange")
+                return
+            start_text, _, end_text = requested_range.split("=", 1)[1].partition("-")
+            start = int(start_text)
+            end = min(int(end_text) if end_text else len(data) - 1, len(data) - 1)
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+            self._send(
+                206, data[start : end + 1], content_type="application/octet-stream", headers=headers
+            )
+            return
+        self._send(200, data, content_type="application/octet-stream", headers=headers)
+
+    def _handle_container(self, container_name: str, query: dict[str, str]) -> None:
+        state = self.state
+        if self.command == "PUT":
+            with state.lock:
+                exists = container_name in state.containers
+                state.containers.setdefault(container_name, {})
+            if exists:
+                self._send_storage_error(409, "ContainerAlreadyExists")
+            else:
+                self._send(201, headers={"ETag": '"0x1"', "Last-Modified": _http_date()})
+            return
+        with state.lock:
+            container = state.containers.get(container_name)
+        if container is None:
+            self._send_storage_error(404, "ContainerNotFound")
+            return
+        if self.command == "DELETE":
+            with state.lock:
+                state.containers.pop(container_name, None)
+            self._send(202)
+            return
+        if query.get("comp") == "list":
+            prefix = query.get("prefix", "")
+            with state.lock:
+                names = sorted(name for name in container if name.startswith(prefix))
+                sizes = {name: len(container[name]) for name in names}
+            blobs = "".join(
+                f"<Blob><Name>{escape(name)}</Name><Properties>"
+                f"<Last-Modified>{_http_date()}</Last-Modified><Etag>0x1</Etag>"
+                f"<Content-Length>{sizes[name]}</Content-Length>"
+                "<Content-Type>application/octet-stream</Content-Type>"
+                "<BlobType>BlockBlob</BlobType></Properties></Blob>"
+                for name in names
+            )
+            xml = (
+                '<?xml version="1.0" encoding="utf-8"?>'
+                f'<EnumerationResults ContainerName="{escape(container_name)}">'
+                f"<Prefix>{escape(prefix)}</Prefix><Blobs>{blobs}</Blobs>"
+                "<NextMarker /></EnumerationResults>"
+            )
+            self._send(200, xml.encode("utf-8"), content_type="application/xml")
+            return
+        self._send(200, headers={"ETag": '"0x1"', "Last-Modified": _http_date()})
+
+
+class _FakeAzureHttpServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], state: _FakeAzureState) -> None:
+        super().__init__(address, _FakeAzureHandler)
+        self.state = state
+
+
+class FakeAzureServer:
+    """Local HTTP stand-in for Document Intelligence, Azure OpenAI, AI Vision, AI Search and Blob.
+
+    The real SDK and urllib clients talk to it unchanged once `environment()` is applied, so
+    pipelines run end to end offline. The layout-skill pipeline is not supported because its
+    work happens inside the Search indexer.
+    """
+
+    def __init__(
+        self,
+        settings: FakeAzureSettings | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.settings = settings or FakeAzureSettings()
+        self.state = _FakeAzureState(self.settings)
+        self._server = _FakeAzureHttpServer((host, port), self.state)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-azure", daemon=True
+        )
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def environment(self) -> dict[str, str]:
+        """Environment variables that point every service at this server."""
+        endpoint = self.endpoint
+        return {
+            "AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT": endpoint,
+            "AZURE_DOCUMENT_INTELLIGENCE_API_KEY": FAKE_API_KEY,
+            "AZURE_STORAGE_BLOB_ENDPOINT": f"{endpoint}/{FAKE_BLOB_ACCOUNT}",
+            "AZURE_STORAGE_BLOB_API_KEY": FAKE_BLOB_SAS,
+            "AZURE_AI_SEARCH_ENDPOINT": endpoint,
+            "AZURE_AI_SEARCH_API_KEY": FAKE_API_KEY,
+            "AZURE_OPENAI_ENDPOINT": endpoint,
+            "AZURE_OPENAI_API_KEY": FAKE_API_KEY,
+            "AZURE_OPENAI_API_VERSION": "v1",
+            "AZURE_OPENAI_CHAT_DEPLOYMENT": FAKE_CHAT_DEPLOYMENT,
+            "AZURE_OPENAI_INTERPRET_DEPLOYMENT": FAKE_CHAT_DEPLOYMENT,
+            "AZURE_OPENAI_VERBALIZATION_DEPLOYMENT": FAKE_CHAT_DEPLOYMENT,
+            "AZURE_OPENAI_EMBEDDING_DEPLOYMENT": FAKE_EMBEDDING_DEPLOYMENT,
+            "AZURE_OPENAI_EMBEDDING_DIMENSIONS": str(self.settings.embedding_dimensions),
+            "AZURE_EMBEDDING_PROVIDER": "azure_ai_vision",
+            "AZURE_AI_VISION_ENDPOINT": endpoint,
+            "AZURE_AI_VISION_API_KEY": FAKE_API_KEY,
+            "AZURE_AI_VISION_EMBEDDING_DIMENSIONS": str(self.settings.vision_embedding_dimensions),
+        }
+
+    def stats(self) -> dict[str, Any]:
+        with self.state.lock:
+            return {
+                "requests": dict(self.state.request_counts),
+                "injected_errors": dict(self.state.injected_errors),
+                "indexed_documents": {
+                    name: len(documents) for name, documents in self.state.documents.items()
+                },
+                "blobs": {name: len(blobs) for name, blobs in self.state.containers.items()},
+            }
+
+    def search_documents(self, index_name: str) -> dict[str, dict[str, Any]]:
+        with self.state.lock:
+            return dict(self.state.documents.get(index_name, {}))
+
+    def blob(self, container_name: str, blob_name: str) -> bytes | None:
+        with self.state.lock:
+            return self.state.containers.get(container_name, {}).get(blob_name)
+
+    def start(self) -> "FakeAzureServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeAzureServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
@@ -0,0 +1,63 @@
+import argparse
+import uuid
+from pathlib import Path
+
+from src.serialization import dumps, loads
+
+from .fake_azure import FakeAzureSettings, fake_openai_response
+
+
+def fulfill_openai_batch(
+    input_path: str | Path,
+    output_path: str | Path,
+    settings: FakeAzureSettings | None = None,
+) -> int:
+    """Answers an Azure OpenAI Batch input JSONL offline and writes the Batch output JSONL.
+
+    Each request is answered by the same synthesizer the fake server uses, so the output can
+    be dropped under `--openai-batch-dir/results` in place of a real Batch job's output.
+    Returns the number of answered requests.
+    """
+    settings = settings or FakeAzureSettings()
+    lines: list[str] = []
+    for line in Path(input_path).read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        request = loads(line)
+        status_code, body = fake_openai_response(
+            str(request["url"]).removeprefix("/v1"), request.get("body") or {}, settings
+        )
+        lines.append(
+            dumps(
+                {
+                    "id": f"batch_req_{uuid.uuid4().hex}",
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": status_code,
+                        "request_id": uuid.uuid4().hex,
+                        "body": body,
+                    },
+                    "error": None,
+                }
+            )
+        )
+    output = Path(output_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text("".join(f"{line}\n" for line in lines), encoding="utf-8")
+    return len(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Fulfill Azure OpenAI Batch input JSONL offline with synthetic responses."
+    )
+    parser.add_argument("input", help="Batch input JSONL written by --openai-batch-dir.")
+    parser.add_argument("output", help="Where to write the Batch output JSONL.")
+    parser.add_argument("--embedding-dimensions", type=int, default=FakeAzureSettings.embedding_dimensions)
+    args = parser.parse_args()
+    count = fulfill_openai_batch(
+        args.input,
+        args.output,
+        FakeAzureSettings(embedding_dimensions=args.embedding_dimensions),
+    )
+    print(f"Fulfilled {count} request(s) into {args.output}")
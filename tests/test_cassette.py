@@ -0,0 +1,112 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.pipelines import LayoutNoSkillV2Pipeline, LayoutNoSkillV2PipelineOptions  # noqa: E402
+from src.storage import (  # noqa: E402
+    Cassette,
+    CassetteMissError,
+    cassette_run,
+    decode_bytes,
+    encode_bytes,
+    through_cassette,
+)
+from src.testing import FakeAzureServer, FakeAzureSettings  # noqa: E402
+
+DEMO_PDF = REPO_ROOT / "documents" / "demo_files" / "world_economic_outlook_page_20.pdf"
+
+
+def test_through_cassette_is_a_pass_through_without_a_run() -> None:
+    calls = []
+
+    assert through_cassette("openai", ("/responses", {}), lambda: calls.append(1) or "live") == "live"
+    assert calls == [1]
+
+
+def test_lazy_keys_are_built_only_when_a_cassette_handles_the_service(tmp_path: Path) -> None:
+    built: list[str] = []
+
+    def parts() -> tuple[str, ...]:
+        built.append("key")
+        return ("analyze", "digest")
+
+    assert through_cassette("document_intelligence", parts, lambda: "live") == "live"
+    with cassette_run("record", tmp_path, services=("openai",)):
+        assert through_cassette("document_intelligence", parts, lambda: "live") == "live"
+    assert built == []
+
+    with cassette_run("record", tmp_path):
+        through_cassette("document_intelligence", parts, lambda: "recorded")
+    with cassette_run("replay", tmp_path):
+        assert through_cassette("document_intelligence", ("analyze", "digest"), lambda: "live") == (
+            "recorded"
+        )
+    assert built == ["key"]
+
+
+def test_replay_serves_recorded_values_including_none_and_bytes(tmp_path: Path) -> None:
+    with cassette_run("record", tmp_path):
+        through_cassette("search", ("DELETE", "/indexes/a"), lambda: None)
+        through_cassette(
+            "blob",
+            ("download", "c", "b"),
+            lambda: b"\x00payload",
+            encode=encode_bytes,
+            decode=decode_bytes,
+        )
+
+    def offline() -> None:
+        raise AssertionError("replay must not call the remote service")
+
+    with cassette_run("replay", tmp_path) as cassette:
+        assert through_cassette("search", ("DELETE", "/indexes/a"), offline) is None
+        assert (
+            through_cassette(
+                "blob", ("download", "c", "b"), offline, encode=encode_bytes, decode=decode_bytes
+            )
+            == b"\x00payload"
+        )
+        with pytest.raises(CassetteMissError):
+            through_cassette("search", ("DELETE", "/indexes/other"), offline)
+
+    assert cassette.summary()["calls"] == {"blob": 1, "search": 1}
+
+
+def test_request_key_ignores_dict_ordering() -> None:
+    assert Cassette.request_key("openai", {"a": 1, "b": [1, 2]}) == Cassette.request_key(
+        "openai", {"b": [1, 2], "a": 1}
+    )
+
+
+def test_layout_no_skill_v2_replays_offline(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    options = LayoutNoSkillV2PipelineOptions(
+        src=str(DEMO_PDF),
+        demo=False,
+        chunk_container="chunks",
+        name_prefix="offline",
+        chunk_size=500,
+        chunk_overlap=50,
+        content_format="markdown",
+        hard_refresh=True,
+    )
+    with FakeAzureServer(FakeAzureSettings(embedding_dimensions=8)) as server:
+        for name, value in server.environment().items():
+            monkeypatch.setenv(name, value)
+        with cassette_run("record", tmp_path / "cassettes"):
+            recorded = LayoutNoSkillV2Pipeline().run(options)
+        live_requests = sum(server.stats()["requests"].values())
+
+    # The server is stopped, so any request that escaped the cassette would fail.
+    with cassette_run("replay", tmp_path / "cassettes") as cassette:
+        replayed = LayoutNoSkillV2Pipeline().run(options)
+
+    assert replayed["records"] == recorded["records"]
+    assert replayed["derived_artifact"] == recorded["derived_artifact"]
+    assert sum(cassette.summary()["calls"].values()) > 0
+    assert live_requests > 0
@@ -0,0 +1,64 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def dedup_module():
+    module_path = Path(__file__).resolve().parents[1] / "src/services/shared/dedup.py"
+    spec = importlib.util.spec_from_file_location("shared_dedup_test", module_path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+DISCLAIMER = (
+    "This document is provided for information purposes only and does not constitute "
+    "an offer or solicitation to buy or sell any security or financial instrument."
+)
+
+
+def test_exact_and_near_duplicates_collapse_to_first_record(dedup_module) -> None:
+    deduplicator = dedup_module.ChunkDeduplicator("corpus")
+
+    assert deduplicator.canonical_for("a_text_1", DISCLAIMER) is None
+    assert deduplicator.canonical_for("a_text_2", "  " + DISCLAIMER.upper()) == "a_text_1"
+    near = DISCLAIMER.replace("purposes only", "purposes only,") + " Page 7"
+    assert deduplicator.canonical_for("a_text_3", near) == "a_text_1"
+    assert (
+        deduplicator.canonical_for(
+            "a_text_4", "Revenue grew twelve percent year over year driven by cloud services demand."
+        )
+        is None
+    )
+
+    stats = deduplicator.stats()
+    assert stats["checked_chunks"] == 4
+    assert stats["exact_duplicates"] == 1
+    assert stats["near_duplicates"] == 1
+    assert [item["canonical_id"] for item in stats["duplicates"]] == ["a_text_1", "a_text_1"]
+
+
+def test_source_scope_resets_between_sources(dedup_module) -> None:
+    deduplicator = dedup_module.ChunkDeduplicator("source")
+
+    deduplicator.start_source("a.pdf")
+    assert deduplicator.canonical_for("a_text_1", DISCLAIMER) is None
+    assert deduplicator.canonical_for("a_text_2", DISCLAIMER) == "a_text_1"
+    deduplicator.start_source("b.pdf")
+    assert deduplicator.canonical_for("b_text_1", DISCLAIMER) is None
+
+
+def test_off_scope_keeps_every_chunk(dedup_module) -> None:
+    deduplicator = dedup_module.ChunkDeduplicator()
+
+    assert deduplicator.canonical_for("a_text_1", DISCLAIMER) is None
+    assert deduplicator.canonical_for("a_text_2", DISCLAIMER) is None
+    assert deduplicator.stats()["checked_chunks"] == 0
+
+
+def test_unknown_scope_is_rejected(dedup_module) -> None:
+    with pytest.raises(ValueError):
+        dedup_module.ChunkDeduplicator("global")
@@ -0,0 +1,59 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.services.shared import (  # noqa: E402
+    CpuStagePool,
+    chunk_markdown_deterministic,
+    chunk_text_deterministic,
+)
+
+MARKDOWN = "\n\n".join(
+    f"## Section {index}\n\n"
+    + " ".join(f"Sentence {index}.{word} about output growth." for word in range(30))
+    + "\n\n| Year | Value |\n| --- | --- |\n| 2020 | 1.5 |\n| 2021 | 2.5 |"
+    for index in range(6)
+)
+
+
+def _fail(message: str) -> None:
+    raise ValueError(message)
+
+
+@pytest.mark.parametrize("max_workers", [0, 2])
+def test_cpu_stage_pool_returns_results_and_propagates_errors(max_workers: int) -> None:
+    with CpuStagePool(max_workers=max_workers) as pool:
+        assert pool.enabled is (max_workers > 0)
+        pid = pool.submit(os.getpid).result()
+        failure = pool.submit(_fail, "chunking failed")
+
+        with pytest.raises(ValueError, match="chunking failed"):
+            failure.result()
+
+    assert (pid == os.getpid()) is (max_workers == 0)
+
+
+def test_cpu_stage_pool_rejects_negative_workers() -> None:
+    with pytest.raises(ValueError, match="zero or positive"):
+        CpuStagePool(max_workers=-1)
+
+
+def test_cpu_stage_pool_chunks_match_inline_path() -> None:
+    inline_markdown = chunk_markdown_deterministic(MARKDOWN, chunk_size=300, chunk_overlap=40)
+    inline_text = chunk_text_deterministic(MARKDOWN, chunk_size=300, chunk_overlap=40)
+
+    with CpuStagePool(max_workers=2) as pool:
+        markdown_job = pool.submit(
+            chunk_markdown_deterministic, MARKDOWN, chunk_size=300, chunk_overlap=40
+        )
+        text_job = pool.submit(chunk_text_deterministic, MARKDOWN, chunk_size=300, chunk_overlap=40)
+
+        assert markdown_job.result() == inline_markdown
+        assert text_job.result() == inline_text
+    assert len(inline_markdown) > 1
@@ -1,4 +1,9 @@
+import contextlib
+import dataclasses
+import hashlib
 import importlib.util
+import json
+import random
 import sys
 import types
 from pathlib import Path
@@ -7,6 +12,26 @@ from typing import Any
 import pytest
 
 
+class _MemoryJsonCache:
+    def __init__(self) -> None:
+        self.entries: dict[str, Any] = {}
+
+    @staticmethod
+    def make_key(*parts: str | bytes) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part if isinstance(part, bytes) else part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Any | None:
+        return self.entries.get(key)
+
+    def set(self, key: str, value: Any) -> str:
+        self.entries[key] = value
+        return key
+
+
 def _module(name: str, **attrs: object) -> types.ModuleType:
     module = types.ModuleType(name)
     for key, value in attrs.items():
@@ -74,6 +99,7 @@ def service_module(monkeypatch: pytest.MonkeyPatch):
         "src.services.openai",
         _module(
             "src.services.openai",
+            OpenAIBatchPending=type("OpenAIBatchPending", (Exception,), {}),
             OpenAIService=type("OpenAIService", (), {}),
             OpenAIServiceError=type("OpenAIServiceError", (Exception,), {}),
         ),
@@ -83,14 +109,33 @@ def service_module(monkeypatch: pytest.MonkeyPatch):
         "src.services.shared",
         _module(
             "src.services.shared",
+            ChunkDeduplicator=type("ChunkDeduplicator", (), {}),
+            CpuStagePool=type("CpuStagePool", (), {}),
             DEFAULT_CHUNK_CONTAINER="chunk-container",
             DEFAULT_TARGET_INDEX_NAME="rag-index",
+            ImagePreprocessOptions=type("ImagePreprocessOptions", (), {}),
             build_shared_index=lambda *args, **kwargs: None,
             chunk_markdown_deterministic=lambda text, **kwargs: [text] if text else [],
             chunk_text_deterministic=lambda text, **kwargs: [text] if text else [],
+            encode_search_body=lambda body, **kwargs: (
+                json.dumps(body).encode("utf-8") if body is not None else None,
+                {"Content-Type": "application/json"},
+            ),
+            preprocess_image=lambda data, options, **kwargs: (data, "image/png"),
+            preprocessing_available=lambda: False,
             strip_figure_blocks_from_markdown=lambda markdown: markdown,
         ),
     )
+    monkeypatch.setitem(
+        sys.modules,
+        "src.serialization",
+        _module(
+            "src.serialization",
+            dumps=lambda value, **kwargs: json.dumps(value),
+            dumps_bytes=lambda value, **kwargs: json.dumps(value).encode("utf-8"),
+            loads=json.loads,
+        ),
+    )
     monkeypatch.setitem(
         sys.modules,
         "src.services.storage_account",
@@ -102,7 +147,27 @@ def service_module(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setitem(
         sys.modules,
         "src.storage",
-        _module("src.storage", LocalOutputStore=type("LocalOutputStore", (), {})),
+        _module(
+            "src.storage",
+            NPY_CONTENT_TYPE="application/octet-stream",
+            LocalJsonCache=_MemoryJsonCache,
+            LocalOutputStore=type("LocalOutputStore", (), {}),
+            encode_npy=lambda vectors, dtype="float32": b"",
+            sidecar_descriptor=lambda **kwargs: {},
+            sidecar_name=lambda name: name,
+            split_vectors=lambda records, field="contentVector": (records, []),
+            through_cassette=lambda service, parts, fetch, **kwargs: fetch(),
+        ),
+    )
+    monkeypatch.setitem(
+        sys.modules,
+        "src.telemetry",
+        _module(
+            "src.telemetry",
+            count_metric=lambda name, amount=1.0, **labels: None,
+            span=lambda stage, **attributes: contextlib.nullcontext(attributes),
+            usage_source=lambda source_name: contextlib.nullcontext(),
+        ),
     )
 
     module_path = (
@@ -392,3 +457,466 @@ def test_select_relevant_text_returns_empty_when_no_spatial_candidates(service)
 
     assert relevant == ""
     assert surrounding == ""
+
+
+def test_paragraph_spatial_index_matches_full_page_scan(service, service_module) -> None:
+    generator = random.Random(7)
+    paragraphs = []
+    for index in range(300):
+        left = generator.uniform(0.0, 0.8)
+        top = generator.uniform(0.0, 0.95)
+        paragraphs.append(
+            _paragraph(
+                index=index,
+                text=f"Paragraph {index}",
+                left=left,
+                top=top,
+                right=min(1.0, left + generator.uniform(0.05, 0.5)),
+                bottom=min(1.0, top + generator.uniform(0.01, 0.05)),
+            )
+        )
+    spatial_index = service_module.ParagraphSpatialIndex({1: paragraphs})
+
+    for _ in range(40):
+        left = generator.uniform(0.0, 0.7)
+        top = generator.uniform(0.0, 0.8)
+        right = left + generator.uniform(0.1, 0.3)
+        bottom = top + generator.uniform(0.05, 0.2)
+        figure_bbox = {
+            "page_number": 1.0,
+            "left": left,
+            "right": right,
+            "top": top,
+            "bottom": bottom,
+            "center_x": (left + right) / 2,
+            "center_y": (top + bottom) / 2,
+        }
+        expected = [
+            paragraph["index"]
+            for paragraph in paragraphs
+            if service._is_spatial_candidate(
+                figure_bbox=figure_bbox, paragraph_bbox=paragraph["bbox"]
+            )
+        ]
+        indexed = [
+            paragraph["index"]
+            for paragraph in spatial_index.nearby(1, figure_bbox)
+            if service._is_spatial_candidate(
+                figure_bbox=figure_bbox, paragraph_bbox=paragraph["bbox"]
+            )
+        ]
+        assert indexed == expected
+
+
+def test_bboxes_from_bounding_regions_batch_matches_scalar(service) -> None:
+    generator = random.Random(11)
+    page_dimensions: dict[int, dict[str, float]] = {
+        1: {"width": 8.5, "height": 11.0},
+        2: {"width": 11.0, "height": 8.5},
+        4: {},
+    }
+    bounding_regions_list: list[list[dict[str, Any]]] = [
+        [],
+        [_region(3, [1.0, 1.0, 2.0, 1.0, 2.0, 2.0, 1.0, 2.0])],
+        [_region(4, [1.0, 1.0, 2.0, 1.0, 2.0, 2.0, 1.0, 2.0])],
+        [_region(1, [1.0, 1.0])],
+        [_region(1, [1.0, 1.0, 2.0, 1.0, 2.0, 2.0, 1.0, 2.0, 3.0])],
+        [_region(1, [1.0, None, 2.0, 1.0, 2.0, 2.0, 1.0, 2.0])],
+        [_region(1, ["1.5", 1.0, 2.0, 1.0, 2.0, 2.0, 1.0, 2.0])],
+        [_region(2, [None, None, None, None]), _region(1, [1.0, 1.0, 2.0, 2.0])],
+        [_region(1, [1.0, 1.0, 2.0, 2.0]), _region(2, ["a", "b", "c", "d"])],
+    ]
+    for _ in range(200):
+        regions = []
+        for _ in range(generator.randint(1, 3)):
+            page_number = generator.choice([1, 2, 4])
+            coordinates: list[Any] = [generator.uniform(0.0, 8.0) for _ in range(8)]
+            if generator.random() < 0.1:
+                coordinates[generator.randrange(8)] = generator.choice([None, "1.5"])
+            regions.append(_region(page_number, coordinates))
+        bounding_regions_list.append(regions)
+
+    expected = [
+        service._bbox_from_bounding_regions(
+            bounding_regions=bounding_regions,
+            page_dimensions=page_dimensions,
+        )
+        for bounding_regions in bounding_regions_list
+    ]
+
+    assert (
+        service._bboxes_from_bounding_regions_batch(
+            bounding_regions_list=bounding_regions_list,
+            page_dimensions=page_dimensions,
+        )
+        == expected
+    )
+    for bounding_regions, bbox in zip(bounding_regions_list, expected):
+        assert service._bboxes_from_bounding_regions_batch(
+            bounding_regions_list=[bounding_regions],
+            page_dimensions=page_dimensions,
+        ) == [bbox]
+
+
+def _figure_payload(**overrides: Any) -> dict[str, Any]:
+    payload = {
+        "source_name": "report.pdf",
+        "source_url": "report.pdf",
+        "page_number": 1,
+        "figure_id": "1.1",
+        "caption": "Figure 1.1 Output growth",
+        "bounding_regions": [],
+        "ocr_text": "2019 2020 2021",
+        "relevant_associated_text": "Output recovered after 2020.",
+        "surrounding_text": "",
+        "document_summary": "An economic outlook.",
+        "visual_heuristics": {"likely_chart": True},
+        "image_artifact_uri": "figures-v2/report/1.1.png",
+        "image_reference_mode": "memory-first",
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_figure_cache_reuses_interpretation_and_verbalization(
+    service, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[str] = []
+    grounded_response = {
+        "figure_type": "line chart",
+        "what_it_shows": "Output growth by year.",
+        "key_relationships": ["Growth appears lower in 2020."],
+        "supporting_context": {},
+        "uncertainties": [],
+        "confidence_notes": "",
+    }
+    monkeypatch.setattr(
+        service,
+        "_responses_structured_with_image",
+        lambda **kwargs: calls.append("interpret") or dict(grounded_response),
+        raising=False,
+    )
+    monkeypatch.setattr(
+        service,
+        "_responses_text",
+        lambda **kwargs: calls.append("verbalize") or "# Figure Summary\nOutput growth.",
+        raising=False,
+    )
+    service.interpret_deployment = "interpret"
+    service.verbalization_deployment = "verbalize"
+    cache = _MemoryJsonCache()
+
+    results = []
+    for _ in range(2):
+        grounded = service._interpret_figure(
+            figure_bytes=b"png", analysis_payload=_figure_payload(), figure_cache=cache
+        )
+        results.append(
+            (
+                grounded,
+                service._verbalize_figure(
+                    grounded=grounded,
+                    analysis_payload=_figure_payload(),
+                    figure_cache=cache,
+                ),
+            )
+        )
+
+    assert calls == ["interpret", "verbalize"]
+    assert results[0] == results[1]
+
+    service._interpret_figure(
+        figure_bytes=b"other png", analysis_payload=_figure_payload(), figure_cache=cache
+    )
+    service._interpret_figure(
+        figure_bytes=b"png",
+        analysis_payload=_figure_payload(caption="Figure 1.1 Revised"),
+        figure_cache=cache,
+    )
+    service.interpret_deployment = "interpret-v2"
+    service._interpret_figure(
+        figure_bytes=b"png", analysis_payload=_figure_payload(), figure_cache=cache
+    )
+
+    assert calls == ["interpret", "verbalize", "interpret", "interpret", "interpret"]
+
+
+def test_empty_verbalization_falls_back_and_is_not_cached(
+    service, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    responses = ["  ", "# Figure Summary\nOutput growth."]
+    monkeypatch.setattr(
+        service, "_responses_text", lambda **kwargs: responses.pop(0), raising=False
+    )
+    service.verbalization_deployment = "verbalize"
+    cache = _MemoryJsonCache()
+    grounded = {
+        "figure_type": "line chart",
+        "what_it_shows": "Output growth by year.",
+        "key_relationships": [],
+        "supporting_context": {},
+        "uncertainties": [],
+        "confidence_notes": "",
+    }
+
+    def verbalize() -> str:
+        return service._verbalize_figure(
+            grounded=grounded, analysis_payload=_figure_payload(), figure_cache=cache
+        )
+
+    fallback = verbalize()
+    assert fallback == service._markdown_from_grounded(
+        grounded=grounded, analysis_payload=_figure_payload()
+    )
+    assert cache.entries == {}
+
+    assert verbalize() == "# Figure Summary\nOutput growth."
+    (key,) = cache.entries
+    cache.entries[key] = {"markdown": ""}
+    responses.append("# Figure Summary\nRetried.")
+    assert verbalize() == "# Figure Summary\nRetried."
+
+
+class _MemoryBlobStore:
+    def __init__(self) -> None:
+        self.blobs: dict[tuple[str, str], bytes] = {}
+
+    def upload_json(self, *, container_name: str, blob_name: str, payload: Any) -> str:
+        self.blobs[(container_name, blob_name)] = json.dumps(payload).encode("utf-8")
+        return f"{container_name}/{blob_name}"
+
+    def blob_exists(self, *, container_name: str, blob_name: str) -> bool:
+        return (container_name, blob_name) in self.blobs
+
+    def download_bytes(self, *, container_name: str, blob_name: str) -> bytes:
+        return self.blobs[(container_name, blob_name)]
+
+
+def test_document_summary_is_reused_until_text_changes(
+    service, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[str] = []
+    monkeypatch.setattr(
+        service,
+        "_responses_text",
+        lambda **kwargs: calls.append(kwargs["user_prompt"]) or "An economic outlook.",
+        raising=False,
+    )
+    service.chat_deployment = "chat"
+    service.storage_service = _MemoryBlobStore()
+
+    summaries = [
+        service._generate_document_summary(
+            source_name="report.pdf", document_text=text, artifact_container="chunks"
+        )
+        for text in ["Output recovered.", "Output recovered.", "Output fell."]
+    ]
+
+    assert summaries == ["An economic outlook."] * 3
+    assert len(calls) == 2
+    assert list(service.storage_service.blobs) == [
+        ("chunks", "document-summary-v2/report.json")
+    ]
+
+
+def test_fused_figure_call_returns_validated_grounding_and_markdown(
+    service, service_module, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    requests: list[dict[str, Any]] = []
+    responses = [
+        {
+            "figure_type": "line chart",
+            "what_it_shows": "Output growth by year.",
+            "key_relationships": ["a", "b", "c", "d"],
+            "supporting_context": {},
+            "uncertainties": [],
+            "confidence_notes": "",
+            "markdown": "# Figure Summary\nOutput growth.",
+        },
+        {
+            "figure_type": "line chart",
+            "what_it_shows": "Output growth by year.",
+            "key_relationships": [],
+            "supporting_context": {},
+            "uncertainties": [],
+            "confidence_notes": "",
+            "markdown": "",
+        },
+        {"what_it_shows": "", "supporting_context": {}, "markdown": "# Figure Summary"},
+    ]
+    monkeypatch.setattr(
+        service,
+        "_responses_structured_with_image",
+        lambda **kwargs: requests.append(kwargs) or responses[len(requests) - 1],
+        raising=False,
+    )
+    service.interpret_deployment = "interpret"
+
+    grounded, markdown = service._interpret_and_verbalize_figure(
+        figure_bytes=b"png", analysis_payload=_figure_payload()
+    )
+    _, fallback_markdown = service._interpret_and_verbalize_figure(
+        figure_bytes=b"png", analysis_payload=_figure_payload()
+    )
+
+    assert requests[0]["json_schema"] is service_module.FIGURE_FUSED_SCHEMA
+    assert "markdown" in service_module.FIGURE_FUSED_SCHEMA["schema"]["required"]
+    assert markdown == "# Figure Summary\nOutput growth."
+    assert "markdown" not in grounded
+    assert len(grounded["key_relationships"]) == service_module.MAX_KEY_RELATIONSHIPS
+    assert fallback_markdown.startswith("# Figure Summary\n\nOutput growth by year.")
+    with pytest.raises(ValueError):
+        service._interpret_and_verbalize_figure(
+            figure_bytes=b"png", analysis_payload=_figure_payload()
+        )
+
+
+def test_template_markdown_renders_every_grounded_field(service) -> None:
+    grounded = service._validate_grounded_interpretation(
+        {
+            "figure_type": "line chart",
+            "what_it_shows": "Output growth by year.",
+            "key_relationships": ["Growth appears lower in 2020.", "Recovery follows in 2021."],
+            "supporting_context": {
+                "image_evidence": ["Line dips at 2020."],
+                "ocr_evidence": ["2019 2020 2021"],
+                "relevant_text_evidence": ["Output recovered after 2020."],
+                "surrounding_text_evidence": [],
+                "document_summary_evidence": ["An economic outlook."],
+            },
+            "uncertainties": ["Axis units are not labeled."],
+            "confidence_notes": "Values are read from the plotted line.",
+        }
+    )
+
+    markdown = service._markdown_from_grounded(
+        grounded=grounded, analysis_payload=_figure_payload()
+    )
+
+    assert markdown.splitlines() == [
+        "# Figure Summary",
+        "",
+        "Output growth by year.",
+        "",
+        "Figure type: line chart.",
+        "",
+        "## Interpretation",
+        "- Growth appears lower in 2020.",
+        "- Recovery follows in 2021.",
+        "",
+        "## Evidence",
+        "- Image: Line dips at 2020.",
+        "- OCR: 2019 2020 2021",
+        "- Associated text: Output recovered after 2020.",
+        "- Document summary: An economic outlook.",
+        "",
+        "## Context",
+        "Figure 1.1 Output growth Output recovered after 2020. An economic outlook.",
+        "",
+        "## Uncertainties",
+        "- Axis units are not labeled.",
+        "",
+        "## Confidence",
+        "Values are read from the plotted line.",
+    ]
+
+
+def test_figure_prompt_evidence_drops_geometry_and_trims_by_priority(service) -> None:
+    payload = _figure_payload(
+        bounding_regions=[{"pageNumber": 1, "polygon": [1.0, 1.0, 2.0, 1.0, 2.0, 2.0]}],
+        relevant_associated_text="Output recovered after 2020. " * 40,
+        surrounding_text="Unrelated surrounding paragraph. " * 40,
+        document_summary="An economic outlook. " * 40,
+    )
+
+    evidence = service._figure_prompt_evidence(payload, token_budget=200)
+
+    assert "bounding_regions" not in evidence
+    assert "image_artifact_uri" not in evidence
+    assert "source_url" not in evidence
+    assert evidence["caption"] == payload["caption"]
+    assert evidence["ocr_text"] == payload["ocr_text"]
+    assert evidence["relevant_associated_text"].endswith("…")
+    assert evidence["surrounding_text"] == ""
+    assert evidence["document_summary"] == ""
+    assert service._estimate_tokens(json.dumps(evidence, separators=(",", ":"))) <= 240
+
+
+def test_figure_prompt_evidence_empties_lower_priority_text_after_mid_field_cut(
+    service,
+) -> None:
+    payload = _figure_payload(
+        caption="Figure 1.1",
+        ocr_text="",
+        relevant_associated_text="Output recovered strongly after the 2020 contraction.",
+        surrounding_text="Other text.",
+        document_summary="Outlook.",
+    )
+    header_tokens = service._estimate_tokens(
+        json.dumps(
+            {
+                key: payload[key]
+                for key in ("source_name", "figure_id", "page_number", "visual_heuristics")
+            },
+            separators=(",", ":"),
+        )
+    )
+
+    evidence = service._figure_prompt_evidence(payload, token_budget=header_tokens + 3 + 8)
+
+    assert evidence["caption"] == "Figure 1.1"
+    assert evidence["relevant_associated_text"].endswith("…")
+    assert len(evidence["relevant_associated_text"]) < 32
+    assert evidence["surrounding_text"] == ""
+    assert evidence["document_summary"] == ""
+
+
+def test_figure_cache_hit_skips_image_preprocessing(
+    service, service_module, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    @dataclasses.dataclass(frozen=True)
+    class Options:
+        max_edge: int = 512
+        image_format: str = "webp"
+        quality: int = 80
+        grayscale: bool = False
+
+        @property
+        def enabled(self) -> bool:
+            return True
+
+    preprocessed: list[Options] = []
+    monkeypatch.setattr(service_module, "preprocessing_available", lambda: True)
+    monkeypatch.setattr(
+        service_module,
+        "preprocess_image",
+        lambda data, options, **kwargs: preprocessed.append(options) or (b"small", "image/webp"),
+    )
+    sent: list[tuple[bytes, str]] = []
+    monkeypatch.setattr(
+        service,
+        "_responses_structured_with_image",
+        lambda **kwargs: sent.append((kwargs["image_bytes"], kwargs["mime_type"]))
+        or {
+            "figure_type": "line chart",
+            "what_it_shows": "Output growth by year.",
+            "key_relationships": [],
+            "supporting_context": {},
+            "uncertainties": [],
+            "confidence_notes": "",
+        },
+        raising=False,
+    )
+    service.interpret_deployment = "interpret"
+    cache = _MemoryJsonCache()
+
+    for options in (Options(), Options(), Options(max_edge=256)):
+        service._interpret_figure(
+            figure_bytes=b"png",
+            analysis_payload=_figure_payload(),
+            figure_cache=cache,
+            image_preprocess=options,
+        )
+
+    assert preprocessed == [Options(), Options(max_edge=256)]
+    assert sent == [(b"small", "image/webp")] * 2
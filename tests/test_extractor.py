@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.services.document_intelligence.extractor import render_raw_payload  # noqa: E402
+
+
+def _span(offset: int, length: int) -> dict:
+    return {"offset": offset, "length": length}
+
+
+def test_text_derived_from_markdown_rebases_spans_onto_text() -> None:
+    markdown = "# Title\n\nHello world\n\n| a | b |"
+    payload = {
+        "contentFormat": "markdown",
+        "content": markdown,
+        "pages": [
+            {
+                "pageNumber": 1,
+                "spans": [_span(0, len(markdown))],
+                "lines": [
+                    {"content": "Title", "spans": [_span(2, 5)]},
+                    {"content": "Hello world", "spans": [_span(9, 11)]},
+                    {"content": "a", "spans": [_span(24, 1)]},
+                    {"content": "b", "spans": [_span(28, 1)]},
+                ],
+                "words": [{"content": "world", "span": _span(15, 5)}],
+            }
+        ],
+        "paragraphs": [
+            {"content": "Title", "spans": [_span(0, 7)]},
+            {"content": "Hello world", "spans": [_span(9, 11)]},
+        ],
+        "tables": [
+            {
+                "rowCount": 1,
+                "columnCount": 2,
+                "spans": [_span(22, 9)],
+                "cells": [
+                    {"rowIndex": 0, "columnIndex": 1, "content": "b", "spans": [_span(28, 1)]},
+                    {"rowIndex": 0, "columnIndex": 0, "content": "", "spans": [_span(30, 1)]},
+                ],
+            }
+        ],
+    }
+
+    rendered = render_raw_payload(payload, "text")
+
+    def text_at(span_value: dict) -> str:
+        return rendered["content"][span_value["offset"] : span_value["offset"] + span_value["length"]]
+
+    assert rendered["content"] == "Title\nHello world\na\nb"
+    assert rendered["derivedFrom"] == "markdown"
+    assert [text_at(paragraph["spans"][0]) for paragraph in rendered["paragraphs"]] == [
+        "Title",
+        "Hello world",
+    ]
+    assert text_at(rendered["pages"][0]["words"][0]["span"]) == "world"
+    assert text_at(rendered["tables"][0]["spans"][0]) == "a\nb"
+    assert text_at(rendered["tables"][0]["cells"][0]["spans"][0]) == "b"
+    assert rendered["tables"][0]["cells"][1]["spans"] == []
+    assert text_at(rendered["pages"][0]["spans"][0]) == rendered["content"]
+    assert payload["paragraphs"][0]["spans"] == [_span(0, 7)]
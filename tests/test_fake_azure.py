@@ -0,0 +1,287 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.pipelines import (  # noqa: E402
+    DirectPipeline,
+    DirectPipelineOptions,
+    LayoutNoSkillPipeline,
+    LayoutNoSkillPipelineOptions,
+    LayoutNoSkillV2Pipeline,
+    LayoutNoSkillV2PipelineOptions,
+)
+from src.services.document_intelligence.service import DocumentIntelligenceService  # noqa: E402
+from src.services.document_layout_no_skill import DocumentLayoutNoSkillService  # noqa: E402
+from src.services.openai.service import OpenAIService, OpenAIServiceError  # noqa: E402
+from src.services.storage_account import AzureStorageAccountService  # noqa: E402
+from src.telemetry import trace_run  # noqa: E402
+from src.testing import (  # noqa: E402
+    FakeAzureServer,
+    FakeAzureSettings,
+    FaultProfile,
+    sample_from_schema,
+    synthetic_png,
+)
+
+DEMO_PDF = REPO_ROOT / "documents" / "demo_files" / "world_economic_outlook_page_20.pdf"
+
+
+@pytest.fixture
+def fake_azure(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    def start(settings: FakeAzureSettings | None = None) -> FakeAzureServer:
+        server = FakeAzureServer(settings).start()
+        for name, value in server.environment().items():
+            monkeypatch.setenv(name, value)
+        monkeypatch.chdir(tmp_path)
+        servers.append(server)
+        return server
+
+    servers: list[FakeAzureServer] = []
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def test_sample_from_schema_fills_required_structure() -> None:
+    schema = {
+        "type": "object",
+        "properties": {
+            "kind": {"type": "string", "enum": ["line", "bar"]},
+            "points": {"type": "array", "items": {"type": "number"}, "minItems": 2},
+            "note": {"anyOf": [{"type": "null"}, {"type": "string"}]},
+        },
+    }
+
+    assert sample_from_schema(schema) == {
+        "kind": "line",
+        "points": [0.5, 0.5],
+        "note": "synthetic note",
+    }
+
+
+def test_document_intelligence_round_trip_through_sdk(fake_azure) -> None:
+    fake_azure(FakeAzureSettings(pages=3, figures_per_page=2))
+    service = DocumentIntelligenceService()
+    result, operation_id = service.analyze_file_with_figures(path=DEMO_PDF)
+    figure = service.client.get_analyze_result_figure(
+        model_id="prebuilt-layout", result_id=operation_id, figure_id=result.figures[0].id
+    )
+
+    assert len(result.pages) == 3
+    assert [item.id for item in result.figures][:2] == ["1.1", "1.2"]
+    assert result.figures[0].caption.content.startswith("Figure 1.1")
+    assert b"".join(figure) == synthetic_png()
+
+
+def test_document_intelligence_replays_recorded_results(fake_azure) -> None:
+    recorded = {"modelId": "prebuilt-layout", "content": "Recorded", "pages": [{"pageNumber": 1}]}
+    fake_azure(FakeAzureSettings(di_results=(recorded,)))
+    result = DocumentIntelligenceService().analyze_file(DEMO_PDF)
+
+    assert result.content == "Recorded"
+
+
+def test_blob_storage_round_trip_through_sdk(fake_azure) -> None:
+    server = fake_azure()
+    env = server.environment()
+    service = AzureStorageAccountService(
+        endpoint=env["AZURE_STORAGE_BLOB_ENDPOINT"], api_key=env["AZURE_STORAGE_BLOB_API_KEY"]
+    )
+    service.ensure_container("chunks")
+    service.upload_bytes(container_name="chunks", blob_name="a/one.bin", data=b"payload")
+    service.upload_stream(
+        container_name="chunks", blob_name="a/two.bin", chunks=iter([b"par", b"ts"])
+    )
+
+    assert service.download_bytes(container_name="chunks", blob_name="a/one.bin") == b"payload"
+    assert server.blob("chunks", "a/two.bin") == b"parts"
+    assert service.list_blobs(container_name="chunks", prefix="a/") == ["a/one.bin", "a/two.bin"]
+    assert not service.blob_exists(container_name="chunks", blob_name="missing.bin")
+
+
+def test_layout_no_skill_v2_runs_end_to_end_offline(fake_azure) -> None:
+    server = fake_azure(FakeAzureSettings(embedding_dimensions=8))
+    payload = LayoutNoSkillV2Pipeline().run(
+        LayoutNoSkillV2PipelineOptions(
+            src=str(DEMO_PDF),
+            demo=False,
+            chunk_container="chunks",
+            name_prefix="offline",
+            chunk_size=500,
+            chunk_overlap=50,
+            content_format="markdown",
+            hard_refresh=True,
+        )
+    )
+
+    documents = server.search_documents(payload["target_index"])
+    assert payload["record_count"] == len(documents) > 0
+    assert {record["metadata"]["source_type"] for record in payload["records"]} == {"text", "image"}
+    assert payload["usage"]["run"]["openai"]["fake-embedding"]["calls"] > 0
+    assert server.stats()["requests"]["document_intelligence"] > 0
+
+
+def test_injected_errors_surface_as_service_errors(fake_azure) -> None:
+    server = fake_azure(
+        FakeAzureSettings(faults={"openai": FaultProfile(error_rate=1.0, error_status=429)})
+    )
+    with pytest.raises(OpenAIServiceError) as excinfo:
+        OpenAIService().embeddings(text="hello")
+
+    assert excinfo.value.status_code == 429
+    assert server.stats()["injected_errors"]["openai"] == 1
+
+
+def test_layout_no_skill_vision_cache_skips_figure_calls_on_rechunk(fake_azure, tmp_path: Path) -> None:
+    server = fake_azure(FakeAzureSettings(vision_embedding_dimensions=8))
+
+    def run(chunk_size: int) -> dict:
+        return LayoutNoSkillPipeline().run(
+            LayoutNoSkillPipelineOptions(
+                src=str(DEMO_PDF),
+                demo=False,
+                chunk_container="chunks",
+                name_prefix="offline",
+                chunk_size=chunk_size,
+                chunk_overlap=50,
+                hard_refresh=True,
+                cache_dir=str(tmp_path / "cache"),
+            )
+        )
+
+    first = run(500)
+    second = run(400)
+
+    assert first["usage"]["run"]["vision"]["analyze"]["calls"] > 0
+    assert "analyze" not in second["usage"]["run"]["vision"]
+    assert "retrieval:vectorizeImage" not in second["usage"]["run"]["vision"]
+    assert second["record_count"] == len(server.search_documents(second["target_index"])) > 0
+
+
+def test_layout_no_skill_sidecar_follows_json_artifact_without_blob_storage(
+    fake_azure, tmp_path: Path
+) -> None:
+    fake_azure()
+    service = DocumentLayoutNoSkillService()
+    service.storage_service = None
+    records = [{"id": "a", "content": "text", "contentVector": [0.5, 1.5]}]
+
+    artifact_path = service._write_source_artifact(
+        container_name="chunks",
+        source_path=Path("report.pdf"),
+        records=records,
+        artifact_vectors="sidecar",
+    )
+
+    assert (tmp_path / artifact_path).exists()
+    assert (tmp_path / "local_documents" / "chunks" / "report.vectors.npy").exists()
+    with pytest.raises(ValueError, match="Blob storage is required"):
+        service._write_binary_artifact(
+            container_name="chunks",
+            blob_name="figures/1.png",
+            data=synthetic_png(),
+            content_type="image/png",
+        )
+
+
+def test_layout_no_skill_concurrent_figures_match_sequential_records(fake_azure) -> None:
+    fake_azure(FakeAzureSettings(figures_per_page=2, vision_embedding_dimensions=8))
+
+    def records(figure_workers: int) -> list[tuple[str, str, list[float]]]:
+        payload = LayoutNoSkillPipeline().run(
+            LayoutNoSkillPipelineOptions(
+                src=str(DEMO_PDF),
+                demo=False,
+                chunk_container="chunks",
+                name_prefix="offline",
+                chunk_size=500,
+                chunk_overlap=50,
+                hard_refresh=True,
+                figure_workers=figure_workers,
+            )
+        )
+        return [
+            (record["id"], record["content"], record["contentVector"])
+            for record in payload["records"]
+        ]
+
+    with trace_run() as tracer:
+        sequential = records(0)
+    concurrent = records(4)
+
+    assert concurrent == sequential
+    assert sum(1 for record_id, _, _ in concurrent if "image" in record_id) >= 2
+    events = [event for event in tracer.chrome_trace()["traceEvents"] if event["ph"] == "X"]
+    pipeline_tid = next(event["tid"] for event in events if event["name"] == "pipeline")
+    figure_call_tids = [
+        event["tid"]
+        for event in events
+        if event["name"] == "vision.request"
+        and event["args"]["route"] in ("analyze", "retrieval:vectorizeImage")
+    ]
+    # Even one figure at a time, each figure's Vision calls leave the calling thread.
+    assert figure_call_tids and pipeline_tid not in figure_call_tids
+
+
+def test_direct_pipeline_renders_formats_in_worker_processes(fake_azure) -> None:
+    fake_azure(FakeAzureSettings(pages=2))
+
+    def render(cpu_workers: int) -> dict:
+        payloads = DirectPipeline().run_formats(
+            DirectPipelineOptions(
+                src=str(DEMO_PDF),
+                model_id="prebuilt-layout",
+                content_format="markdown",
+                extra_content_formats=("text", "html"),
+                cpu_workers=cpu_workers,
+            )
+        )
+        return {
+            content_format: {key: value for key, value in payload.items() if key not in ("perf", "usage")}
+            for content_format, payload in payloads.items()
+        }
+
+    inline = render(0)
+    pooled = render(2)
+
+    assert pooled == inline
+    assert list(pooled) == ["markdown", "text", "html"]
+    assert pooled["html"]["content"] != pooled["text"]["content"]
+
+
+def test_layout_no_skill_v2_template_mode_needs_no_verbalization_deployment(
+    fake_azure, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from src.services.document_layout_no_skill_v2 import service as v2_service
+
+    server = fake_azure(FakeAzureSettings(embedding_dimensions=8))
+    config = {
+        **v2_service.get_config(),
+        "openai_chat_deployment": None,
+        "openai_verbalization_deployment": None,
+    }
+    monkeypatch.setattr(v2_service, "get_config", lambda: config)
+
+    with pytest.raises(ValueError, match="AZURE_OPENAI_VERBALIZATION_DEPLOYMENT"):
+        v2_service.DocumentLayoutNoSkillV2Service()
+    payload = LayoutNoSkillV2Pipeline().run(
+        LayoutNoSkillV2PipelineOptions(
+            src=str(DEMO_PDF),
+            demo=False,
+            chunk_container="chunks",
+            name_prefix="offline",
+            chunk_size=500,
+            chunk_overlap=50,
+            content_format="markdown",
+            hard_refresh=True,
+            figure_verbalization="template",
+        )
+    )
+
+    assert payload["record_count"] == len(server.search_documents(payload["target_index"])) > 0
+    assert "image" in {record["metadata"]["source_type"] for record in payload["records"]}
@@ -0,0 +1,77 @@
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.services.shared import ImagePreprocessOptions, preprocess_image  # noqa: E402
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+
+def _chart_png(width: int = 2400, height: int = 1200) -> bytes:
+    image = Image.new("RGBA", (width, height), (255, 255, 255, 0))
+    draw = ImageDraw.Draw(image)
+    for index in range(40):
+        left = 60 + index * 58
+        draw.rectangle(
+            (left, height - 40 - index * 25, left + 40, height - 40),
+            fill=(30 + index * 5, 90, 200 - index * 4, 255),
+        )
+        draw.text((left, height - 30), str(2000 + index), fill=(0, 0, 0, 255))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_disabled_options_return_original_png() -> None:
+    original = _chart_png(200, 100)
+
+    assert preprocess_image(original, ImagePreprocessOptions()) == (original, "image/png")
+
+
+def test_downscale_and_reencode_shrinks_payload() -> None:
+    original = _chart_png()
+    data, content_type = preprocess_image(
+        original, ImagePreprocessOptions(max_edge=1024, image_format="webp", quality=80)
+    )
+
+    with Image.open(io.BytesIO(data)) as image:
+        assert image.format == "WEBP"
+        assert image.size == (1024, 512)
+    assert content_type == "image/webp"
+    assert len(data) < len(original)
+
+
+def test_jpeg_grayscale_flattens_transparency() -> None:
+    data, content_type = preprocess_image(
+        _chart_png(),
+        ImagePreprocessOptions(max_edge=600, image_format="jpeg", grayscale=True),
+    )
+
+    with Image.open(io.BytesIO(data)) as image:
+        assert image.format == "JPEG"
+        assert image.mode == "L"
+        assert image.size == (600, 300)
+        assert image.getpixel((0, 0)) > 240
+    assert content_type == "image/jpeg"
+
+
+def test_reencoding_that_grows_keeps_original() -> None:
+    original = _chart_png(8, 8)
+
+    assert preprocess_image(
+        original, ImagePreprocessOptions(image_format="webp", quality=100)
+    ) == (original, "image/png")
+
+
+def test_invalid_options_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        ImagePreprocessOptions(image_format="gif")
+    with pytest.raises(ValueError):
+        ImagePreprocessOptions(quality=0)
@@ -0,0 +1,23 @@
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.storage import LocalJsonCache  # noqa: E402
+
+
+def test_prune_evicts_least_recently_used_entries(tmp_path: Path) -> None:
+    cache = LocalJsonCache("vision", root=tmp_path)
+    for index, key in enumerate(["a", "b", "c"]):
+        path = Path(cache.set(key, {"response": key}))
+        os.utime(path, (1_000 + index, 1_000 + index))
+
+    assert cache.get("a") == {"response": "a"}
+    assert cache.prune(2) == 1
+    assert cache.get("b") is None
+    assert cache.get("a") == {"response": "a"}
+    assert cache.get("c") == {"response": "c"}
+    assert cache.prune(2) == 0
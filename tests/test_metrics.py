@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+from urllib.request import urlopen
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.telemetry import (  # noqa: E402
+    MetricsHttpServer,
+    MetricsRegistry,
+    count_metric,
+    metrics_run,
+    span,
+)
+
+
+def test_registry_renders_counters_and_cumulative_histograms() -> None:
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.inc("remote_errors_total", backend="openai", status=429)
+    registry.inc("remote_errors_total", backend="openai", status=429)
+    registry.observe("remote_call_seconds", 0.05, backend="search")
+    registry.observe("remote_call_seconds", 0.5, backend="search")
+    registry.observe("remote_call_seconds", 5.0, backend="search")
+
+    text = registry.render()
+
+    assert '# TYPE document_reader_remote_errors_total counter' in text
+    assert 'document_reader_remote_errors_total{backend="openai",status="429"} 2' in text
+    assert 'document_reader_remote_call_seconds_bucket{backend="search",le="0.1"} 1' in text
+    assert 'document_reader_remote_call_seconds_bucket{backend="search",le="1"} 2' in text
+    assert 'document_reader_remote_call_seconds_bucket{backend="search",le="+Inf"} 3' in text
+    assert 'document_reader_remote_call_seconds_sum{backend="search"} 5.55' in text
+    assert 'document_reader_remote_call_seconds_count{backend="search"} 3' in text
+
+
+def test_metrics_run_feeds_spans_and_writes_textfile(tmp_path: Path) -> None:
+    textfile = tmp_path / "document_reader.prom"
+
+    with metrics_run(textfile=str(textfile)):
+        with span("source", source="report.pdf"):
+            with span("search.request", method="POST", path="/indexes/rag/docs/index"):
+                pass
+        with pytest.raises(ValueError):
+            with span("source", source="broken.pdf"):
+                raise ValueError("boom")
+        count_metric("records_uploaded_total", 12, index="rag")
+
+    text = textfile.read_text(encoding="utf-8")
+    assert 'document_reader_sources_total{status="ok"} 1' in text
+    assert 'document_reader_sources_total{status="error"} 1' in text
+    assert 'document_reader_records_uploaded_total{index="rag"} 12' in text
+    assert 'document_reader_remote_call_seconds_count{backend="search"} 1' in text
+
+    count_metric("records_uploaded_total", 1, index="rag")
+    assert textfile.read_text(encoding="utf-8") == text
+
+
+def test_http_server_serves_metrics_endpoint() -> None:
+    registry = MetricsRegistry()
+    registry.inc("cache_requests_total", namespace="document-intelligence-raw", result="hit")
+    server = MetricsHttpServer(registry, port=0)
+    server.start()
+    try:
+        with urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as resp:
+            body = resp.read().decode("utf-8")
+            content_type = resp.headers["Content-Type"]
+    finally:
+        server.stop()
+
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert (
+        'document_reader_cache_requests_total{namespace="document-intelligence-raw",result="hit"} 1'
+        in body
+    )
@@ -0,0 +1,90 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.pipelines import LayoutNoSkillV2Pipeline, LayoutNoSkillV2PipelineOptions  # noqa: E402
+from src.serialization import dumps, loads  # noqa: E402
+from src.services.openai import OpenAIBatchPending, openai_batch_run  # noqa: E402
+from src.services.openai.service import OpenAIService, OpenAIServiceError  # noqa: E402
+from src.testing import FakeAzureServer, FakeAzureSettings, fulfill_openai_batch  # noqa: E402
+
+DEMO_PDF = REPO_ROOT / "documents" / "demo_files" / "world_economic_outlook_page_20.pdf"
+
+
+@pytest.fixture
+def fake_azure(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    server = FakeAzureServer(FakeAzureSettings(embedding_dimensions=8)).start()
+    for name, value in server.environment().items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.chdir(tmp_path)
+    yield server
+    server.stop()
+
+
+def test_layout_no_skill_v2_completes_from_batch_results(fake_azure, tmp_path: Path) -> None:
+    batch_dir = tmp_path / "batch"
+    options = LayoutNoSkillV2PipelineOptions(
+        src=str(DEMO_PDF),
+        demo=False,
+        chunk_container="chunks",
+        name_prefix="batch",
+        chunk_size=500,
+        chunk_overlap=50,
+        content_format="markdown",
+        hard_refresh=True,
+        openai_batch_dir=str(batch_dir),
+    )
+
+    passes = 0
+    payload = LayoutNoSkillV2Pipeline().run(options)
+    while payload["openai_batch"]["pending"]:
+        assert payload["status"] == "openai-batch-pending"
+        assert payload["records"] == []
+        for input_file in payload["openai_batch"]["input_files"]:
+            fulfill_openai_batch(
+                input_file,
+                batch_dir / "results" / Path(input_file).name,
+                FakeAzureSettings(embedding_dimensions=8),
+            )
+        passes += 1
+        assert passes < 6
+        extraction_requests = fake_azure.stats()["requests"]["document_intelligence"]
+        payload = LayoutNoSkillV2Pipeline().run(options)
+
+    stats = fake_azure.stats()["requests"]
+    assert passes >= 2
+    assert payload["record_count"] == len(fake_azure.search_documents(payload["target_index"])) > 0
+    assert {record["metadata"]["source_type"] for record in payload["records"]} == {"text", "image"}
+    assert stats.get("openai", 0) == 0
+    assert stats["document_intelligence"] == extraction_requests
+
+
+def test_batch_result_errors_surface_as_service_errors(fake_azure, tmp_path: Path) -> None:
+    with openai_batch_run(tmp_path) as batch:
+        with pytest.raises(OpenAIBatchPending):
+            OpenAIService().embeddings(text="hello")
+        batch.write_input()
+    (input_file,) = (tmp_path / "input").glob("*.jsonl")
+    custom_id = loads(input_file.read_text(encoding="utf-8"))["custom_id"]
+    (tmp_path / "results").mkdir()
+    (tmp_path / "results" / "out.jsonl").write_text(
+        dumps(
+            {
+                "custom_id": custom_id,
+                "response": {"status_code": 429, "body": {"error": {"code": "429"}}},
+                "error": None,
+            }
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+    with openai_batch_run(tmp_path), pytest.raises(OpenAIServiceError) as excinfo:
+        OpenAIService().embeddings(text="hello")
+
+    assert excinfo.value.status_code == 429
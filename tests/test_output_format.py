@@ -0,0 +1,58 @@
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture
+def output_format():
+    from src.storage import output_format
+
+    return output_format
+
+
+def _payload() -> dict:
+    records = [
+        {"id": f"doc_text_{ordinal}", "content": f"chunk {ordinal}", "contentVector": [0.1, 0.2]}
+        for ordinal in range(1, 4)
+    ]
+    return {"pipeline": "document-layout-no-skill-v2", "target_index": "rag-index", "records": records}
+
+
+def test_compact_payload_replaces_vectors_with_index_reference(output_format) -> None:
+    payload = _payload()
+
+    compacted = output_format.compact_payload(payload, "ref")
+
+    assert compacted["records"][0]["contentVector"] == {
+        "$ref": {"index": "rag-index", "key": "doc_text_1", "field": "contentVector"}
+    }
+    assert payload["records"][0]["contentVector"] == [0.1, 0.2]
+    assert "contentVector" not in output_format.compact_payload(payload, "none")["records"][0]
+
+
+def test_ndjson_gz_streams_summary_then_records(output_format) -> None:
+    data = b"".join(
+        output_format.encode_output(_payload(), output_format="ndjson.gz", output_vectors="none")
+    )
+
+    lines = [json.loads(line) for line in gzip.decompress(data).decode("utf-8").splitlines()]
+
+    assert lines[0]["record_count"] == 3
+    assert "records" not in lines[0]
+    assert [line["id"] for line in lines[1:]] == ["doc_text_1", "doc_text_2", "doc_text_3"]
+    assert all("contentVector" not in line for line in lines[1:])
+
+
+def test_output_path_for_format_swaps_json_suffix(output_format) -> None:
+    assert (
+        output_format.output_path_for_format("layout-no-skill/run.json", "ndjson.gz")
+        == "layout-no-skill/run.ndjson.gz"
+    )
+    assert output_format.output_path_for_format("run.json", "json") == "run.json"
@@ -0,0 +1,81 @@
+import sys
+import threading
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.telemetry import (  # noqa: E402
+    PerfRecorder,
+    active_recorder,
+    active_tracer,
+    perf_run,
+    span,
+    trace_run,
+)
+
+
+def test_summary_reports_count_total_percentiles_and_max() -> None:
+    recorder = PerfRecorder()
+    for seconds in (0.1, 0.2, 0.3, 0.4, 1.0):
+        recorder.record("embedding", seconds)
+    recorder.record("figure.ocr", 0.05)
+
+    summary = recorder.summary()
+
+    assert list(summary["stages"]) == ["embedding", "figure.ocr"]
+    assert summary["stages"]["embedding"] == {
+        "count": 5,
+        "total_s": 2.0,
+        "p50_s": 0.3,
+        "p95_s": 0.88,
+        "max_s": 1.0,
+    }
+    assert summary["stages"]["figure.ocr"]["count"] == 1
+
+
+def test_spans_record_only_inside_a_run_and_across_threads() -> None:
+    with span("outside"):
+        pass
+    assert active_recorder() is None
+
+    def work() -> None:
+        with span("blob.write"):
+            pass
+
+    with perf_run() as perf:
+        workers = [threading.Thread(target=work) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        with span("search.upload"), span("search.upload"):
+            pass
+
+    stages = perf.summary()["stages"]
+    assert active_recorder() is None
+    assert "outside" not in stages
+    assert stages["blob.write"]["count"] == 8
+    assert stages["search.upload"]["count"] == 2
+
+
+def test_trace_run_exports_nested_spans_as_chrome_trace_events() -> None:
+    with trace_run() as tracer:
+        with span("pipeline", pipeline="layout-no-skill-v2"):
+            with span("figure", source="report.pdf") as figure_span:
+                figure_span["figure_id"] = "1.1"
+                with span("openai.request", path="/responses"):
+                    pass
+
+    trace = tracer.chrome_trace()
+    spans = {event["name"]: event for event in trace["traceEvents"] if event["ph"] == "X"}
+
+    assert active_tracer() is None
+    assert any(event["ph"] == "M" and event["name"] == "thread_name" for event in trace["traceEvents"])
+    assert spans["pipeline"]["args"]["parent_id"] is None
+    assert spans["figure"]["args"]["parent_id"] == spans["pipeline"]["args"]["span_id"]
+    assert spans["figure"]["args"]["figure_id"] == "1.1"
+    assert spans["openai.request"]["args"]["parent_id"] == spans["figure"]["args"]["span_id"]
+    assert spans["openai.request"]["tid"] == threading.get_ident()
+    assert spans["pipeline"]["dur"] >= spans["figure"]["dur"] >= spans["openai.request"]["dur"]
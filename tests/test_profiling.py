@@ -0,0 +1,49 @@
+import pstats
+import sys
+import tracemalloc
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.telemetry import profile_path_for_output, profile_run, span  # noqa: E402
+
+
+def _inside_stage() -> int:
+    return sum(range(5000))
+
+
+def _outside_stage() -> int:
+    return sum(range(5000))
+
+
+def test_cprofile_is_scoped_to_requested_stages(tmp_path: Path) -> None:
+    with profile_run("cprofile", ("chunking",)) as profile:
+        _outside_stage()
+        with span("chunking"):
+            _inside_stage()
+        with span("figure.ocr"):
+            _outside_stage()
+
+    functions = [row["function"] for row in profile.summary()["top_cumulative"]]
+    assert any(function.endswith("(_inside_stage)") for function in functions)
+    assert not any(function.endswith("(_outside_stage)") for function in functions)
+
+    output_path = str(tmp_path / "layout-no-skill-v2_demo.json")
+    path = profile.dump(profile_path_for_output(output_path, "cprofile"))
+    assert path.endswith("layout-no-skill-v2_demo.prof")
+    assert pstats.Stats(path).total_calls > 0
+
+
+def test_tracemalloc_reports_allocation_sites_and_dumps_snapshot(tmp_path: Path) -> None:
+    with profile_run("tracemalloc") as profile:
+        retained = [bytearray(1024) for _ in range(256)]
+
+    top = profile.summary()["top_allocations"]
+    assert top[0]["site"].startswith(__file__)
+    assert top[0]["size_kib"] >= 256
+    assert len(retained) == 256
+
+    path = profile.dump(tmp_path / "run.tracemalloc")
+    assert tracemalloc.Snapshot.load(path).traces
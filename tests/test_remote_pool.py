@@ -0,0 +1,60 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.services.shared import RemoteCallPool  # noqa: E402
+from src.telemetry import span, trace_run  # noqa: E402
+
+
+def test_remote_call_pool_caps_each_backend() -> None:
+    lock = threading.Lock()
+    in_flight = {"vision": 0, "document_intelligence": 0}
+    peak = {"vision": 0, "document_intelligence": 0}
+
+    def call(backend: str) -> str:
+        with lock:
+            in_flight[backend] += 1
+            peak[backend] = max(peak[backend], in_flight[backend])
+        time.sleep(0.02)
+        with lock:
+            in_flight[backend] -= 1
+        return backend
+
+    with RemoteCallPool(8, limits={"vision": 2, "document_intelligence": 1}) as pool:
+        futures = [
+            pool.submit(backend, call, backend)
+            for backend in ["vision", "document_intelligence"] * 6
+        ]
+        results = [future.result() for future in futures]
+
+    assert results == ["vision", "document_intelligence"] * 6
+    assert peak == {"vision": 2, "document_intelligence": 1}
+
+
+def test_remote_call_pool_keeps_span_parent_and_runs_inline_when_disabled() -> None:
+    def request() -> None:
+        with span("vision.request"):
+            pass
+
+    with trace_run() as tracer, RemoteCallPool(2) as pool:
+        with span("figure"):
+            pool.submit("vision", request).result()
+
+    events = {event["name"]: event for event in tracer.chrome_trace()["traceEvents"]}
+    assert events["vision.request"]["args"]["parent_id"] == events["figure"]["args"]["span_id"]
+    assert events["vision.request"]["tid"] != events["figure"]["tid"]
+
+    inline = RemoteCallPool(0)
+    assert inline.submit("vision", threading.get_ident).result() == threading.get_ident()
+
+
+def test_remote_call_pool_rejects_negative_workers() -> None:
+    with pytest.raises(ValueError, match="zero or positive"):
+        RemoteCallPool(-1)
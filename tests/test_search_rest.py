@@ -0,0 +1,62 @@
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.conf import get_config  # noqa: E402
+from src.services.shared.search_rest import encode_search_body  # noqa: E402
+
+
+def _upload_body(record_count: int) -> dict:
+    return {
+        "value": [
+            {
+                "@search.action": "mergeOrUpload",
+                "id": f"doc-text-{index:04d}",
+                "contentVector": [round(0.001 * index * dim, 6) for dim in range(64)],
+            }
+            for index in range(record_count)
+        ]
+    }
+
+
+def test_encode_search_body_compresses_large_upload_batches() -> None:
+    body = _upload_body(50)
+
+    data, headers = encode_search_body(body, gzip_min_bytes=1024)
+
+    assert headers == {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    plain = gzip.decompress(data)
+    assert json.loads(plain) == body
+    assert len(data) < len(plain)
+
+
+def test_encode_search_body_leaves_small_or_disabled_bodies_plain() -> None:
+    small, small_headers = encode_search_body({"value": []}, gzip_min_bytes=1024)
+    disabled, disabled_headers = encode_search_body(_upload_body(50), gzip_min_bytes=None)
+    empty, empty_headers = encode_search_body(None, gzip_min_bytes=1)
+
+    assert json.loads(small) == {"value": []}
+    assert "Content-Encoding" not in small_headers
+    assert json.loads(disabled) == _upload_body(50)
+    assert "Content-Encoding" not in disabled_headers
+    assert empty is None
+    assert empty_headers == {"Content-Type": "application/json"}
+
+
+@pytest.mark.parametrize("raw, message", [("64k", "whole number"), ("-1", "zero or positive")])
+def test_gzip_min_bytes_config_rejects_invalid_values(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, raw: str, message: str
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT", "https://example.invalid")
+    monkeypatch.setenv("AZURE_AI_SEARCH_GZIP_MIN_BYTES", raw)
+
+    with pytest.raises(ValueError, match=f"AZURE_AI_SEARCH_GZIP_MIN_BYTES must be .*{message}"):
+        get_config()
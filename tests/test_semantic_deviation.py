@@ -75,6 +75,22 @@ def _load_semantic_snapshots(snapshot_dir: Path) -> list[SnapshotPayload]:
         records = raw.get("records") or []
         if not isinstance(records, list) or not records:
             continue
+        sidecar = raw.get("vectorSidecar")
+        if sidecar:
+            # Vectors live in a float32 .npy next to the slim snapshot; map it instead of parsing floats.
+            vectors = np.load(path.parent / sidecar["path"], mmap_mode="r")
+            row_field = f"{sidecar.get('field') or 'vector'}Row"
+            records = [
+                {
+                    **record,
+                    "vector": (
+                        vectors[record[row_field]]
+                        if record.get(row_field) is not None
+                        else []
+                    ),
+                }
+                for record in records
+            ]
         payloads.append(
             {
                 "snapshot_file": path.name,
@@ -88,11 +104,13 @@ def _load_semantic_snapshots(snapshot_dir: Path) -> list[SnapshotPayload]:
                         "page_number": record.get("page_number"),
                         "markdown": str(record.get("markdown") or ""),
                         "vector": [
-                            float(value) for value in (record.get("vector") or [])
+                            float(value) for value in record["vector"]
                         ],
                     }
                     for record in records
-                    if record.get("record_id") and record.get("vector")
+                    if record.get("record_id")
+                    and record.get("vector") is not None
+                    and len(record["vector"]) > 0
                 ],
             }
         )
@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.serialization import StdlibJsonCodec, json_codec  # noqa: E402
+
+CODECS = [StdlibJsonCodec()]
+if json_codec.orjson is not None:
+    CODECS.append(json_codec.OrjsonCodec())
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+def test_codec_round_trips_records_with_numpy_vectors(codec) -> None:
+    payload = {
+        "id": "doc-text-0001",
+        "content": "Überblick – café",
+        "contentVector": np.asarray([0.5, 0.25, -1.0], dtype=np.float32),
+        "page": np.int64(3),
+    }
+
+    encoded = codec.dumps_bytes(payload)
+
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == {
+        "id": "doc-text-0001",
+        "content": "Überblick – café",
+        "contentVector": [0.5, 0.25, -1.0],
+        "page": 3,
+    }
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+def test_codec_indent_and_sort_keys(codec) -> None:
+    encoded = codec.dumps_bytes({"b": 1, "a": [1, 2]}, indent=True, sort_keys=True)
+
+    assert encoded.decode("utf-8") == '{\n  "a": [\n    1,\n    2\n  ],\n  "b": 1\n}'
+
+
+def test_set_codec_by_name_switches_module_functions() -> None:
+    previous = json_codec.get_codec()
+    try:
+        assert json_codec.set_codec("json").name == "json"
+        assert json_codec.dumps({"a": 1}) == '{"a":1}'
+    finally:
+        json_codec.set_codec(previous)
@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.telemetry import (  # noqa: E402
+    active_usage,
+    record_document_intelligence_pages,
+    record_openai_usage,
+    record_vision_call,
+    usage_run,
+    usage_source,
+)
+
+
+def test_usage_is_totalled_per_run_and_split_per_source() -> None:
+    record_vision_call("outside-run")
+
+    with usage_run() as usage:
+        record_document_intelligence_pages("prebuilt-layout", 12)
+        with usage_source("report.pdf"):
+            record_openai_usage(
+                "gpt-4.1", {"input_tokens": 900, "output_tokens": 120, "total_tokens": 1020}
+            )
+            record_openai_usage("text-embedding-3-large", {"prompt_tokens": 40, "total_tokens": 40})
+            record_document_intelligence_pages("prebuilt-read", 1)
+        with usage_source("notes.json"):
+            record_openai_usage("text-embedding-3-large", {"prompt_tokens": 10, "total_tokens": 10})
+            record_vision_call("retrieval:vectorizeText")
+
+    summary = usage.summary()
+    run = summary["run"]
+
+    assert active_usage() is None
+    assert run["openai"]["gpt-4.1"] == {
+        "calls": 1,
+        "prompt_tokens": 900,
+        "completion_tokens": 120,
+        "total_tokens": 1020,
+    }
+    assert run["openai"]["text-embedding-3-large"]["calls"] == 2
+    assert run["openai"]["text-embedding-3-large"]["prompt_tokens"] == 50
+    assert run["document_intelligence"] == {
+        "prebuilt-layout": {"calls": 1, "pages": 12},
+        "prebuilt-read": {"calls": 1, "pages": 1},
+    }
+    assert run["vision"] == {"retrieval:vectorizeText": {"calls": 1}}
+    assert "prebuilt-layout" not in summary["sources"]["report.pdf"]["document_intelligence"]
+    assert summary["sources"]["notes.json"]["openai"]["text-embedding-3-large"]["total_tokens"] == 10
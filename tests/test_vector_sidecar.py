@@ -0,0 +1,42 @@
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def vector_sidecar():
+    module_path = Path(__file__).resolve().parents[1] / "src/storage/vector_sidecar.py"
+    spec = importlib.util.spec_from_file_location("storage_vector_sidecar_test", module_path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_encode_npy_matches_numpy_save(vector_sidecar, tmp_path: Path) -> None:
+    vectors = [[0.1, 0.2, 0.3], [1.0, -2.0, 3.5]]
+    expected_path = tmp_path / "expected.npy"
+    np.save(expected_path, np.asarray(vectors, dtype=np.float32))
+
+    assert vector_sidecar.encode_npy(vectors) == expected_path.read_bytes()
+
+
+def test_split_and_attach_vectors_round_trip(vector_sidecar, tmp_path: Path) -> None:
+    records = [
+        {"id": "doc_text_1", "content": "a", "contentVector": [0.5, 0.25]},
+        {"id": "doc_image_2", "content": "b", "contentVector": []},
+        {"id": "doc_text_3", "content": "c", "contentVector": [1.0, 2.0]},
+    ]
+
+    slim_records, vectors = vector_sidecar.split_vectors(records)
+    sidecar_path = tmp_path / vector_sidecar.sidecar_name("doc.json")
+    sidecar_path.write_bytes(vector_sidecar.encode_npy(vectors))
+    loaded = vector_sidecar.load_npy(sidecar_path)
+
+    assert sidecar_path.name == "doc.vectors.npy"
+    assert [record["contentVectorRow"] for record in slim_records] == [0, None, 1]
+    assert all("contentVector" not in record for record in slim_records)
+    assert isinstance(loaded, np.memmap)
+    assert vector_sidecar.attach_vectors(slim_records, loaded) == records